@@ -0,0 +1,104 @@
+import argparse
+import os
+import random
+
+WORDS = (
+    "static site generator markdown template render page block inline link image heading list code "
+    "build cache output content asset quote paragraph node tree parse stream index search feed"
+).split()
+
+# Relative weight of each block kind in a generated page
+DEFAULT_MIX = {
+    "paragraph": 6,
+    "heading": 2,
+    "unordered_list": 1,
+    "ordered_list": 1,
+    "code": 1,
+    "quote": 1,
+}
+
+# Chance that a paragraph sentence carries each inline element
+DEFAULT_INLINE = {
+    "bold": 0.3,
+    "italic": 0.3,
+    "code": 0.2,
+    "link": 0.3,
+    "image": 0.1,
+}
+
+def words(rng, count):
+    return " ".join(rng.choice(WORDS) for _ in range(count))
+
+def sentence(rng, inline, page_count):
+    parts = [words(rng, rng.randint(4, 10))]
+    if rng.random() < inline["bold"]:
+        parts.append(f"**{words(rng, 2)}**")
+    if rng.random() < inline["italic"]:
+        parts.append(f"*{words(rng, 2)}*")
+    if rng.random() < inline["code"]:
+        parts.append(f"`{rng.choice(WORDS)}()`")
+    if rng.random() < inline["link"]:
+        parts.append(f"[{words(rng, 2)}](/page{rng.randrange(page_count)})")
+    if rng.random() < inline["image"]:
+        parts.append(f"![{words(rng, 2)}](/images/img{rng.randrange(50)}.png)")
+    parts.append(words(rng, rng.randint(2, 6)) + ".")
+    return " ".join(parts)
+
+def generate_block(rng, kind, inline, page_count):
+    if kind == "heading":
+        return f"{'#' * rng.randint(2, 4)} {words(rng, 3).title()}"
+    if kind == "unordered_list":
+        return "\n".join(f"* {words(rng, rng.randint(2, 6))}" for _ in range(rng.randint(2, 6)))
+    if kind == "ordered_list":
+        return "\n".join(f"{i}. {words(rng, rng.randint(2, 6))}" for i in range(1, rng.randint(3, 7)))
+    if kind == "code":
+        lines = [f"{rng.choice(WORDS)} = {rng.choice(WORDS)}({rng.randint(0, 99)})" for _ in range(rng.randint(2, 8))]
+        return "```\n" + "\n".join(lines) + "\n```"
+    if kind == "quote":
+        return f"> {words(rng, rng.randint(8, 20))}"
+    return " ".join(sentence(rng, inline, page_count) for _ in range(rng.randint(1, 5)))
+
+def generate_page_markdown(rng, index, page_count, blocks, mix, inline):
+    kinds = list(mix)
+    weights = [mix[kind] for kind in kinds]
+    parts = [f"# Page {index}: {words(rng, 3).title()}"]
+    for kind in rng.choices(kinds, weights=weights, k=blocks):
+        parts.append(generate_block(rng, kind, inline, page_count))
+    return "\n\n".join(parts) + "\n"
+
+def generate_corpus(dest_dir, pages, seed=0, blocks_per_page=20, mix=None, inline=None, pages_per_dir=100):
+    # Write `pages` deterministic markdown files under dest_dir; the same arguments always give the same corpus
+    rng = random.Random(seed)
+    mix = dict(DEFAULT_MIX, **(mix or {}))
+    inline = dict(DEFAULT_INLINE, **(inline or {}))
+    paths = []
+    for index in range(pages):
+        directory = os.path.join(dest_dir, f"section{index // pages_per_dir}", f"page{index}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, "index.md")
+        with open(path, "w") as file:
+            file.write(generate_page_markdown(rng, index, pages, blocks_per_page, mix, inline))
+        paths.append(path)
+    return paths
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic markdown corpus.")
+    parser.add_argument('dest', help="directory to write the corpus into")
+    parser.add_argument('-n', '--pages', type=int, default=1000, help="number of pages")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--blocks', type=int, default=20, help="blocks per page")
+    for kind, weight in DEFAULT_MIX.items():
+        parser.add_argument(f"--{kind.replace('_', '-')}", type=float, default=weight, dest=kind,
+                            help=f"relative weight of {kind.replace('_', ' ')} blocks (default {weight})")
+    for kind, chance in DEFAULT_INLINE.items():
+        parser.add_argument(f"--inline-{kind}", type=float, default=chance, dest=f"inline_{kind}",
+                            help=f"chance a sentence contains {kind} markup (default {chance})")
+    args = parser.parse_args()
+
+    mix = {kind: getattr(args, kind) for kind in DEFAULT_MIX}
+    inline = {kind: getattr(args, f"inline_{kind}") for kind in DEFAULT_INLINE}
+    paths = generate_corpus(args.dest, args.pages, args.seed, args.blocks, mix, inline)
+    print(f"Wrote {len(paths)} pages to {args.dest}")
+
+if __name__ == "__main__":
+    main()
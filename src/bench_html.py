@@ -0,0 +1,83 @@
+import argparse
+import random
+import timeit
+from bench_corpus import generate_page_markdown, DEFAULT_MIX, DEFAULT_INLINE
+from htmlnode import LeafNode, ParentNode
+from new_function_textnode import markdown_to_html_node
+
+# Samples: a generated page (little to escape), and text where every leaf needs escaping
+def sample_trees():
+    markdown = generate_page_markdown(random.Random(0), 0, 100, 200, DEFAULT_MIX, DEFAULT_INLINE)
+    escaped = ParentNode("div", [ParentNode("p", [LeafNode("if a < b && c > d then"),
+                                                  LeafNode("x<y", tag="code"),
+                                                  LeafNode("link", tag="a", props={"href": "/q?a=1&b=2"})])
+                                 for _ in range(200)])
+    return {"page": markdown_to_html_node(markdown), "escape-heavy": escaped}
+
+# The serializer as it was before escaping (git show 4813c1b^:src/htmlnode.py): LeafNode.to_html,
+# HTMLNode.iter_html, ParentNode.iter_html and props_to_html copied unchanged, as functions over
+# the same trees so both sides walk identical nodes
+def previous_props_to_html(node):
+    return "".join(f' {key}="{value}"' for key, value in node.props.items())
+
+def previous_leaf_to_html(node):
+    if not node.value and node.tag not in ["input", "img"]:
+        raise ValueError("LeafNode must have a non-empty value.")
+
+    props_html = previous_props_to_html(node)
+
+    if node.tag in ["", None]:
+        return node.value
+
+    # Handle self-closing tags like <input>, <img>
+    if node.tag in ["input", "img"]:
+        return f"<{node.tag}{props_html}>"
+
+    return f"<{node.tag}{props_html}>{node.value}</{node.tag}>"
+
+def previous_leaf_iter_html(node):
+    yield previous_leaf_to_html(node)
+
+def previous_iter_html(root):
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        if isinstance(node, str):
+            yield node
+        elif isinstance(node, ParentNode):
+            if not node.tag:
+                raise ValueError("ParentNode must have a tag.")
+            if not node.children:
+                raise ValueError("ParentNode must have at least one child.")
+            yield f"<{node.tag}{previous_props_to_html(node)}>"
+            pending.append(f"</{node.tag}>")
+            pending.extend(reversed(node.children))
+        else:
+            yield from previous_leaf_iter_html(node)
+
+def previous_to_html(node):
+    return ''.join(previous_iter_html(node))
+
+def bench(function, number):
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+def run(number):
+    results = {}
+    for name, tree in sample_trees().items():
+        previous = bench(lambda: previous_to_html(tree), number)
+        escaped = bench(tree.to_html, number)
+        results[name] = {"previous_us": previous * 1e6, "escaped_us": escaped * 1e6,
+                         "ratio": escaped / previous}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the escaping serializer with the previous unescaped one.")
+    parser.add_argument('-n', '--number', type=int, default=200, help="calls per timing run")
+    args = parser.parse_args()
+
+    print(f"{'sample':<14} {'previous (us)':>15} {'escaped (us)':>14} {'ratio':>7}")
+    for name, result in run(args.number).items():
+        print(f"{name:<14} {result['previous_us']:>15.1f} {result['escaped_us']:>14.1f} {result['ratio']:>6.2f}x")
+
+if __name__ == "__main__":
+    main()
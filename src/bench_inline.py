@@ -0,0 +1,33 @@
+import argparse
+import timeit
+from new_function_textnode import text_to_textnodes, text_to_textnodes_chained
+
+# Paragraph shapes seen on real pages: prose, emphasis-heavy and link-heavy
+SAMPLES = {
+    "plain": "Just a long run of ordinary prose without any inline markup at all. " * 20,
+    "emphasis": "Some **bold** words, some *italic* words and a bit of `code` here. " * 20,
+    "links": " ".join(f"see [page {i}](/docs/page{i}) and ![fig {i}](/images/fig{i}.png)" for i in range(100)),
+}
+
+def bench(function, text, number):
+    return min(timeit.repeat(lambda: function(text), number=number, repeat=5)) / number
+
+def run(number):
+    results = {}
+    for name, text in SAMPLES.items():
+        chained = bench(text_to_textnodes_chained, text, number)
+        lexer = bench(text_to_textnodes, text, number)
+        results[name] = {"chained_us": chained * 1e6, "lexer_us": lexer * 1e6, "speedup": chained / lexer}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the inline lexer with the chained split_nodes_* pipeline.")
+    parser.add_argument('-n', '--number', type=int, default=200, help="calls per timing run")
+    args = parser.parse_args()
+
+    print(f"{'sample':<10} {'chained (us)':>14} {'lexer (us)':>12} {'speedup':>8}")
+    for name, result in run(args.number).items():
+        print(f"{name:<10} {result['chained_us']:>14.1f} {result['lexer_us']:>12.1f} {result['speedup']:>7.2f}x")
+
+if __name__ == "__main__":
+    main()
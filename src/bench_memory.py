@@ -0,0 +1,66 @@
+import argparse
+import gc
+import tracemalloc
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode
+
+# Unslotted equivalents of the node classes as they were before __slots__,
+# kept here only so the benchmark has something to compare against
+class DictTextNode:
+    def __init__(self, text, text_type, url=None):
+        self.text = text
+        self.text_type = text_type
+        self.url = url
+
+class DictHTMLNode:
+    def __init__(self, tag=None, value=None, children=None, props=None):
+        self.tag = tag
+        self.value = value
+        self.children = children if children is not None else []
+        self.props = props if props is not None else {}
+
+class DictLeafNode(DictHTMLNode):
+    def __init__(self, value, tag=None, props=None):
+        super().__init__(tag=tag, value=value, children=[], props=props)
+
+class DictParentNode(DictHTMLNode):
+    def __init__(self, tag=None, children=None, props=None):
+        super().__init__(tag=tag, children=children, props=props)
+
+def measure(factory, count):
+    # Bytes allocated per object while `count` of them are alive at once
+    gc.collect()
+    tracemalloc.start()
+    objects = [factory(i) for i in range(count)]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del objects
+    return size / count
+
+LEAF = LeafNode("word")
+
+CASES = {
+    "TextNode": (lambda i: DictTextNode("word", "text"), lambda i: TextNode("word", "text")),
+    "LeafNode": (lambda i: DictLeafNode("word", "b"), lambda i: LeafNode("word", "b")),
+    "ParentNode": (lambda i: DictParentNode("p", [None]), lambda i: ParentNode("p", [LEAF])),
+}
+
+def run(count):
+    results = {}
+    for name, (legacy, slotted) in CASES.items():
+        before = measure(legacy, count)
+        after = measure(slotted, count)
+        results[name] = {"dict_bytes": before, "slots_bytes": after, "saved_bytes": before - after}
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure per-node memory of the slotted node classes.")
+    parser.add_argument('-n', '--count', type=int, default=100_000, help="nodes alive at once per measurement")
+    args = parser.parse_args()
+
+    print(f"{'class':<12} {'__dict__ (B)':>13} {'__slots__ (B)':>14} {'saved (B)':>10}")
+    for name, result in run(args.count).items():
+        print(f"{name:<12} {result['dict_bytes']:>13.1f} {result['slots_bytes']:>14.1f} {result['saved_bytes']:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import contextlib
+import json
+import os
+import platform
+import random
+import shutil
+import sys
+import tempfile
+import time
+import timeit
+from bench_corpus import generate_corpus, generate_page_markdown, DEFAULT_MIX, DEFAULT_INLINE
+from htmlnode import LeafNode, ParentNode
+from link_check import check_links
+from new_function_textnode import block_to_block_type, markdown_to_blocks, text_to_textnodes
+from site_index import PageOutline, SiteIndex
+import main as site_main
+
+TEMPLATE = "<!DOCTYPE html><html><head><title> {{ Title }} </title></head><body>{{ Content }}</body></html>"
+
+def time_call(function, number, repeat=5):
+    # Best-of-repeat seconds per call, which is the least noisy figure for micro-benchmarks
+    return min(timeit.repeat(function, number=number, repeat=repeat)) / number
+
+def sample_markdown(seed=0, blocks=200):
+    return generate_page_markdown(random.Random(seed), 0, 100, blocks, DEFAULT_MIX, DEFAULT_INLINE)
+
+def link_check_index(pages=1000, links_per_page=100, seed=0):
+    # A site index with pages * links_per_page links, a tenth of them pointing nowhere
+    rng = random.Random(seed)
+    index = SiteIndex("public")
+    for page in range(pages):
+        outline = PageOutline()
+        outline.title = f"Page {page}"
+        for _ in range(links_per_page):
+            target = rng.randrange(pages * 11 // 10)
+            outline.links.append(f"/section{target // 100}/page{target}/" if rng.random() < 0.5
+                                 else f"../../section{target // 100}/page{target}/#top")
+        index.add(f"content/page{page}.md", f"public/section{page // 100}/page{page}/index.html", outline)
+    return index
+
+def micro_benchmarks(number):
+    markdown = sample_markdown()
+    blocks = markdown_to_blocks(markdown)
+    paragraphs = [block for block in blocks if block_to_block_type(block) == "paragraph"]
+    tree = ParentNode("div", [ParentNode("p", [LeafNode("word " * 10), LeafNode("bold", tag="b")])
+                              for _ in range(200)])
+
+    def all_paragraphs():
+        for paragraph in paragraphs:
+            text_to_textnodes(paragraph)
+
+    def all_blocks():
+        for block in blocks:
+            block_to_block_type(block)
+
+    site_index = link_check_index()
+
+    return {
+        "text_to_textnodes": {"seconds": time_call(all_paragraphs, number), "items": len(paragraphs)},
+        "markdown_to_blocks": {"seconds": time_call(lambda: markdown_to_blocks(markdown), number),
+                               "bytes": len(markdown)},
+        "block_to_block_type": {"seconds": time_call(all_blocks, number), "items": len(blocks)},
+        "ParentNode.to_html": {"seconds": time_call(tree.to_html, number), "nodes": 601},
+        "check_links": {"seconds": time_call(lambda: check_links(site_index), 1, repeat=3), "links": 100000},
+    }
+
+@contextlib.contextmanager
+def site_directory(pages, seed):
+    # A throwaway site laid out the way main() expects, entered as the working directory
+    previous = os.getcwd()
+    root = tempfile.mkdtemp(prefix="site_bench_")
+    try:
+        os.makedirs(os.path.join(root, "static"))
+        with open(os.path.join(root, "static", "index.css"), "w") as file:
+            file.write("body { margin: 0; }\n")
+        with open(os.path.join(root, "template.html"), "w") as file:
+            file.write(TEMPLATE)
+        generate_corpus(os.path.join(root, "content"), pages, seed)
+        os.chdir(root)
+        yield root
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(root)
+
+def build_benchmark(pages, seed, extra_args=()):
+    with site_directory(pages, seed):
+        start = time.perf_counter()
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            status = site_main.main(list(extra_args))
+        seconds = time.perf_counter() - start
+    if status:
+        raise RuntimeError(f"Benchmark build failed with status {status}")
+    return {"seconds": seconds, "pages": pages, "pages_per_second": pages / seconds}
+
+def run(pages, number, seed=0, jobs=None):
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "benchmarks": micro_benchmarks(number),
+    }
+    results["benchmarks"]["build"] = build_benchmark(pages, seed)
+    if jobs:
+        results["benchmarks"][f"build_jobs_{jobs}"] = build_benchmark(pages, seed, ["--jobs", str(jobs)])
+    return results
+
+def compare(current, baseline, threshold):
+    # Return (name, baseline seconds, current seconds) for every benchmark that got slower than threshold
+    regressions = []
+    for name, result in current["benchmarks"].items():
+        previous = baseline.get("benchmarks", {}).get(name)
+        if previous and result["seconds"] > previous["seconds"] * (1 + threshold):
+            regressions.append((name, previous["seconds"], result["seconds"]))
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the micro and end-to-end build benchmarks.")
+    parser.add_argument('-n', '--pages', type=int, default=500, help="pages in the end-to-end build corpus")
+    parser.add_argument('--number', type=int, default=20, help="calls per micro-benchmark timing run")
+    parser.add_argument('--seed', type=int, default=0, help="corpus random seed")
+    parser.add_argument('-j', '--jobs', type=int, help="also benchmark a parallel build with this many workers")
+    parser.add_argument('-o', '--output', help="write results as JSON to this file")
+    parser.add_argument('--compare', metavar='BASELINE', help="JSON results of an earlier run to compare against")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="fractional slowdown counted as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    results = run(args.pages, args.number, args.seed, args.jobs)
+    for name, result in results["benchmarks"].items():
+        print(f"{name:<22} {result['seconds'] * 1000:>10.3f} ms")
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(results, baseline, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {before * 1000:.3f} ms -> {after * 1000:.3f} ms")
+        if regressions:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+import hashlib
+import json
+import os
+from collections import OrderedDict
+
+# Modules whose code decides how a block renders; editing any of them invalidates a saved cache
+RENDERER_MODULES = ("new_function_textnode.py", "inline_lexer.py", "htmlnode.py", "textnode.py")
+
+def renderer_fingerprint():
+    digest = hashlib.sha256()
+    module_dir = os.path.dirname(os.path.abspath(__file__))
+    for name in RENDERER_MODULES:
+        with open(os.path.join(module_dir, name), 'rb') as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+class BlockCache:
+    # Bounded LRU mapping a markdown block's text to its rendered HTML fragment
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # A list while fragments rendered here must be handed to another cache (see take_delta)
+        self.rendered = None
+
+    def get_or_render(self, block, render):
+        fragment = self.entries.get(block)
+        if fragment is not None:
+            self.hits += 1
+            self.entries.move_to_end(block)
+            return fragment
+
+        self.misses += 1
+        fragment = render(block)
+        self.store(block, fragment)
+        if self.rendered is not None:
+            self.rendered.append((block, fragment))
+        return fragment
+
+    def store(self, block, fragment):
+        self.entries[block] = fragment
+        self.entries.move_to_end(block)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def track_rendered(self):
+        self.rendered = []
+
+    def take_delta(self):
+        # (hits, misses, new fragments) since the last call; a worker process returns this with
+        # each page so the parent's cache and stats account for every block rendered in the build
+        delta = (self.hits, self.misses, self.rendered)
+        self.hits, self.misses, self.rendered = 0, 0, []
+        return delta
+
+    def merge(self, delta):
+        hits, misses, rendered = delta
+        self.hits += hits
+        self.misses += misses
+        for block, fragment in rendered:
+            self.store(block, fragment)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self.entries),
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+    def save(self, path):
+        # Least recently used first, so loading replays the same LRU order
+        data = {"fingerprint": renderer_fingerprint(), "entries": list(self.entries.items())}
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump(data, file)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, max_entries=10000):
+        # Start empty when there is no cache yet, it is unreadable, or the renderer has changed
+        cache = cls(max_entries)
+        if not os.path.exists(path):
+            return cache
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return cache
+        if data.get("fingerprint") != renderer_fingerprint():
+            return cache
+        for block, fragment in data.get("entries", [])[-max_entries:]:
+            cache.entries[block] = fragment
+        return cache
@@ -0,0 +1,58 @@
+import contextlib
+import logging
+import sys
+
+# Per-file progress goes through this logger; it is quiet (warnings and errors only) unless -v is given
+logger = logging.getLogger("static_site_gen")
+
+class _StdoutHandler(logging.StreamHandler):
+    # Always write to the current sys.stdout, so redirect_stdout() captures build logs too
+
+    @property
+    def stream(self):
+        return sys.stdout
+
+    @stream.setter
+    def stream(self, value):
+        pass
+
+def configure_logging(verbosity=0):
+    # 0 = warnings only, 1 = one line per page/file, 2+ = everything
+    if verbosity >= 2:
+        level = logging.DEBUG
+    elif verbosity == 1:
+        level = logging.INFO
+    else:
+        level = logging.WARNING
+
+    logger.setLevel(level)
+    if not any(isinstance(handler, _StdoutHandler) for handler in logger.handlers):
+        handler = _StdoutHandler()
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+    logger.propagate = False
+
+class _RecordCollector(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append((record.levelno, record.getMessage()))
+
+@contextlib.contextmanager
+def capture_records():
+    # Collect (level, message) pairs instead of emitting them, so a worker process can hand its
+    # log lines back to the parent to be replayed in a deterministic order
+    collector = _RecordCollector()
+    saved_handlers, saved_propagate = logger.handlers[:], logger.propagate
+    logger.handlers = [collector]
+    logger.propagate = False
+    try:
+        yield collector.records
+    finally:
+        logger.handlers, logger.propagate = saved_handlers, saved_propagate
+
+def replay_records(records):
+    for level, message in records:
+        logger.log(level, message)
@@ -0,0 +1,42 @@
+import hashlib
+import json
+import os
+
+MANIFEST_PATH = '.build_manifest.json'
+
+
+def file_hash(path):
+    # Hash the file in chunks so large assets are never fully loaded into memory
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def empty_manifest():
+    # inputs: shared files such as the template and its partials; graph: output -> input paths
+    return {"inputs": {}, "graph": {}, "pages": {}, "assets": {}}
+
+
+def load_manifest(manifest_path):
+    # A missing or unreadable manifest simply means everything is rebuilt
+    if not os.path.exists(manifest_path):
+        return empty_manifest()
+    try:
+        with open(manifest_path, 'r') as file:
+            manifest = json.load(file)
+    except (OSError, ValueError):
+        return empty_manifest()
+
+    for key, default in empty_manifest().items():
+        manifest.setdefault(key, default)
+    return manifest
+
+
+def save_manifest(manifest, manifest_path):
+    # Write to a temporary file first so an interrupted build never leaves a truncated manifest
+    tmp_path = manifest_path + '.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+    os.replace(tmp_path, manifest_path)
@@ -0,0 +1,78 @@
+import contextlib
+import json
+import time
+from collections import defaultdict
+
+# Stages in the order they happen while building a page
+STAGES = ("asset copy", "markdown read", "block split", "inline parse", "html serialize", "template render",
+          "write", "search index", "sitemap", "feed", "redirects", "precompress", "link check")
+
+class BuildTimings:
+    # Wall time per build stage plus total time per page
+    enabled = True
+
+    def __init__(self):
+        self.stages = defaultdict(float)
+        self.pages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def add_page(self, path, seconds):
+        self.pages[path] = seconds
+
+    def merge(self, data):
+        # Fold in the to_dict() output of another process
+        for name, seconds in data["stages"].items():
+            self.stages[name] += seconds
+        self.pages.update(data["pages"])
+
+    def to_dict(self):
+        return {"stages": dict(self.stages), "pages": dict(self.pages)}
+
+    def slowest_pages(self, count=10):
+        return sorted(self.pages.items(), key=lambda item: (-item[1], item[0]))[:count]
+
+    def report(self, count=10):
+        ordered = [name for name in STAGES if name in self.stages]
+        ordered += sorted(name for name in self.stages if name not in STAGES)
+        return {
+            "stages": {name: self.stages[name] for name in ordered},
+            "total": sum(self.stages.values()),
+            "pages": len(self.pages),
+            "slowest_pages": [{"path": path, "seconds": seconds} for path, seconds in self.slowest_pages(count)],
+        }
+
+    def format_table(self, count=10):
+        report = self.report(count)
+        lines = [f"{'stage':<16} {'seconds':>10} {'share':>7}"]
+        total = report["total"] or 1.0
+        for name, seconds in report["stages"].items():
+            lines.append(f"{name:<16} {seconds:>10.4f} {seconds / total:>6.1%}")
+        lines.append(f"{'total':<16} {report['total']:>10.4f}")
+        if report["slowest_pages"]:
+            lines.append("")
+            lines.append(f"slowest {len(report['slowest_pages'])} of {report['pages']} pages:")
+            for page in report["slowest_pages"]:
+                lines.append(f"  {page['seconds']:>10.4f}  {page['path']}")
+        return "\n".join(lines)
+
+    def format_json(self, count=10):
+        return json.dumps(self.report(count), indent=2)
+
+class NullTimings:
+    # Stand-in used when profiling is off; every stage is a no-op
+    enabled = False
+
+    def stage(self, name):
+        return contextlib.nullcontext()
+
+    def add_page(self, path, seconds):
+        pass
+
+NULL_TIMINGS = NullTimings()
@@ -0,0 +1,45 @@
+from collections import defaultdict
+
+class DependencyGraph:
+    # Which input files each output was built from, with the reverse index kept alongside so
+    # "what does this change affect" costs time proportional to the change, not the site
+    def __init__(self):
+        self.dependencies = {}
+        self.dependents = defaultdict(set)
+
+    def set_inputs(self, output, inputs):
+        self.remove(output)
+        self.dependencies[output] = tuple(inputs)
+        for path in self.dependencies[output]:
+            self.dependents[path].add(output)
+
+    def inputs(self, output):
+        return self.dependencies.get(output, ())
+
+    def remove(self, output):
+        for path in self.dependencies.pop(output, ()):
+            outputs = self.dependents[path]
+            outputs.discard(output)
+            if not outputs:
+                del self.dependents[path]
+
+    def affected(self, changed_inputs):
+        # Map each output that used a changed input to the changed inputs it used
+        reasons = defaultdict(list)
+        for path in changed_inputs:
+            for output in self.dependents.get(path, ()):
+                reasons[output].append(path)
+        return {output: sorted(paths) for output, paths in reasons.items()}
+
+    def to_dict(self):
+        return {output: list(inputs) for output, inputs in sorted(self.dependencies.items())}
+
+    @classmethod
+    def from_dict(cls, data):
+        graph = cls()
+        for output, inputs in data.items():
+            graph.set_inputs(output, inputs)
+        return graph
+
+    def __len__(self):
+        return len(self.dependencies)
@@ -1,10 +1,19 @@
 def extract_title(markdown):
-    lines = markdown.splitlines()
+    # Step from line start to line start with str.find, so only the title line is ever copied;
+    # the same rules as extract_title_from_lines over the document's lines
+    start = 0
+    while start < len(markdown):
+        end = markdown.find("\n", start) + 1 or len(markdown)
+        if markdown.startswith("# ", start):
+            return extract_title_from_lines([markdown[start:end]])
+        start = end
+    return extract_title_from_lines([])
 
+def extract_title_from_lines(lines):
     for line in lines:
         if line.startswith('# '):
             title = line[2:].strip()
             if not title:
                 raise ValueError("H1 header found but no text provided.")
             return title
-    raise ValueError("No H1 header found in the markdown.")
\ No newline at end of file
+    raise ValueError("No H1 header found in the markdown.")
@@ -0,0 +1,36 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+# Helpers shared by the test modules; not itself a test module, so discovery skips it
+
+def write_file(path, text):
+    # Write text to path, creating its directory first
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w") as file:
+        file.write(text)
+
+def read_file(path):
+    with open(path) as file:
+        return file.read()
+
+class SiteTestCase(unittest.TestCase):
+    # A throwaway site under self.tmp: static/, content/ and public/ paths plus template.html.
+    # Nothing is created up front; tests write the files they need, and the tree is removed
+    # after each test.
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp)
+        self.static = os.path.join(self.tmp, "static")
+        self.content = os.path.join(self.tmp, "content")
+        self.public = os.path.join(self.tmp, "public")
+        self.template = os.path.join(self.tmp, "template.html")
+
+    def write(self, path, text):
+        write_file(path, text)
+
+    def read(self, path):
+        return read_file(path)
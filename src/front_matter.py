@@ -0,0 +1,129 @@
+import datetime
+import itertools
+import os
+
+# A page may start with a header block of "key: value" lines fenced by "---" lines:
+#
+#   ---
+#   title: Hello
+#   date: 2024-05-01
+#   draft: true
+#   template: post.html
+#   aliases: [/old/, /older.html]
+#   ---
+FRONT_MATTER_DELIMITER = "---"
+
+# A header that has not closed after this many lines is treated as page content
+FRONT_MATTER_MAX_LINES = 200
+
+def parse_value(value):
+    value = value.strip()
+    if value.startswith("[") and value.endswith("]"):
+        return [parse_value(item) for item in value[1:-1].split(",") if item.strip()]
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    if value.lower() in ("true", "yes"):
+        return True
+    if value.lower() in ("false", "no"):
+        return False
+    return value
+
+def parse_fields(lines):
+    fields = {}
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, separator, value = line.partition(":")
+        if not separator:
+            raise ValueError(f"Front matter line without 'key: value': {line!r}")
+        fields[key.strip().lower()] = parse_value(value)
+    return fields
+
+def header_lines(lines):
+    # Consume the header from an iterator of lines; returns (header lines or None, lines read)
+    first = next(lines, None)
+    if first is None or first.strip() != FRONT_MATTER_DELIMITER:
+        return None, [] if first is None else [first]
+    read = [first]
+    for line in itertools.islice(lines, FRONT_MATTER_MAX_LINES):
+        read.append(line)
+        if line.strip() == FRONT_MATTER_DELIMITER:
+            return read[1:-1], read
+    return None, read
+
+def text_lines(text, limit):
+    # The first `limit` lines of text, each with its "\n", split the way iterating over a file
+    # splits them; found with str.find so the rest of the text is never scanned or copied
+    start = 0
+    for _ in range(limit):
+        if start >= len(text):
+            return
+        end = text.find("\n", start) + 1 or len(text)
+        yield text[start:end]
+        start = end
+
+def split_front_matter(markdown):
+    # Return (fields, body); without a complete header the whole text is the body
+    header, read = header_lines(text_lines(markdown, FRONT_MATTER_MAX_LINES + 2))
+    if header is None:
+        return {}, markdown
+    return parse_fields(header), markdown[sum(len(line) for line in read):]
+
+def split_front_matter_lines(lines):
+    # Streaming form: returns (fields, iterator over the remaining body lines)
+    lines = iter(lines)
+    header, read = header_lines(lines)
+    if header is None:
+        return {}, itertools.chain(read, lines)
+    return parse_fields(header), lines
+
+def read_front_matter(path):
+    # Header-only scan: reads up to the closing delimiter and never touches the body, so listing
+    # or filtering every page costs one short read per file
+    with open(path, 'r') as file:
+        header, _ = header_lines(iter(file))
+    return parse_fields(header) if header is not None else {}
+
+def scan_front_matter(path):
+    # read_front_matter for listings: a malformed header reads as empty here and fails the page
+    # with its real error when the page itself is built
+    try:
+        return read_front_matter(path)
+    except ValueError:
+        return {}
+
+def is_draft(fields):
+    return fields.get("draft") is True
+
+def date_updated(date):
+    # A front matter date as an RFC 3339 UTC timestamp: "2024-05-01" -> "2024-05-01T00:00:00Z",
+    # "2024-05-01T12:00:00+02:00" -> "2024-05-01T10:00:00Z"; times without an offset are taken as
+    # UTC. None when the value is not an ISO 8601 date, so the caller can fall back on something else.
+    text = str(date).strip()
+    if text.endswith(("Z", "z")):
+        text = text[:-1] + "+00:00"
+    try:
+        parsed = datetime.datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(datetime.timezone.utc)
+    return parsed.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def page_template_path(template_path, fields):
+    # A page may name its own template, relative to the default template's directory
+    if not fields.get("template"):
+        return template_path
+    return os.path.join(os.path.dirname(template_path), fields["template"])
+
+def slot_values(fields):
+    # Front matter fields as template slot values: date -> {{ Date }}, lists joined with commas
+    values = {}
+    for key, value in fields.items():
+        if isinstance(value, list):
+            value = ", ".join(str(item) for item in value)
+        elif isinstance(value, bool):
+            value = "true" if value else "false"
+        values[key[:1].upper() + key[1:]] = value
+    return values
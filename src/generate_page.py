@@ -1,35 +1,103 @@
 import os
-from new_function_textnode import markdown_to_html_node  
+import time
+from new_function_textnode import scan_blocks, spans_to_html_nodes, blocks_to_html_chunks
+from htmlnode import ParentNode, escape_attribute
 from extract_title import extract_title  
+from front_matter import page_template_path, slot_values, split_front_matter
+from template import load_template
+from build_log import logger
+from build_timings import NULL_TIMINGS
+from stream_page import STREAM_THRESHOLD, generate_page_streaming
+from write_output import OutputWriter
 
-def generate_page(from_path, template_path, dest_path):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
+def generate_page(from_path, template_path, dest_path, values=None, block_cache=None, timings=None, outline=None):
+    # Returns True when dest_path was (re)written, False when it already held identical HTML;
+    # a PageOutline passed as outline is filled with the page's title, headings, links and images
+    logger.debug(f"Generating page from {from_path} to {dest_path} using {template_path}")
+    timings = timings or NULL_TIMINGS
+    start = time.perf_counter()
+
+    # Very large sources are rendered block by block so memory tracks the largest block, not the file
+    if os.path.getsize(from_path) >= STREAM_THRESHOLD:
+        with timings.stage("streamed pages"):
+            changed = generate_page_streaming(from_path, template_path, dest_path, values, block_cache, outline)
+        timings.add_page(from_path, time.perf_counter() - start)
+        return changed
 
     # Read the markdown file
-    with open(from_path, 'r') as file:
-        markdown_content = file.read()
+    with timings.stage("markdown read"):
+        with open(from_path, 'r') as file:
+            markdown_content = file.read()
 
-    # Read the template file
-    with open(template_path, 'r') as file:
-        template_content = file.read()
+    template, slots = prepare_page(markdown_content, template_path, values, block_cache, timings, outline)
 
-    # Convert markdown to HTML
-    html_content = markdown_to_html_node(markdown_content).to_html()
+    # Ensure destination directory exists
+    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
 
-    # Extract title from markdown
-    try:
-        title = extract_title(markdown_content)
-    except ValueError as e:
-        raise RuntimeError(f"Error extracting title: {e}")
+    # Stream the final HTML to the destination file without building the whole page string;
+    # the writer leaves byte-identical pages untouched so their mtimes don't change
+    if timings.enabled:
+        with timings.stage("template render"):
+            html_page = template.render(slots)
+        with timings.stage("write"):
+            with OutputWriter(dest_path) as file:
+                file.write(html_page)
+    else:
+        with OutputWriter(dest_path) as file:
+            template.write(file, slots)
 
-    # Replace placeholders in the template
-    html_page = template_content.replace('{{ Title }}', title).replace('{{ Content }}', html_content)
+    timings.add_page(from_path, time.perf_counter() - start)
+    if file.changed:
+        logger.info(f"Page generated and saved to {dest_path}")
+    else:
+        logger.info(f"Page unchanged, kept {dest_path}")
+    return file.changed
 
-    # Ensure destination directory exists
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+def prepare_page(markdown_content, template_path, values=None, block_cache=None, timings=None, outline=None):
+    # Split off the front matter, then load the page's compiled template (parsed once per build)
+    # and fill its slots from the body
+    fields, body = split_front_matter(markdown_content)
+    template = load_template(page_template_path(template_path, fields))
+    return template, page_slots(body, values, block_cache, timings, outline, fields)
+
+def page_slots(markdown_content, values=None, block_cache=None, timings=None, outline=None, fields=None):
+    # Template slots for one page: Title plus the Content chunks converted from markdown, and
+    # each front matter field under its capitalized name (date -> Date)
+    timings = timings or NULL_TIMINGS
+    fields = fields or {}
+
+    # Convert markdown to HTML; a block cache reuses fragments of repeated blocks
+    with timings.stage("block split"):
+        lines, spans = scan_blocks(markdown_content)
+    with timings.stage("inline parse"):
+        if block_cache is not None:
+            blocks = ['\n'.join(lines[start:end]) for _, start, end in spans]
+            content_chunks = blocks_to_html_chunks(blocks, block_cache, outline)
+        else:
+            content_chunks = ParentNode(tag="div", children=spans_to_html_nodes(lines, spans, outline)).iter_html()
+
+    # A front matter title wins over the page's h1
+    title = fields.get("title")
+    if not isinstance(title, str) or not title:
+        try:
+            title = extract_title(markdown_content)
+        except ValueError as e:
+            raise RuntimeError(f"Error extracting title: {e}")
+    if outline is not None:
+        outline.title = title
+        outline.meta = dict(fields)
 
-    # Write the final HTML to the destination file
-    with open(dest_path, 'w') as file:
-        file.write(html_page)
+    # When profiling, serialize and render separately so each stage can be timed;
+    # otherwise the HTML is streamed straight into the output file
+    if timings.enabled:
+        with timings.stage("html serialize"):
+            content_chunks = list(content_chunks)
 
-    print(f"Page generated and saved to {dest_path}")
+    # Fill the template slots: front matter fields, then extra values such as Nav supplied by the caller.
+    # Field values and the title may land inside attributes (<meta content="{{ Description }}">), so
+    # quotes are escaped too.
+    slots = {name: escape_attribute(value) for name, value in slot_values(fields).items()}
+    slots.update(values or {})
+    slots['Title'] = escape_attribute(title)
+    slots['Content'] = content_chunks
+    return slots
@@ -1,15 +1,43 @@
 import os
+from front_matter import is_draft, scan_front_matter
 from generate_page import generate_page
+from build_log import logger
 
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path):
+def markdown_dest_path(markdown_file_path, dir_path_content, dest_dir_path):
+    # content/blog/index.md -> public/blog/index.html
+    relative_path = os.path.relpath(markdown_file_path, dir_path_content)
+    return os.path.join(dest_dir_path, os.path.splitext(relative_path)[0] + '.html')
+
+def find_markdown_pages(dir_path_content, dest_dir_path, include_drafts=False, shard=None):
+    # Collect (markdown path, html path) pairs in a stable order; pages marked "draft: true" are
+    # left out unless include_drafts is set, found by reading only their front matter. With a
+    # shard, only that shard's slice of the pages is returned.
+    pages = []
     for root, dirs, files in os.walk(dir_path_content):
-        for file in files:
+        dirs.sort()
+        for file in sorted(files):
             if file.endswith(".md"):
                 # Construct full file paths
                 markdown_file_path = os.path.join(root, file)
-                relative_path = os.path.relpath(markdown_file_path, dir_path_content)
-                dest_file_path = os.path.join(dest_dir_path, os.path.splitext(relative_path)[0] + '.html')
-                
-                # Generate the HTML page
-                generate_page(markdown_file_path, template_path, dest_file_path)
-                print(f"Generated {dest_file_path}")
+                if not include_drafts and is_draft(scan_front_matter(markdown_file_path)):
+                    logger.debug(f"Skipping draft {markdown_file_path}")
+                    continue
+                dest_file_path = markdown_dest_path(markdown_file_path, dir_path_content, dest_dir_path)
+                pages.append((markdown_file_path, dest_file_path))
+    return shard.select(pages, dir_path_content) if shard is not None else pages
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, block_cache=None, timings=None,
+                             site_index=None, include_drafts=False, shard=None):
+    # Returns the output paths whose contents actually changed; each page's outline is
+    # recorded in site_index when one is given
+    changed_outputs = []
+    for markdown_file_path, dest_file_path in find_markdown_pages(dir_path_content, dest_dir_path, include_drafts, shard):
+        # Generate the HTML page
+        outline = site_index.new_outline() if site_index is not None else None
+        if generate_page(markdown_file_path, template_path, dest_file_path, block_cache=block_cache, timings=timings,
+                         outline=outline):
+            changed_outputs.append(dest_file_path)
+        if outline is not None:
+            site_index.add(markdown_file_path, dest_file_path, outline)
+        logger.debug(f"Generated {dest_file_path}")
+    return changed_outputs
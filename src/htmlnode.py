@@ -1,15 +1,75 @@
+class _EmptyChildren(list):
+    # Shared read-only stand-in for "no children", so leaves don't each allocate a list
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Nodes without children share a read-only empty list; pass a list instead.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+class _EmptyProps(dict):
+    # Shared read-only stand-in for "no props", so most nodes don't each allocate a dict
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("Nodes without props share a read-only empty dict; pass a dict instead.")
+
+    __setitem__ = __delitem__ = __ior__ = update = setdefault = pop = popitem = clear = _read_only
+
+EMPTY_CHILDREN = _EmptyChildren()
+EMPTY_PROPS = _EmptyProps()
+
+class Markup(str):
+    # Text already known to be safe HTML (pre-rendered fragments); it is emitted as is
+    __slots__ = ()
+
+# Text only needs &, < and > escaped; attribute values are always double-quoted, so " too.
+# Most text has none of them, and the substring scans that prove it are far cheaper than any
+# rewrite. When something must be escaped, chained replace() beats str.translate, whose
+# multi-character replacements go through a slow per-character path.
+def escape_text(text):
+    if type(text) is Markup or ("&" not in text and "<" not in text and ">" not in text):
+        return text
+    return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+
+def escape_attribute(value):
+    # Checked before str(), which would turn a Markup value into a plain str
+    if type(value) is Markup:
+        return value
+    value = str(value)
+    if '&' not in value and '<' not in value and '>' not in value and '"' not in value:
+        return value
+    return value.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;").replace('"', "&quot;")
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
-        self.children = children if children is not None else []
-        self.props = props if props is not None else {}
+        self.children = children if children is not None else EMPTY_CHILDREN
+        self.props = props if props is not None else EMPTY_PROPS
 
     def to_html(self):
         raise NotImplementedError("This method should be overridden in child classes.")
+
+    def iter_html(self):
+        # Yield the HTML in chunks; subclasses that can stream override this
+        yield self.to_html()
+
+    def write_html(self, fp):
+        # Stream the HTML straight into a file-like object without building the full string
+        for chunk in self.iter_html():
+            fp.write(chunk)
     
     def props_to_html(self):
-        return "".join(f' {key}="{value}"' for key, value in self.props.items())
+        # Formatted on every call, so props changed after a render are never served stale;
+        # most nodes have none and return before building a generator
+        props = self.props
+        if not props:
+            return ""
+        return "".join(f' {key}="{escape_attribute(value)}"' for key, value in props.items())
     
     def __repr__(self):
         return (
@@ -26,8 +86,10 @@ class HTMLNode:
                 self.props == other.props)
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, value, tag=None, props=None):
-        super().__init__(tag=tag, value=value, children=[], props=props)
+        super().__init__(tag=tag, value=value, props=props)
         if value is None:
             raise ValueError("The 'value' argument is required for LeafNode.")
     
@@ -35,16 +97,16 @@ class LeafNode(HTMLNode):
         if not self.value and self.tag not in ["input", "img"]:
             raise ValueError("LeafNode must have a non-empty value.")
         
-        props_html = self.props_to_html()
-        
         if self.tag in ["", None]:
-            return self.value
+            return escape_text(self.value)
+
+        props_html = self.props_to_html()
         
         # Handle self-closing tags like <input>, <img>
         if self.tag in ["input", "img"]:
             return f"<{self.tag}{props_html}>"
         
-        return f"<{self.tag}{props_html}>{self.value}</{self.tag}>"
+        return f"<{self.tag}{props_html}>{escape_text(self.value)}</{self.tag}>"
  
 def text_node_to_html_node(text_node):
     text_type_text = "text"
@@ -80,6 +142,8 @@ def text_node_to_html_node(text_node):
 
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag=None, children=None, props=None):
         if children is None or not children:
             raise ValueError("ParentNode must have at least one child.")
@@ -91,14 +155,26 @@ class ParentNode(HTMLNode):
         super().__init__(tag=tag, children=children, props=props)
     
     def to_html(self):
-        if not self.tag:
-            raise ValueError("ParentNode must have a tag.")
-        if not self.children:
-            raise ValueError("ParentNode must have at least one child.")
-        
-        children_html = ''.join(child.to_html() for child in self.children)
-        props_html = self.props_to_html()
-        return f"<{self.tag}{props_html}>{children_html}</{self.tag}>"
+        # One join over the streamed chunks instead of one copy per nesting level
+        return ''.join(self.iter_html())
+
+    def iter_html(self):
+        # Depth-first walk with an explicit stack: closing tags are pushed as plain strings
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if isinstance(node, str):
+                yield node
+            elif isinstance(node, ParentNode):
+                if not node.tag:
+                    raise ValueError("ParentNode must have a tag.")
+                if not node.children:
+                    raise ValueError("ParentNode must have at least one child.")
+                yield f"<{node.tag}{node.props_to_html()}>"
+                pending.append(f"</{node.tag}>")
+                pending.extend(reversed(node.children))
+            else:
+                yield from node.iter_html()
 
 
 
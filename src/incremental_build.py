@@ -0,0 +1,209 @@
+import os
+from build_log import logger
+from build_manifest import MANIFEST_PATH, empty_manifest, file_hash, load_manifest, save_manifest
+from dependency_graph import DependencyGraph
+from front_matter import page_template_path, scan_front_matter
+from generate_pages_recursive import find_markdown_pages
+from parallel_build import build_pages
+from publish_assets import publish_file
+from build_timings import NULL_TIMINGS
+from template import load_template
+
+def find_static_files(src, dest):
+    # Collect (source file, published file) pairs for everything under src
+    files = []
+    for root, dirs, names in os.walk(src):
+        dirs.sort()
+        for name in sorted(names):
+            src_item = os.path.join(root, name)
+            dest_item = os.path.join(dest, os.path.relpath(src_item, src))
+            files.append((src_item, dest_item))
+    return files
+
+def source_entry(path, previous):
+    # Reuse the previous hash when size and mtime are unchanged to avoid rehashing large files
+    stat = os.stat(path)
+    if previous and previous.get("size") == stat.st_size and previous.get("mtime") == stat.st_mtime_ns:
+        digest = previous["hash"]
+    else:
+        digest = file_hash(path)
+    return {"hash": digest, "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+def is_up_to_date(previous, entry, dest_path):
+    return (previous is not None and
+            previous.get("hash") == entry["hash"] and
+            previous.get("output") == dest_path and
+            os.path.exists(dest_path))
+
+def rebuild_reasons(markdown_file_path, dest_file_path, previous, entry, graph, affected):
+    # Why a page must be rebuilt, as readable sentences; empty when it is up to date
+    if previous is None:
+        return ["new page"]
+    reasons = []
+    if previous.get("hash") != entry["hash"]:
+        reasons.append(f"{markdown_file_path} changed")
+    if previous.get("output") != dest_file_path or not os.path.exists(dest_file_path):
+        reasons.append(f"{dest_file_path} is missing")
+    if dest_file_path not in graph.dependencies:
+        reasons.append("no dependency record from the last build")
+    reasons.extend(f"{path} changed" for path in affected.get(dest_file_path, ()))
+    return reasons
+
+def template_inputs(template_path):
+    # A template and its partials; a missing or broken template fails its pages when they are built
+    try:
+        return (template_path,) + load_template(template_path).includes
+    except (OSError, ValueError):
+        return (template_path,)
+
+def remove_output(path, dest_root):
+    os.remove(path)
+    # Prune directories left empty, but never the destination root itself
+    parent = os.path.dirname(path)
+    root = os.path.abspath(dest_root)
+    while os.path.abspath(parent).startswith(root + os.sep) and not os.listdir(parent):
+        os.rmdir(parent)
+        parent = os.path.dirname(parent)
+
+def incremental_build(source_directory, content_directory, template_path, destination_directory,
+                      manifest_path=MANIFEST_PATH, jobs=1, asset_mode="copy",
+                      block_cache=None, timings=None, io_threads=0, site_index=None, include_drafts=False,
+                      force=False):
+    # site_index, when given, should hold the previous build's index: skipped pages keep their
+    # records, rebuilt pages are re-recorded and removed pages are dropped.
+    # force rebuilds every page, as a full build does, while still recording a fresh manifest.
+    timings = timings or NULL_TIMINGS
+    manifest = load_manifest(manifest_path)
+    new_manifest = empty_manifest()
+    stats = {"pages_built": 0, "pages_skipped": 0, "pages_failed": 0, "changed_outputs": [],
+             "assets_copied": 0, "assets_skipped": 0, "removed": 0, "reasons": {}}
+
+    os.makedirs(destination_directory, exist_ok=True)
+
+    # Shared inputs (templates and their partials) are hashed once; a page is rebuilt when
+    # any input it was built from changed, found through the graph's reverse index
+    def input_changed(path):
+        if path not in input_changes:
+            previous = manifest["inputs"].get(path)
+            try:
+                entry = source_entry(path, previous)
+            except FileNotFoundError:
+                input_changes[path] = True
+                return True
+            input_changes[path] = previous is None or previous.get("hash") != entry["hash"]
+            new_manifest["inputs"][path] = entry
+        return input_changes[path]
+
+    def page_inputs(path):
+        if path not in templates:
+            templates[path] = template_inputs(path)
+            for input_path in templates[path]:
+                input_changed(input_path)
+        return templates[path]
+
+    input_changes = {}
+    templates = {}
+    graph = DependencyGraph.from_dict(manifest["graph"])
+    page_inputs(template_path)
+    for inputs in graph.dependencies.values():
+        for path in inputs[1:]:
+            input_changed(path)
+    affected = graph.affected([path for path, changed in input_changes.items() if changed])
+
+    # Copy only the static files whose content changed
+    with timings.stage("asset copy"):
+        for src_item, dest_item in find_static_files(source_directory, destination_directory):
+            previous = manifest["assets"].get(src_item)
+            entry = source_entry(src_item, previous)
+            if is_up_to_date(previous, entry, dest_item) and previous.get("mode") == asset_mode:
+                stats["assets_skipped"] += 1
+            elif publish_file(src_item, dest_item, asset_mode):
+                logger.info(f"Copying file: {src_item} to {dest_item}")
+                stats["assets_copied"] += 1
+            else:
+                stats["assets_skipped"] += 1
+            entry["mode"] = asset_mode
+            entry["output"] = dest_item
+            new_manifest["assets"][src_item] = entry
+
+    # Regenerate only the pages whose markdown or shared inputs changed
+    stale_pages = []
+    new_graph = DependencyGraph()
+    for markdown_file_path, dest_file_path in find_markdown_pages(content_directory, destination_directory,
+                                                                  include_drafts):
+        previous = manifest["pages"].get(markdown_file_path)
+        entry = source_entry(markdown_file_path, previous)
+        reasons = rebuild_reasons(markdown_file_path, dest_file_path, previous, entry, graph, affected)
+        if force:
+            reasons = ["full build"]
+        if not reasons and site_index is not None and not site_index.has_page(dest_file_path):
+            reasons = ["not in the site index"]
+        if reasons:
+            stale_pages.append((markdown_file_path, dest_file_path))
+            stats["reasons"][dest_file_path] = reasons
+        else:
+            stats["pages_skipped"] += 1
+        entry["output"] = dest_file_path
+        new_manifest["pages"][markdown_file_path] = entry
+        # An unchanged page still uses the template its front matter named last time; only
+        # rebuilt pages need their header read again
+        if reasons:
+            inputs = page_inputs(page_template_path(template_path, scan_front_matter(markdown_file_path)))
+        else:
+            inputs = graph.inputs(dest_file_path)[1:]
+        new_graph.set_inputs(dest_file_path, (markdown_file_path,) + inputs)
+
+    # Failed pages are left out of the manifest so the next build retries them
+    errors = build_pages(stale_pages, template_path, jobs, block_cache, timings if timings.enabled else None,
+                         stats["changed_outputs"], io_threads, site_index)
+    for markdown_file_path, _ in errors:
+        new_graph.remove(new_manifest["pages"].pop(markdown_file_path)["output"])
+    if site_index is not None:
+        site_index.retain(entry["output"] for entry in new_manifest["pages"].values())
+    new_manifest["graph"] = new_graph.to_dict()
+    stats["pages_failed"] = len(errors)
+    stats["pages_built"] = len(stale_pages) - len(errors)
+
+    # Delete outputs whose sources were removed since the last build
+    live_sources = {page for page, _ in errors}
+    live_outputs = {entry["output"] for section in ("pages", "assets") for entry in new_manifest[section].values()}
+    for section in ("pages", "assets"):
+        for source_path, entry in manifest[section].items():
+            output = entry.get("output")
+            if source_path in new_manifest[section] or source_path in live_sources or output in live_outputs:
+                continue
+            if output and os.path.exists(output):
+                logger.info(f"Removing stale output: {output}")
+                remove_output(output, destination_directory)
+                stats["removed"] += 1
+
+    save_manifest(new_manifest, manifest_path)
+    return stats
+
+def record_rebuild(manifest_path, template_path, pages=(), assets=(), removed=(), asset_mode="copy"):
+    # Fold a partial rebuild, such as the watcher's, into the manifest so a later incremental
+    # build trusts exactly what is on disk: pages and assets are (source, output) pairs that were
+    # just written, removed lists sources whose outputs are gone or failed to build
+    manifest = load_manifest(manifest_path)
+    graph = DependencyGraph.from_dict(manifest["graph"])
+    for markdown_file_path, dest_file_path in pages:
+        entry = source_entry(markdown_file_path, None)
+        entry["output"] = dest_file_path
+        manifest["pages"][markdown_file_path] = entry
+        inputs = template_inputs(page_template_path(template_path, scan_front_matter(markdown_file_path)))
+        for path in inputs:
+            if os.path.exists(path):
+                manifest["inputs"][path] = source_entry(path, manifest["inputs"].get(path))
+        graph.set_inputs(dest_file_path, (markdown_file_path,) + inputs)
+    for src_item, dest_item in assets:
+        entry = source_entry(src_item, None)
+        entry["mode"] = asset_mode
+        entry["output"] = dest_item
+        manifest["assets"][src_item] = entry
+    for source_path in removed:
+        entry = manifest["pages"].pop(source_path, None)
+        if entry is not None:
+            graph.remove(entry["output"])
+        manifest["assets"].pop(source_path, None)
+    manifest["graph"] = graph.to_dict()
+    save_manifest(manifest, manifest_path)
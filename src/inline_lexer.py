@@ -0,0 +1,134 @@
+import re
+from textnode import TextNode
+
+# Same shapes as extract_markdown_images / extract_markdown_links, anchored at the scan position
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"\[(.*?)\]\((.*?)\)")
+
+# Characters that may be escaped with a backslash to be taken literally
+ESCAPABLE = frozenset("\\`*_{}[]()#+-.!>")
+
+# Characters that can start something other than plain text
+SPECIAL_PATTERN = re.compile(r"[\\`*!\[]")
+
+def tokenize_inline(text):
+    # Emit the TextNode stream for one block of inline markdown in a single left-to-right scan
+    nodes, _ = scan(text, 0, None, "text", ())
+    return [node for node in nodes if node.text]
+
+def scan(text, i, closer, text_type, open_delimiters):
+    # Scan until the closing delimiter of the current span (or the end of text at top level).
+    # Plain text inside the span gets the span's text_type; nested spans recurse one level.
+    # A TextNode carries one text_type, so the innermost span wins: in "**a *b***" the "b" is
+    # italic only, and a link, image or code span inside emphasis keeps its own type. An
+    # emphasis span with no text of its own ("***x***", "**[l](u)**") would vanish entirely,
+    # so nested_span raises instead.
+    nodes = []
+    buffer = []
+    n = len(text)
+
+    def flush():
+        if buffer:
+            nodes.append(TextNode("".join(buffer), text_type))
+            buffer.clear()
+
+    while i < n:
+        # Copy runs of ordinary characters in one slice
+        special = SPECIAL_PATTERN.search(text, i)
+        if special is None:
+            buffer.append(text[i:])
+            i = n
+            break
+        if special.start() > i:
+            buffer.append(text[i:special.start()])
+            i = special.start()
+
+        char = text[i]
+
+        if char == "\\":
+            if i + 1 < n and text[i + 1] in ESCAPABLE:
+                buffer.append(text[i + 1])
+                i += 2
+            else:
+                buffer.append(char)
+                i += 1
+
+        elif char == "`":
+            # Code spans are raw: no escapes or emphasis inside
+            end = text.find("`", i + 1)
+            if end == -1:
+                raise ValueError("Unmatched delimiter '`' found in the text.")
+            flush()
+            nodes.append(TextNode(text[i + 1:end].strip(), "code"))
+            i = end + 1
+
+        elif char == "!" and text.startswith("[", i + 1):
+            match = IMAGE_PATTERN.match(text, i)
+            if match:
+                flush()
+                nodes.append(TextNode(match.group(1), "image", match.group(2)))
+                i = match.end()
+            else:
+                buffer.append(char)
+                i += 1
+
+        elif char == "[":
+            match = LINK_PATTERN.match(text, i)
+            if match:
+                flush()
+                nodes.append(TextNode(match.group(1), "link", match.group(2)))
+                i = match.end()
+            else:
+                buffer.append(char)
+                i += 1
+
+        elif char == "*":
+            double = text.startswith("**", i)
+            if closer == "**" and double:
+                flush()
+                return nodes, i + 2
+            if double and "**" not in open_delimiters:
+                flush()
+                # Fast path: a span with nothing special inside needs no nested scan
+                end = text.find("**", i + 2)
+                if end != -1 and SPECIAL_PATTERN.search(text, i + 2, end) is None:
+                    nodes.append(TextNode(text[i + 2:end], "bold"))
+                    i = end + 2
+                else:
+                    inner, i = nested_span(text, i + 2, "**", "bold", open_delimiters)
+                    nodes.extend(inner)
+            elif closer == "*":
+                flush()
+                return nodes, i + 1
+            elif "*" not in open_delimiters:
+                flush()
+                special = SPECIAL_PATTERN.search(text, i + 1)
+                if special is not None and special.group() == "*" and not text.startswith("**", special.start()):
+                    nodes.append(TextNode(text[i + 1:special.start()], "italic"))
+                    i = special.end()
+                else:
+                    inner, i = nested_span(text, i + 1, "*", "italic", open_delimiters)
+                    nodes.extend(inner)
+            else:
+                buffer.append(char)
+                i += 1
+
+        else:
+            buffer.append(char)
+            i += 1
+
+    if closer is not None:
+        raise ValueError(f"Unmatched delimiter '{closer}' found in the text.")
+    flush()
+    return nodes, i
+
+def nested_span(text, i, closer, text_type, open_delimiters):
+    # Scan an emphasis span and reject it when nested spans left none of its own text
+    start = i
+    nodes, i = scan(text, i, closer, text_type, open_delimiters + (closer,))
+    if not any(node.text and node.text_type == text_type for node in nodes):
+        raise ValueError(
+            f"Emphasis '{closer}' around '{text[start:i - len(closer)]}' contains only nested spans; "
+            f"a TextNode cannot be {text_type} and another type at once."
+        )
+    return nodes, i
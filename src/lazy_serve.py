@@ -0,0 +1,160 @@
+import functools
+import os
+import posixpath
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote, urlsplit
+from build_log import logger
+from front_matter import is_draft, page_template_path, split_front_matter
+from generate_page import prepare_page
+from template import load_template
+
+DEFAULT_CACHE_ENTRIES = 1000
+DEFAULT_CACHE_BYTES = 64 * 1024 * 1024
+
+class PageCache:
+    # Thread-safe LRU bounded by entry count and by the total size of the cached bodies
+    def __init__(self, max_entries=DEFAULT_CACHE_ENTRIES, max_bytes=DEFAULT_CACHE_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            self.entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value, size):
+        with self.lock:
+            self.discard_locked(key)
+            if size > self.max_bytes:
+                return
+            self.entries[key] = (value, size)
+            self.size += size
+            while len(self.entries) > self.max_entries or self.size > self.max_bytes:
+                _, (_, evicted_size) = self.entries.popitem(last=False)
+                self.size -= evicted_size
+
+    def discard(self, key):
+        with self.lock:
+            self.discard_locked(key)
+
+    def discard_locked(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def __len__(self):
+        return len(self.entries)
+
+class LazySite:
+    # Maps request paths to content/ pages and renders them on first request. A cached page is
+    # reused while its source's mtime and size and its compiled template are unchanged.
+    def __init__(self, content_directory, template_path, cache=None, include_drafts=False):
+        self.content_directory = content_directory
+        self.template_path = template_path
+        self.cache = cache if cache is not None else PageCache()
+        self.include_drafts = include_drafts
+
+    def source_for(self, url_path):
+        # Return (markdown path, redirect URL or None), or None when no page serves url_path:
+        # "/" and "/blog/" map to index.md, "/about.html" to about.md, and "/blog" redirects to "/blog/"
+        url_path = unquote(urlsplit(url_path).path)
+        redirect = None
+        if url_path.endswith("/"):
+            relative = url_path + "index.md"
+        elif url_path.endswith(".html"):
+            relative = url_path[:-len(".html")] + ".md"
+        else:
+            relative = url_path + "/index.md"
+            redirect = url_path + "/"
+        # Normalizing an absolute path cannot climb above the content directory
+        relative = posixpath.normpath("/" + relative).lstrip("/")
+        source = os.path.join(self.content_directory, *relative.split("/"))
+        if not os.path.isfile(source):
+            return None
+        return source, redirect
+
+    def render(self, source):
+        # The page's HTML as bytes, or None for a draft that previews leave out
+        stat = os.stat(source)
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self.cache.get(source)
+        if cached is not None:
+            cached_signature, template_path, template, body = cached
+            # load_template revalidates the template and its partials, returning the same object
+            # while none of them changed
+            if cached_signature == signature and load_template(template_path) is template:
+                return body
+
+        start = time.perf_counter()
+        with open(source, 'r') as file:
+            markdown_content = file.read()
+        fields, _ = split_front_matter(markdown_content)
+        if not self.include_drafts and is_draft(fields):
+            self.cache.discard(source)
+            return None
+        template, slots = prepare_page(markdown_content, self.template_path)
+        body = template.render(slots).encode("utf-8")
+        template_path = page_template_path(self.template_path, fields)
+        self.cache.put(source, (signature, template_path, template, body), len(body))
+        logger.info(f"Rendered {source} in {(time.perf_counter() - start) * 1000:.1f} ms")
+        return body
+
+class LazyRequestHandler(SimpleHTTPRequestHandler):
+    # Pages are rendered from content/ at request time; everything else is served from static/
+    def __init__(self, *args, site=None, **kwargs):
+        self.site = site
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if not self.send_page():
+            super().do_GET()
+
+    def do_HEAD(self):
+        if not self.send_page(head_only=True):
+            super().do_HEAD()
+
+    def send_page(self, head_only=False):
+        # True when the request was answered as a page (or a redirect to one)
+        found = self.site.source_for(self.path)
+        if found is None:
+            return False
+        source, redirect = found
+        if redirect is not None:
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header("Location", redirect)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return True
+        try:
+            body = self.site.render(source)
+        except Exception as e:
+            logger.error(f"Failed to render {source}: {type(e).__name__}: {e}")
+            self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f"Failed to render {source}: {e}")
+            return True
+        if body is None:
+            return False
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        if not head_only:
+            self.wfile.write(body)
+        return True
+
+def start_lazy_server(site, static_directory, port):
+    handler = functools.partial(LazyRequestHandler, site=site, directory=static_directory)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
@@ -0,0 +1,75 @@
+import os
+import posixpath
+import re
+from urllib.parse import unquote
+from site_index import output_url
+
+# Targets with a scheme (https:, mailto:, data:, ...) or protocol-relative ones leave the site
+EXTERNAL_PATTERN = re.compile(r"^(?:[a-zA-Z][a-zA-Z0-9+.-]*:|//)")
+
+def published_paths(site_index, static_files=()):
+    # In-memory index of every URL path the site serves: each page's file and directory forms
+    # plus the published static files, so checking a link never touches the filesystem
+    paths = set()
+    for output in site_index.pages:
+        url = output_url(output, site_index.destination_directory)
+        paths.add(url)
+        if url.endswith("/"):
+            paths.add(url + "index.html")
+            if url != "/":
+                paths.add(url[:-1])
+    for static_file in static_files:
+        paths.add(static_file)
+    return paths
+
+def static_urls(source_directory, url_prefix="/"):
+    # URL paths of everything under static/, which is published verbatim; url_prefix places
+    # another directory's files, such as public/search/ under "/search/"
+    urls = []
+    for root, dirs, files in os.walk(source_directory):
+        for name in files:
+            relative = os.path.relpath(os.path.join(root, name), source_directory)
+            urls.append(url_prefix + relative.replace(os.sep, "/"))
+    return urls
+
+def resolve_target(target, page_url):
+    # The site path a link or image points at, or None when there is nothing local to check
+    target = target.strip()
+    if not target or EXTERNAL_PATTERN.match(target):
+        return None
+    target = target.split("#", 1)[0].split("?", 1)[0]
+    if not target:
+        return None
+    if not target.startswith("/"):
+        base = page_url if page_url.endswith("/") else posixpath.dirname(page_url) + "/"
+        target = base + target
+    resolved = posixpath.normpath(unquote(target))
+    # normpath drops a trailing slash and keeps a leading "//"; neither matters for lookup here
+    if target.endswith("/") and resolved != "/":
+        resolved += "/"
+    return "/" + resolved.lstrip("/")
+
+def check_links(site_index, static_files=()):
+    # Return (source, kind, target) for every internal link or image whose target is not published
+    paths = published_paths(site_index, static_files)
+    broken = []
+    for output, page in sorted(site_index.pages.items()):
+        page_url = page["url"]
+        targets = [("link", url) for url in page["links"]]
+        targets += [("image", url) for _, url in page["images"]]
+        for kind, target in targets:
+            resolved = resolve_target(target, page_url)
+            if resolved is not None and resolved not in paths:
+                broken.append((page["source"], kind, target))
+    return broken
+
+def format_report(broken):
+    # One heading per page with its broken targets beneath, so failures read as a single batch
+    lines = []
+    current = None
+    for source, kind, target in broken:
+        if source != current:
+            lines.append(f"{source}:")
+            current = source
+        lines.append(f"  broken {kind}: {target}")
+    return "\n".join(lines)
@@ -1,8 +1,115 @@
+import argparse
 import os
 import shutil
+import sys
+from block_cache import BlockCache
+from build_log import configure_logging, logger
+from build_manifest import MANIFEST_PATH
+from build_timings import BuildTimings, NULL_TIMINGS
 from generate_page import generate_page 
-from generate_pages_recursive import generate_pages_recursive
-def main():
+from generate_pages_recursive import find_markdown_pages
+from incremental_build import incremental_build
+from link_check import check_links, format_report, static_urls
+from parallel_build import default_jobs, generate_pages_parallel
+from publish_assets import ASSET_MODES, publish_file
+from precompress import PRECOMPRESS_MIN_SIZE, available_encodings, precompress_directory
+from search_index import SEARCH_STATE_PATH, SearchIndex
+from shard_build import (SHARD_ROOT, SHARD_STRATEGIES, Shard, merge_shards, parse_shard, shard_directory,
+                         write_shard_manifest)
+from site_files import site_file_names, write_feed, write_redirects, write_sitemap
+from site_index import SITE_INDEX_PATH, SiteIndex
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the static site into the public directory.")
+    parser.add_argument('--incremental', action='store_true',
+                        help="only rebuild pages and assets that changed since the last build")
+    parser.add_argument('-j', '--jobs', type=int, default=1,
+                        help="number of worker processes for page generation (0 = one per CPU)")
+    parser.add_argument('--io-threads', type=int, default=0, metavar='N',
+                        help="with -j 1, pipeline the build: N reader and N writer threads overlap file I/O "
+                             "with rendering (0 = off)")
+    parser.add_argument('--assets', choices=ASSET_MODES, default='copy',
+                        help="how static files are published; hardlink and symlink share the file with static/ "
+                             "(falls back to copy when unsupported)")
+    parser.add_argument('--block-cache', metavar='PATH',
+                        help="reuse rendered HTML for repeated markdown blocks, persisted in PATH between builds")
+    parser.add_argument('--block-cache-size', type=int, default=10000,
+                        help="maximum number of blocks kept in the block cache")
+    parser.add_argument('-v', '--verbose', action='count', default=0,
+                        help="log each generated page and copied file; repeat for more detail")
+    parser.add_argument('--profile', '--timings', dest='profile', action='store_true',
+                        help="report wall time per build stage and the slowest pages")
+    parser.add_argument('--profile-format', choices=('table', 'json'), default='table',
+                        help="format of the --profile report")
+    parser.add_argument('--slowest', type=int, default=10, metavar='N',
+                        help="number of slowest pages listed in the --profile report")
+    parser.add_argument('--site-index', metavar='PATH', default=SITE_INDEX_PATH,
+                        help=f"where the site index (titles, headings, links and images of every page) "
+                             f"is saved (default {SITE_INDEX_PATH})")
+    parser.add_argument('--base-url', metavar='URL',
+                        help="absolute URL the site is served from; writes sitemap.xml, atom.xml and "
+                             "a _redirects map from the collected page metadata")
+    parser.add_argument('--search', action='store_true',
+                        help="write a prefix-sharded inverted search index to public/search/ "
+                             "(updated incrementally with --incremental)")
+    parser.add_argument('--explain', action='store_true',
+                        help="print why each page was rebuilt (which source, template or partial changed)")
+    parser.add_argument('--check-links', action='store_true',
+                        help="after building, report internal links and images that point at nothing "
+                             "the site publishes (exit status 1 when any are broken)")
+    parser.add_argument('--changed-list', metavar='PATH',
+                        help="write the paths of pages whose HTML actually changed to PATH, one per line")
+    parser.add_argument('--drafts', action='store_true',
+                        help="also build pages whose front matter says \"draft: true\"")
+    parser.add_argument('--precompress', action='store_true',
+                        help="write .gz siblings (and .br/.zst when brotli or zstd is installed) for text "
+                             "outputs, so the web server need not compress them per request")
+    parser.add_argument('--precompress-min-size', type=int, default=PRECOMPRESS_MIN_SIZE, metavar='BYTES',
+                        help="leave files smaller than BYTES uncompressed (default: %(default)s)")
+    parser.add_argument('--shard', type=parse_shard, metavar='I/N',
+                        help="build only slice I of N of the pages into SHARD_ROOT/I-of-N, for --merge-shards")
+    parser.add_argument('--shard-by', choices=SHARD_STRATEGIES, default='hash',
+                        help="split pages by a stable hash of their path, or into shards of balanced size")
+    parser.add_argument('--merge-shards', type=int, metavar='N',
+                        help="publish the N shard builds under SHARD_ROOT into the public directory, "
+                             "checking for conflicts")
+    parser.add_argument('--shard-root', default=SHARD_ROOT,
+                        help="directory holding the shard builds (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if (args.shard or args.merge_shards) and args.incremental:
+        parser.error("--shard and --merge-shards make full builds; drop --incremental")
+    if args.shard and args.merge_shards:
+        parser.error("--shard and --merge-shards are separate steps")
+    if args.shard and (args.search or args.base_url or args.check_links or args.precompress):
+        parser.error("--search, --base-url, --check-links and --precompress apply to the merged site, "
+                     "not to a shard")
+    if args.merge_shards and (args.search or args.explain or args.changed_list):
+        parser.error("--search, --explain and --changed-list are not supported with --merge-shards; "
+                     "shards do not collect search terms or rebuild reasons")
+    if args.merge_shards is not None and args.merge_shards < 1:
+        parser.error("--merge-shards needs at least one shard")
+    return args
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_logging(args.verbose)
+    jobs = args.jobs if args.jobs > 0 else default_jobs()
+    block_cache = BlockCache.load(args.block_cache, args.block_cache_size) if args.block_cache else None
+    timings = BuildTimings() if args.profile else None
+    try:
+        return build(args, jobs, block_cache, timings)
+    finally:
+        if timings is not None:
+            if args.profile_format == 'json':
+                print(timings.format_json(args.slowest))
+            else:
+                print(timings.format_table(args.slowest))
+        if block_cache is not None:
+            block_cache.save(args.block_cache)
+            stats = block_cache.stats()
+            print(f"Block cache: {stats['hits']} hits, {stats['misses']} misses, {stats['entries']} entries.")
+
+def build(args, jobs, block_cache, timings):
     # Define directories
     source_directory = 'static'
     destination_directory = 'public'
@@ -14,28 +121,190 @@ def main():
         print(f"Source directory {source_directory} does not exist.")
         return
 
-    # Delete everything in the public directory
+    if args.shard:
+        return build_shard(args, jobs, block_cache, timings, content_directory, template_path)
+
+    # Keep the existing output and rebuild only what changed
+    if args.incremental:
+        if not os.path.exists(template_path):
+            print("Template file does not exist.")
+            return
+        site_index = SiteIndex.load(args.site_index, destination_directory, collect_terms=args.search)
+        search_index = load_search_index(site_index, destination_directory) if args.search else None
+        stats = incremental_build(source_directory, content_directory, template_path, destination_directory,
+                                  jobs=jobs, asset_mode=args.assets, block_cache=block_cache,
+                                  timings=timings, io_threads=args.io_threads, site_index=site_index,
+                                  include_drafts=args.drafts)
+        site_index.save(args.site_index)
+        if search_index is not None:
+            update_search_index(search_index, site_index, timings)
+        if args.base_url:
+            write_site_files(site_index, destination_directory, args.base_url, timings)
+        if args.precompress:
+            precompress_outputs(destination_directory, jobs, args.precompress_min_size, timings)
+        print(f"Incremental build finished: {stats['pages_built']} pages built "
+              f"({len(stats['changed_outputs'])} changed), {stats['pages_skipped']} unchanged, "
+              f"{stats['pages_failed']} failed, {stats['assets_copied']} assets copied, "
+              f"{stats['assets_skipped']} unchanged, {stats['removed']} stale outputs removed.")
+        if args.explain:
+            explain(stats['reasons'])
+        write_changed_list(args.changed_list, stats['changed_outputs'])
+        broken = report_broken_links(args, site_index, source_directory, destination_directory, timings)
+        return 1 if stats['pages_failed'] or broken else 0
+
+    if args.explain:
+        print("Full build: every page is rebuilt (use --incremental to rebuild only what changed).")
+
+    # Outputs are overwritten in place, so identical pages keep their mtimes and --changed-list
+    # names only real changes; the manifest tells which old outputs are stale. Without one (or
+    # when merging shards) nothing records what public/ holds, so it starts out empty.
+    if os.path.exists(destination_directory) and (args.merge_shards or not os.path.exists(MANIFEST_PATH)):
+        shutil.rmtree(destination_directory)
+        logger.info(f"Deleted all contents of {destination_directory}")
+    os.makedirs(destination_directory, exist_ok=True)
+
+    if args.merge_shards:
+        # The merged pages have no per-source record, so --incremental must start over afterwards
+        if os.path.exists(MANIFEST_PATH):
+            os.remove(MANIFEST_PATH)
+        with (timings or NULL_TIMINGS).stage("asset copy"):
+            copy_directory_recursive(source_directory, destination_directory, args.assets)
+        print("Static files copied successfully.")
+        return merge_built_shards(args, jobs, source_directory, destination_directory, timings)
+
+    # Generate HTML files from markdown; every page is rebuilt, but through the incremental
+    # bookkeeping so the manifest describes public/ afterwards and --incremental can follow on
+    if not os.path.exists(template_path):
+        print("Template file does not exist.")
+        return
+    site_index = SiteIndex(destination_directory, collect_terms=args.search)
+    search_index = load_search_index(site_index, destination_directory) if args.search else None
+    stats = incremental_build(source_directory, content_directory, template_path, destination_directory,
+                              jobs=jobs, asset_mode=args.assets, block_cache=block_cache,
+                              timings=timings, io_threads=args.io_threads, site_index=site_index,
+                              include_drafts=args.drafts, force=True)
+    print("Static files copied successfully.")
+    site_index.save(args.site_index)
+    if search_index is not None:
+        update_search_index(search_index, site_index, timings)
+    if args.base_url:
+        write_site_files(site_index, destination_directory, args.base_url, timings)
+    if args.precompress:
+        precompress_outputs(destination_directory, jobs, args.precompress_min_size, timings)
+    write_changed_list(args.changed_list, stats['changed_outputs'])
+    if stats['pages_failed']:
+        print(f"{stats['pages_failed']} page(s) failed to generate.")
+    else:
+        print(f"All pages generated successfully ({len(stats['changed_outputs'])} changed).")
+    broken = report_broken_links(args, site_index, source_directory, destination_directory, timings)
+    return 1 if stats['pages_failed'] or broken else 0
+
+def build_shard(args, jobs, block_cache, timings, content_directory, template_path):
+    # One slice of the pages into its own directory; each host (or process) builds one and a
+    # single --merge-shards run publishes them all
+    shard = Shard(*args.shard, args.shard_by)
+    destination_directory = shard_directory(args.shard_root, shard.index, shard.count)
+    if not os.path.exists(template_path):
+        print("Template file does not exist.")
+        return
     if os.path.exists(destination_directory):
         shutil.rmtree(destination_directory)
-        print(f"Deleted all contents of {destination_directory}")
-    
-    # Recreate the public directory
     os.makedirs(destination_directory)
-    print(f"Created destination directory {destination_directory}")
 
-    # Copy all static files
-    copy_directory_recursive(source_directory, destination_directory)
-    print("Static files copied successfully.")
+    site_index = SiteIndex(destination_directory)
+    # build_pages handles -j 1 too, and collects every failed page for the shard manifest
+    errors = generate_pages_parallel(content_directory, template_path, destination_directory, jobs,
+                                     block_cache, timings, None, args.io_threads, site_index,
+                                     args.drafts, shard)
+    pages = find_markdown_pages(content_directory, destination_directory, args.drafts, shard)
+    write_shard_manifest(destination_directory, shard, content_directory, pages, errors, site_index)
+    if errors:
+        print(f"Shard {shard}: {len(errors)} page(s) failed to generate.")
+    else:
+        print(f"Shard {shard}: {len(pages)} page(s) built into {destination_directory}.")
+    return 1 if errors else 0
+
+def merge_built_shards(args, jobs, source_directory, destination_directory, timings=None):
+    # Outputs go into public/ next to the freshly copied static files; the shards' site index
+    # records become the site index, so site files and link checks work as after a full build
+    site_index, conflicts, failed = merge_shards(args.shard_root, args.merge_shards, destination_directory,
+                                                 args.assets)
+    site_index.save(args.site_index)
+    if args.base_url:
+        write_site_files(site_index, destination_directory, args.base_url, timings)
+    if args.precompress:
+        precompress_outputs(destination_directory, jobs, args.precompress_min_size, timings)
+    for conflict in conflicts:
+        print(f"Conflict: {conflict}")
+    if failed:
+        print(f"{len(failed)} page(s) failed to generate in the shards: {', '.join(failed)}")
+    print(f"Merged {args.merge_shards} shard(s): {len(site_index)} pages, {len(conflicts)} conflict(s).")
+    broken = report_broken_links(args, site_index, source_directory, destination_directory, timings)
+    return 1 if conflicts or failed or broken else 0
+
+def write_site_files(site_index, destination_directory, base_url, timings=None):
+    # Site-wide files come from the index collected while rendering; public/ is never re-read
+    timings = timings or NULL_TIMINGS
+    with timings.stage("sitemap"):
+        changed = write_sitemap(site_index, destination_directory, base_url)
+    with timings.stage("feed"):
+        changed += write_feed(site_index, destination_directory, base_url)
+    with timings.stage("redirects"):
+        changed += write_redirects(site_index, destination_directory)
+    print(f"Sitemap, feed and redirects written for {len(site_index)} pages ({changed} file(s) changed).")
 
-    # Generate HTML files from markdown
-    if os.path.exists(template_path):
-        generate_pages_recursive(content_directory, template_path, destination_directory)
-        print("All pages generated successfully.")
+def precompress_outputs(destination_directory, jobs, min_size, timings=None):
+    # Runs last so the site files and search shards get their compressed siblings too
+    with (timings or NULL_TIMINGS).stage("precompress"):
+        stats = precompress_directory(destination_directory, jobs, min_size)
+    encodings = ", ".join(suffix for suffix, _ in available_encodings())
+    print(f"Precompressed {stats['compressed']} file(s) ({encodings}), {stats['skipped']} unchanged, "
+          f"{stats['removed']} stale sibling(s) removed.")
+
+def load_search_index(site_index, destination_directory):
+    # Pages the published search index already covers need not be re-parsed for their terms
+    search_index = SearchIndex.load(SEARCH_STATE_PATH, os.path.join(destination_directory, 'search'))
+    site_index.indexed_outputs = set(search_index.documents)
+    return search_index
+
+def update_search_index(search_index, site_index, timings=None):
+    with (timings or NULL_TIMINGS).stage("search index"):
+        written = search_index.update(site_index)
+    search_index.save(SEARCH_STATE_PATH)
+    print(f"Search index: {len(search_index.documents)} pages, {written} shard(s) written.")
+
+def report_broken_links(args, site_index, source_directory, destination_directory, timings=None):
+    # With --check-links, links are checked against the site index, the static/ listing and the
+    # files this build's later stages wrote (site files, search shards), then reported in one batch
+    if not args.check_links:
+        return []
+    published = static_urls(source_directory)
+    if args.base_url:
+        published += ["/" + name for name in site_file_names(destination_directory)]
+    if args.search:
+        published += static_urls(os.path.join(destination_directory, 'search'), "/search/")
+    with (timings or NULL_TIMINGS).stage("link check"):
+        broken = check_links(site_index, published)
+    if broken:
+        print(format_report(broken))
+        pages = len({source for source, _, _ in broken})
+        print(f"{len(broken)} broken link(s) on {pages} page(s).")
     else:
-        print("Template file does not exist.")
+        print("No broken links.")
+    return broken
+
+def explain(reasons):
+    for output, output_reasons in reasons.items():
+        print(f"{output}: rebuilt because {'; '.join(output_reasons)}")
+
+def write_changed_list(path, changed_outputs):
+    # Lets a deploy step upload only the pages that actually changed
+    if path:
+        with open(path, 'w') as file:
+            file.writelines(f"{output}\n" for output in changed_outputs)
 
 
-def copy_directory_recursive(src, dest):
+def copy_directory_recursive(src, dest, mode='copy'):
     # Loop through the items in the source directory
     for item in os.listdir(src):
         src_item = os.path.join(src, item)
@@ -43,13 +312,14 @@ def copy_directory_recursive(src, dest):
 
         # If it's a directory then recurse into it
         if os.path.isdir(src_item):
-            print(f"Copying directory: {src_item} to {dest_item}")
+            logger.debug(f"Copying directory: {src_item} to {dest_item}")
             os.makedirs(dest_item, exist_ok=True)
-            copy_directory_recursive(src_item, dest_item)
+            copy_directory_recursive(src_item, dest_item, mode)
         else:
-            # Otherwise it's a file so copy it
-            print(f"Copying file: {src_item} to {dest_item}")
-            shutil.copy2(src_item, dest_item)
+            # Otherwise it's a file so publish it, skipping files whose size and mtime already match
+            used_mode = publish_file(src_item, dest_item, mode)
+            if used_mode:
+                logger.info(f"Copying file: {src_item} to {dest_item} ({used_mode})")
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
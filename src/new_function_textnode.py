@@ -1,6 +1,7 @@
 import re
 from textnode import TextNode
 from htmlnode import HTMLNode, LeafNode, ParentNode, text_node_to_html_node
+from inline_lexer import tokenize_inline
 
 # Split nodes on delimiter
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
@@ -84,8 +85,12 @@ def split_nodes_link(old_nodes):
     
     return new_nodes or old_nodes 
 
-# Converting text to textnode
+# Converting text to textnode with the single-pass inline lexer
 def text_to_textnodes(text):
+    return tokenize_inline(text)
+
+# Original chained split_nodes_* pipeline, kept for comparison benchmarks
+def text_to_textnodes_chained(text):
     nodes = [TextNode(text, "text")]
 
     nodes = split_nodes_image(nodes)
@@ -106,76 +111,185 @@ def text_to_textnodes(text):
 
     return [node for node in nodes if node.text]
 
-# Function for markdown to blocks
-def markdown_to_blocks(markdown):
-    blocks = [block.strip() for block in markdown.split('\n\n') if block.strip()]
-    cleaned_blocks = []
-    for block in blocks:
-        cleaned_block = '\n'.join(line.strip() for line in block.splitlines())
-        cleaned_blocks.append(cleaned_block)
-    return cleaned_blocks
+# Patterns used by block classification, compiled once
+ORDERED_ITEM_PATTERN = re.compile(r'^\d+\.\s')
+ORDERED_ITEM_PREFIX = re.compile(r'^\d+\.\s*')
 
-# Function for block to block type
-def block_to_block_type(block):
-    block = block.strip()
-    if not block:
+# Split a document into stripped lines and (block_type, start, end) spans over those lines.
+# Blocks are separated by blank lines, except inside a closed ``` fence; each line is visited
+# a constant number of times, so huge documents are never re-split or re-joined.
+# With classify=False the block type is left as None for callers that only need the spans.
+def scan_blocks(markdown, classify=True):
+    lines = [line.strip() for line in markdown.splitlines()]
+    spans = []
+    count = len(lines)
+    fences_closed = True
+    i = 0
+    while i < count:
+        if not lines[i]:
+            i += 1
+            continue
+
+        start = i
+        end = None
+        first = lines[i]
+        if fences_closed and first.startswith("```") and (first == "```" or not first.endswith("```")):
+            # Keep a fenced code block together across blank lines, if the fence is ever closed
+            for j in range(i + 1, count):
+                if lines[j].endswith("```"):
+                    end = j + 1
+                    break
+            else:
+                # No fence closes after this point, so no later fence can either
+                fences_closed = False
+        if end is None:
+            end = i + 1
+            while end < count and lines[end]:
+                end += 1
+
+        spans.append((classify_lines(lines, start, end) if classify else None, start, end))
+        i = end
+    return lines, spans
+
+# Classify the stripped lines[start:end] of one block
+def classify_lines(lines, start, end):
+    if start >= end:
         return 'paragraph'
-    if block.startswith("```") and block.endswith("```"):
+    first = lines[start]
+    if first.startswith("```") and lines[end - 1].endswith("```"):
         return 'code'
-    if block.startswith('#'):
-        if ' ' in block[1:]:
+    if first.startswith('#'):
+        if ' ' in first[1:] or any(' ' in lines[k] for k in range(start + 1, end)):
             return 'heading'
-    if all(line.startswith('>') for line in block.splitlines()):
+
+    quote = unordered = ordered = True
+    for k in range(start, end):
+        line = lines[k]
+        if quote and not line.startswith('>'):
+            quote = False
+        if unordered and not line.startswith(('* ', '- ')):
+            unordered = False
+        if ordered and not ORDERED_ITEM_PATTERN.match(line.lstrip()):
+            ordered = False
+        if not (quote or unordered or ordered):
+            return 'paragraph'
+
+    if quote:
         return 'quote'
-    if all(line.startswith(('* ', '- ')) for line in block.splitlines()):
+    if unordered:
         return 'unordered_list'
-    
-    ordered_list_pattern = re.compile(r'^\d+\.\s')
-    if all(ordered_list_pattern.match(line.lstrip()) for line in block.splitlines()):
-        return 'ordered_list'
-    
-    return 'paragraph'
+    return 'ordered_list'
+
+# Function for markdown to blocks
+def markdown_to_blocks(markdown):
+    lines, spans = scan_blocks(markdown, classify=False)
+    return ['\n'.join(lines[start:end]) for _, start, end in spans]
 
-# Function to convert text to HTML nodes
-def text_to_children(text):
+# Function for block to block type
+def block_to_block_type(block):
+    lines = block.strip().splitlines()
+    return classify_lines(lines, 0, len(lines))
+
+# Function to convert text to HTML nodes; an outline collects the links and images on the way
+def text_to_children(text, outline=None):
     nodes = text_to_textnodes(text)
+    if outline is not None:
+        outline.add_text_nodes(nodes)
     return [text_node_to_html_node(node) for node in nodes]
 
+# Convert a single markdown block to an HTMLNode; callers that already scanned the block
+# can pass its type and lines to skip re-classifying and re-splitting it.
+# A PageOutline passed as outline records the block's headings, links and images.
+def block_to_html_node(block, block_type=None, lines=None, outline=None):
+    if block_type is None:
+        block_type = block_to_block_type(block)
+
+    if block_type == 'paragraph':
+        return ParentNode(tag="p", children=text_to_children(block.strip(), outline))
+    elif block_type == 'code':
+        code_content = block.strip("```").strip()
+        return ParentNode(tag="pre", children=[
+            ParentNode(tag="code", children=[LeafNode(tag=None, value=code_content)])
+        ])
+    elif block_type == 'heading':
+        # Count the heading level and clean the heading text
+        level = block.count('#')
+        heading_content = block.strip('#').strip()
+        if outline is not None:
+            outline.add_heading(level, heading_content)
+        return ParentNode(tag=f"h{level}", children=[LeafNode(tag=None, value=heading_content)])
+    elif block_type == 'quote':
+        quote_content = block.strip('> ').strip()
+        if outline is not None:
+            outline.add_text(quote_content)
+        return ParentNode(tag="blockquote", children=[LeafNode(tag=None, value=quote_content)])
+    elif block_type in ('unordered_list', 'ordered_list'):
+        item_texts = list_item_texts(block, block_type, lines)
+        if outline is not None:
+            for item in item_texts:
+                outline.add_text(item)
+        items = [ParentNode(tag="li", children=[LeafNode(tag=None, value=item)]) for item in item_texts]
+        return ParentNode(tag="ul" if block_type == 'unordered_list' else "ol", children=items)
+    else:
+        return ParentNode(tag="p", children=text_to_children(block.strip(), outline))
+
+def list_item_texts(block, block_type, lines=None):
+    items = lines if lines is not None else block.splitlines()
+    if block_type == 'unordered_list':
+        return [item.strip('* - ').strip() for item in items]
+    return [ORDERED_ITEM_PREFIX.sub("", item).strip() for item in items]
+
 # Convert a markdown document to an HTMLNode
-def markdown_to_html_node(markdown):
-    blocks = markdown_to_blocks(markdown)
+def markdown_to_html_node(markdown, outline=None):
+    lines, spans = scan_blocks(markdown)
+    return ParentNode(tag="div", children=spans_to_html_nodes(lines, spans, outline))
+
+# Build one HTMLNode per scanned block, reusing the scanner's classification and line split
+def spans_to_html_nodes(lines, spans, outline=None):
     html_nodes = []
+    for block_type, start, end in spans:
+        block_lines = lines[start:end]
+        html_nodes.append(block_to_html_node('\n'.join(block_lines), block_type, block_lines, outline))
+    return html_nodes
 
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        
-        if block_type == 'paragraph':
-            html_nodes.append(ParentNode(tag="p", children=text_to_children(block.strip())))
-        elif block_type == 'code':
-            code_content = block.strip("```").strip()
-            html_nodes.append(ParentNode(tag="pre", children=[
-                ParentNode(tag="code", children=[LeafNode(tag=None, value=code_content)])
-            ]))
-        elif block_type == 'heading':
-            # Count the heading level and clean the heading text
-            level = block.count('#')
-            heading_content = block.strip('#').strip()
-            html_nodes.append(ParentNode(tag=f"h{level}", children=[LeafNode(tag=None, value=heading_content)]))
-        elif block_type == 'quote':
-            quote_content = block.strip('> ').strip()
-            html_nodes.append(ParentNode(tag="blockquote", children=[LeafNode(tag=None, value=quote_content)]))
-        elif block_type == 'unordered_list':
-            items = [ParentNode(tag="li", children=[LeafNode(tag=None, value=item.strip('* - ').strip())])
-                     for item in block.splitlines()]
-            html_nodes.append(ParentNode(tag="ul", children=items))
-        elif block_type == 'ordered_list':
-            ordered_list_pattern = re.compile(r'^\d+\.\s*')
-            items = [ParentNode(tag="li", children=[LeafNode(tag=None, value=ordered_list_pattern.sub("", item).strip())])
-                     for item in block.splitlines()]
-            html_nodes.append(ParentNode(tag="ol", children=items))
-        else:
-            html_nodes.append(ParentNode(tag="p", children=text_to_children(block.strip())))
+# Render a markdown document as HTML chunks, reusing cached fragments for repeated blocks
+def markdown_to_html_chunks(markdown, cache, outline=None):
+    return blocks_to_html_chunks(markdown_to_blocks(markdown), cache, outline)
 
-    return ParentNode(tag="div", children=html_nodes)
+def blocks_to_html_chunks(blocks, cache, outline=None):
+    if not blocks:
+        raise ValueError("ParentNode must have at least one child.")
+    # Render eagerly so errors surface before the caller starts writing output
+    if outline is None:
+        fragments = [cache.get_or_render(block, render_block) for block in blocks]
+    else:
+        fragments = [cached_block_html(block, cache, outline) for block in blocks]
+    return ["<div>", *fragments, "</div>"]
 
+def cached_block_html(block, cache, outline, block_type=None, lines=None):
+    # Cache misses fill the outline while rendering; hits skip the render, so only the
+    # metadata is recovered: headings and plain text from the block, links and images from the lexer
+    rendered = []
+
+    def render(text):
+        rendered.append(True)
+        return block_to_html_node(text, block_type, lines, outline).to_html()
+
+    fragment = cache.get_or_render(block, render)
+    if not rendered:
+        block_type = block_type or block_to_block_type(block)
+        if block_type == 'heading':
+            outline.add_heading(block.count('#'), block.strip('#').strip())
+        elif block_type == 'paragraph' and (outline.terms is not None or '](' in block):
+            outline.add_text_nodes(text_to_textnodes(block.strip()))
+        elif outline.terms is None:
+            pass
+        elif block_type == 'quote':
+            outline.add_text(block.strip('> ').strip())
+        elif block_type in ('unordered_list', 'ordered_list'):
+            for item in list_item_texts(block, block_type, lines):
+                outline.add_text(item)
+    return fragment
 
+def render_block(block):
+    return block_to_html_node(block).to_html()
@@ -0,0 +1,103 @@
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from block_cache import BlockCache
+from build_log import capture_records, logger, replay_records
+from build_timings import BuildTimings
+from generate_page import generate_page
+from generate_pages_recursive import find_markdown_pages
+from pipeline_build import build_pages_pipelined
+from site_index import PageOutline
+
+# Per-process block cache: the parent's cache when building serially, a seeded copy in workers
+_block_cache = None
+
+def default_jobs():
+    return os.cpu_count() or 1
+
+def init_worker(cache_entries, max_entries, log_level):
+    global _block_cache
+    logger.setLevel(log_level)
+    if cache_entries is not None:
+        _block_cache = BlockCache(max_entries)
+        _block_cache.entries.update(cache_entries)
+        _block_cache.track_rendered()
+
+def build_page(task):
+    # Runs inside a worker: capture the page's log records so the parent can replay them in order
+    markdown_file_path, template_path, dest_file_path, profile, collect_terms = task
+    timings = BuildTimings() if profile else None
+    outline = PageOutline(terms=collect_terms) if collect_terms is not None else None
+    error = None
+    changed = False
+    with capture_records() as records:
+        try:
+            changed = generate_page(markdown_file_path, template_path, dest_file_path, block_cache=_block_cache,
+                                    timings=timings, outline=outline)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    outline = outline.to_dict() if outline is not None and error is None else None
+    # Only a worker's seeded cache tracks what it rendered; serially the parent's cache is used directly
+    cache_delta = _block_cache.take_delta() if _block_cache is not None and _block_cache.rendered is not None else None
+    return records, error, timings.to_dict() if timings else None, changed, outline, cache_delta
+
+def build_pages(pages, template_path, jobs=1, block_cache=None, timings=None, changed_outputs=None,
+                io_threads=0, site_index=None):
+    # Build (markdown path, html path) pairs and return a list of (markdown path, error) failures;
+    # outputs whose bytes actually changed are appended to changed_outputs when it is given,
+    # and each built page's outline is recorded in site_index.
+    # A single-process build with io_threads overlaps reads and writes with rendering.
+    global _block_cache
+    if jobs <= 1 and io_threads > 0:
+        return build_pages_pipelined(pages, template_path, io_threads, block_cache=block_cache,
+                                     timings=timings, changed_outputs=changed_outputs, site_index=site_index)
+    profile = timings is not None
+    # The last task field is None without a site index, else whether to collect search terms
+    collect_terms = site_index.collect_terms if site_index is not None else None
+    tasks = [(markdown_file_path, template_path, dest_file_path, profile, collect_terms)
+             for markdown_file_path, dest_file_path in pages]
+
+    if jobs <= 1 or len(tasks) <= 1:
+        _block_cache = block_cache
+        try:
+            return collect_results(tasks, map(build_page, tasks), timings, changed_outputs, site_index, block_cache)
+        finally:
+            _block_cache = None
+
+    # Workers start from a copy of the cache and send the blocks they render back with each page
+    if block_cache is not None:
+        initargs = (OrderedDict(block_cache.entries), block_cache.max_entries, logger.level)
+    else:
+        initargs = (None, 0, logger.level)
+
+    # map() yields results in submission order, which keeps the log deterministic
+    chunksize = max(1, len(tasks) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=initargs) as executor:
+        results = executor.map(build_page, tasks, chunksize=chunksize)
+        return collect_results(tasks, results, timings, changed_outputs, site_index, block_cache)
+
+def collect_results(tasks, results, timings=None, changed_outputs=None, site_index=None, block_cache=None):
+    errors = []
+    for task, (records, error, page_timings, changed, outline, cache_delta) in zip(tasks, results):
+        markdown_file_path, _, dest_file_path, _, _ = task
+        replay_records(records)
+        if changed and changed_outputs is not None:
+            changed_outputs.append(dest_file_path)
+        if outline is not None and site_index is not None:
+            site_index.add(markdown_file_path, dest_file_path, outline)
+        if page_timings and timings is not None:
+            timings.merge(page_timings)
+        if cache_delta is not None and block_cache is not None:
+            block_cache.merge(cache_delta)
+        if error:
+            logger.error(f"Failed to generate {markdown_file_path}: {error}")
+            errors.append((markdown_file_path, error))
+    return errors
+
+def generate_pages_parallel(dir_path_content, template_path, dest_dir_path, jobs=None, block_cache=None,
+                            timings=None, changed_outputs=None, io_threads=0, site_index=None, include_drafts=False,
+                            shard=None):
+    if jobs is None:
+        jobs = default_jobs()
+    pages = find_markdown_pages(dir_path_content, dest_dir_path, include_drafts, shard)
+    return build_pages(pages, template_path, jobs, block_cache, timings, changed_outputs, io_threads, site_index)
@@ -0,0 +1,114 @@
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from build_log import logger
+from build_timings import NULL_TIMINGS
+from generate_page import prepare_page
+from stream_page import STREAM_THRESHOLD, generate_page_streaming
+from write_output import OutputWriter
+
+# Pages read ahead of the render stage, and rendered pages waiting for a writer
+DEFAULT_DEPTH = 16
+
+def read_source(markdown_file_path):
+    # Reader stage; very large sources are left for the streaming renderer to read block by block
+    if os.path.getsize(markdown_file_path) >= STREAM_THRESHOLD:
+        return None
+    with open(markdown_file_path, 'r') as file:
+        return file.read()
+
+def write_page(dest_file_path, html_page):
+    # Writer stage; returns True when the output changed
+    os.makedirs(os.path.dirname(dest_file_path), exist_ok=True)
+    with OutputWriter(dest_file_path) as file:
+        file.write(html_page)
+    return file.changed
+
+def build_pages_pipelined(pages, template_path, io_threads=4, depth=DEFAULT_DEPTH, block_cache=None,
+                          timings=None, changed_outputs=None, site_index=None):
+    # Overlap blocking reads and writes with rendering: reader threads prefetch sources, this thread
+    # renders them in page order, and writer threads flush the results. At most `depth` pages sit in
+    # each of the two queues, so memory stays flat however large the site is.
+    # Returns a list of (markdown path, error) failures, like build_pages; page outlines are
+    # recorded in site_index once their output has been written.
+    timings = timings or NULL_TIMINGS
+    errors = []
+    pages = iter(pages)
+    reads = deque()
+    writes = deque()
+
+    def fail(markdown_file_path, error):
+        error = f"{type(error).__name__}: {error}"
+        logger.error(f"Failed to generate {markdown_file_path}: {error}")
+        errors.append((markdown_file_path, error))
+
+    def finish_write():
+        # Results are taken in page order, which keeps the log and changed_outputs deterministic
+        markdown_file_path, dest_file_path, outline, future = writes.popleft()
+        try:
+            changed = future.result()
+        except Exception as e:
+            fail(markdown_file_path, e)
+            return
+        if changed and changed_outputs is not None:
+            changed_outputs.append(dest_file_path)
+        if site_index is not None:
+            site_index.add(markdown_file_path, dest_file_path, outline)
+        if changed:
+            logger.info(f"Page generated and saved to {dest_file_path}")
+        else:
+            logger.info(f"Page unchanged, kept {dest_file_path}")
+
+    with ThreadPoolExecutor(io_threads, thread_name_prefix="reader") as readers, \
+            ThreadPoolExecutor(io_threads, thread_name_prefix="writer") as writers:
+
+        def prefetch():
+            while len(reads) < depth:
+                page = next(pages, None)
+                if page is None:
+                    return
+                markdown_file_path, dest_file_path = page
+                reads.append((markdown_file_path, dest_file_path, readers.submit(read_source, markdown_file_path)))
+
+        prefetch()
+        while reads:
+            markdown_file_path, dest_file_path, future = reads.popleft()
+            prefetch()
+            logger.debug(f"Generating page from {markdown_file_path} to {dest_file_path} using {template_path}")
+            start = time.perf_counter()
+            outline = site_index.new_outline() if site_index is not None else None
+            try:
+                markdown_content = future.result()
+                if markdown_content is None:
+                    # Streamed pages do their own I/O; drain pending writes first to keep the log in order
+                    while writes:
+                        finish_write()
+                    with timings.stage("streamed pages"):
+                        changed = generate_page_streaming(markdown_file_path, template_path, dest_file_path,
+                                                          block_cache=block_cache, outline=outline)
+                    if changed and changed_outputs is not None:
+                        changed_outputs.append(dest_file_path)
+                    if site_index is not None:
+                        site_index.add(markdown_file_path, dest_file_path, outline)
+                    continue
+                template, slots = prepare_page(markdown_content, template_path, block_cache=block_cache,
+                                               timings=timings, outline=outline)
+                with timings.stage("template render"):
+                    html_page = template.render(slots)
+            except Exception as e:
+                while writes:
+                    finish_write()
+                fail(markdown_file_path, e)
+                continue
+            finally:
+                timings.add_page(markdown_file_path, time.perf_counter() - start)
+
+            if len(writes) >= depth:
+                finish_write()
+            writes.append((markdown_file_path, dest_file_path, outline,
+                           writers.submit(write_page, dest_file_path, html_page)))
+
+        while writes:
+            finish_write()
+    return errors
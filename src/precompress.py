@@ -0,0 +1,160 @@
+import gzip
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional encoders: brotli from the brotli package, zstd from the standard library (3.14+)
+# or the zstandard package. gzip is always available.
+try:
+    import brotli
+except ImportError:
+    brotli = None
+try:
+    from compression import zstd
+except ImportError:
+    zstd = None
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Text outputs worth compressing; images, fonts and archives are compressed already
+COMPRESSIBLE_EXTENSIONS = {".html", ".css", ".js", ".mjs", ".json", ".xml", ".svg", ".txt", ".map", ".md"}
+
+# Below this size the compressed file saves too little to be worth serving
+PRECOMPRESS_MIN_SIZE = 1024
+
+def gzip_compress(data):
+    # mtime=0 keeps the output byte-identical across builds
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def available_encodings():
+    # (sibling suffix, compress function) for every encoder this Python can use
+    encodings = [("gz", gzip_compress)]
+    if brotli is not None:
+        encodings.append(("br", lambda data: brotli.compress(data, quality=11)))
+    if zstd is not None:
+        encodings.append(("zst", lambda data: zstd.compress(data, level=19)))
+    elif zstandard is not None:
+        encodings.append(("zst", lambda data: zstandard.ZstdCompressor(level=19).compress(data)))
+    return encodings
+
+SIBLING_SUFFIXES = ("gz", "br", "zst")
+
+# Which siblings this stage wrote, so a real .gz/.br/.zst asset is never mistaken for a stale one
+PRECOMPRESS_STATE_PATH = '.precompress_state.json'
+
+def load_state(state_path, directory):
+    # {sibling path relative to directory: its mtime_ns when written}; empty when unreadable or
+    # written for another directory
+    try:
+        with open(state_path, 'r') as file:
+            state = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    return state.get("siblings", {}) if state.get("directory") == directory else {}
+
+def save_state(state_path, directory, siblings):
+    tmp_path = state_path + '.tmp'
+    with open(tmp_path, 'w') as file:
+        json.dump({"directory": directory, "siblings": siblings}, file, sort_keys=True)
+    os.replace(tmp_path, state_path)
+
+def should_compress(path, min_size):
+    return os.path.splitext(path)[1] in COMPRESSIBLE_EXTENSIONS and os.path.getsize(path) >= min_size
+
+def sibling_is_current(sibling, source_stat):
+    # Siblings carry their source's mtime, so an unchanged output is recognised from metadata alone
+    try:
+        return os.stat(sibling).st_mtime_ns == source_stat.st_mtime_ns
+    except FileNotFoundError:
+        return False
+
+def write_sibling(path, data, source_stat):
+    directory, name = os.path.split(path)
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+    os.utime(tmp_path, ns=(source_stat.st_atime_ns, source_stat.st_mtime_ns))
+    os.replace(tmp_path, path)
+
+def compress_file(path, encodings, is_sibling=lambda path: True):
+    # Write the siblings that are missing or older than path, leaving alone any file in a
+    # sibling's place that is_sibling says this stage did not write.
+    # Returns (number of siblings written, paths of all of path's siblings now in place).
+    stat = os.stat(path)
+    stale = []
+    siblings = []
+    for suffix, compress in encodings:
+        sibling = f"{path}.{suffix}"
+        if os.path.exists(sibling) and not is_sibling(sibling):
+            continue
+        siblings.append(sibling)
+        if not sibling_is_current(sibling, stat):
+            stale.append((sibling, compress))
+    if stale:
+        with open(path, 'rb') as file:
+            data = file.read()
+        for sibling, compress in stale:
+            write_sibling(sibling, compress(data), stat)
+    return len(stale), siblings
+
+def precompress_directory(directory, jobs=1, min_size=PRECOMPRESS_MIN_SIZE, encodings=None,
+                          state_path=PRECOMPRESS_STATE_PATH):
+    # Give every compressible file of at least min_size bytes a .gz sibling (plus .br/.zst when
+    # those encoders are installed), compressing in a pool of `jobs` threads; zlib and the other
+    # encoders release the GIL while they work. Siblings whose source went away, shrank below
+    # min_size or whose encoder is no longer available are removed so they are never served stale.
+    # Only files this stage wrote count as siblings: those recorded in state_path, or those
+    # carrying their existing source's mtime. Anything else, such as a static data.json.gz, is
+    # an asset in its own right and is neither overwritten nor removed.
+    # Returns {"compressed", "skipped", "removed"} counts of files.
+    encodings = available_encodings() if encodings is None else encodings
+    suffixes = {suffix for suffix, _ in encodings}
+    written = load_state(state_path, directory) if state_path is not None else {}
+    stats = {"compressed": 0, "skipped": 0, "removed": 0}
+
+    def is_sibling(path):
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if written.get(os.path.relpath(path, directory)) == mtime:
+            return True
+        try:
+            return os.stat(os.path.splitext(path)[0]).st_mtime_ns == mtime
+        except FileNotFoundError:
+            return False
+
+    sources = []
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            path = os.path.join(root, name)
+            base, extension = os.path.splitext(name)
+            if name.startswith(".") and name.endswith(".tmp"):
+                continue
+            if extension[1:] in SIBLING_SUFFIXES and os.path.splitext(base)[1] in COMPRESSIBLE_EXTENSIONS:
+                if not is_sibling(path):
+                    continue
+                source = os.path.join(root, base)
+                current = extension[1:] in suffixes and os.path.exists(source) and should_compress(source, min_size)
+                if not current:
+                    os.remove(path)
+                    stats["removed"] += 1
+                continue
+            if should_compress(path, min_size):
+                sources.append(path)
+
+    compress = lambda path: compress_file(path, encodings, is_sibling)
+    if jobs > 1 and len(sources) > 1:
+        with ThreadPoolExecutor(jobs, thread_name_prefix="compress") as executor:
+            results = list(executor.map(compress, sources))
+    else:
+        results = [compress(path) for path in sources]
+    stats["compressed"] = sum(1 for count, _ in results if count)
+    stats["skipped"] = len(results) - stats["compressed"]
+    if state_path is not None:
+        save_state(state_path, directory, {os.path.relpath(sibling, directory): os.stat(sibling).st_mtime_ns
+                                           for _, siblings in results for sibling in siblings})
+    return stats
@@ -0,0 +1,82 @@
+import errno
+import os
+import shutil
+
+ASSET_MODES = ("copy", "hardlink", "symlink", "reflink")
+
+# Linux FICLONE ioctl: share the source's extents copy-on-write (btrfs, XFS, bcachefs)
+FICLONE = 0x40049409
+
+# (mode, device) pairs already known not to work, so we don't retry them for every file
+_unsupported = set()
+
+def is_unchanged(src, dest, mode):
+    # Decide from metadata alone whether dest already publishes src in the requested mode
+    try:
+        dest_stat = os.lstat(dest)
+    except FileNotFoundError:
+        return False
+    src_stat = os.stat(src)
+
+    if os.path.islink(dest):
+        return mode == "symlink" and os.readlink(dest) == os.path.abspath(src)
+    if mode == "hardlink" and (src_stat.st_dev, src_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    if mode in ("copy", "reflink") or (mode, dest_stat.st_dev) in _unsupported:
+        return dest_stat.st_size == src_stat.st_size and dest_stat.st_mtime_ns == src_stat.st_mtime_ns
+    return False
+
+def reflink_file(src, dest):
+    import fcntl
+
+    with open(src, 'rb') as src_file, open(dest, 'wb') as dest_file:
+        fcntl.ioctl(dest_file.fileno(), FICLONE, src_file.fileno())
+    shutil.copystat(src, dest)
+
+def place_file(src, tmp_path, mode):
+    if mode == "hardlink":
+        os.link(src, tmp_path)
+    elif mode == "symlink":
+        os.symlink(os.path.abspath(src), tmp_path)
+    elif mode == "reflink":
+        reflink_file(src, tmp_path)
+    else:
+        shutil.copy2(src, tmp_path)
+
+def publish_file(src, dest, mode="copy"):
+    # Publish src at dest using mode, falling back to a plain copy when the mode is unsupported.
+    # Returns the mode actually used, or None when dest was already up to date.
+    if mode not in ASSET_MODES:
+        raise ValueError(f"Unknown asset mode '{mode}', expected one of {', '.join(ASSET_MODES)}.")
+    if is_unchanged(src, dest, mode):
+        return None
+
+    dest_dir = os.path.dirname(dest) or '.'
+    os.makedirs(dest_dir, exist_ok=True)
+    device = os.stat(dest_dir).st_dev
+    if (mode, device) in _unsupported:
+        mode = "copy"
+
+    # Build the new file beside dest and rename it over, so readers never see a partial file
+    tmp_path = os.path.join(dest_dir, f".{os.path.basename(dest)}.tmp")
+    if os.path.lexists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        place_file(src, tmp_path, mode)
+    except (OSError, ImportError) as e:
+        if mode == "copy" or not is_unsupported_error(e):
+            raise
+        _unsupported.add((mode, device))
+        if os.path.lexists(tmp_path):
+            os.remove(tmp_path)
+        mode = "copy"
+        place_file(src, tmp_path, mode)
+    os.replace(tmp_path, dest)
+    return mode
+
+def is_unsupported_error(error):
+    # Errors meaning "this filesystem can't do that", as opposed to real I/O failures
+    if isinstance(error, ImportError):
+        return True
+    return error.errno in (errno.EXDEV, errno.EPERM, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+                           errno.ENOSYS, errno.EMLINK, errno.EACCES)
@@ -0,0 +1,144 @@
+import json
+import os
+import re
+from collections import defaultdict
+from write_output import write_if_changed
+
+SEARCH_STATE_PATH = '.search_state.json'
+
+# Shards hold every term sharing its first PREFIX_LENGTH characters, so a client only fetches
+# the shard for what is being typed
+PREFIX_LENGTH = 2
+TERM_PATTERN = re.compile(r"\w+")
+
+def add_terms(counter, text, weight=1):
+    # Lowercased word terms; single characters are too common to be worth indexing
+    for term in TERM_PATTERN.findall(text.lower()):
+        if len(term) > 1:
+            counter[term] += weight
+
+def shard_prefix(term):
+    return term[:PREFIX_LENGTH]
+
+def dump_compact(data):
+    return json.dumps(data, separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+
+class SearchIndex:
+    # Inverted index written under public/search/: index.json lists the pages by id and the
+    # available shards, and each <prefix>.json maps its terms to [page id, weight] postings,
+    # heaviest first. The per-page terms are kept in a state file outside public/ so a build
+    # only rewrites the shards touched by the pages it re-parsed.
+    def __init__(self, directory):
+        self.directory = directory
+        self.next_id = 0
+        self.documents = {}
+
+    @classmethod
+    def load(cls, state_path, directory):
+        # Without the published index.json the state no longer describes public/, so start over
+        index = cls(directory)
+        try:
+            with open(state_path, 'r') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            return index
+        index.next_id = state.get("next_id", 0)
+        if state.get("directory") == directory and os.path.exists(os.path.join(directory, "index.json")):
+            index.documents = state.get("documents", {})
+        return index
+
+    def save(self, state_path=SEARCH_STATE_PATH):
+        tmp_path = state_path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            file.write(dump_compact({"directory": self.directory, "next_id": self.next_id,
+                                     "documents": self.documents}))
+        os.replace(tmp_path, state_path)
+
+    def update(self, site_index):
+        # Fold in the terms gathered for re-parsed pages (site_index.terms) and drop pages that
+        # left the site; returns the number of shard files written or removed
+        changed = site_index.terms
+        removed = [output for output in self.documents if output not in site_index.pages]
+
+        touched = set()
+        stale_ids = set()
+        for output in list(changed) + removed:
+            document = self.documents.get(output)
+            if document is not None:
+                stale_ids.add(document["id"])
+                touched.update(shard_prefix(term) for term in document["terms"])
+        for output in removed:
+            del self.documents[output]
+
+        additions = defaultdict(lambda: defaultdict(list))
+        for output, terms in sorted(changed.items()):
+            document = self.documents.get(output)
+            if document is None:
+                document = {"id": self.next_id}
+                self.next_id += 1
+            page = site_index.pages[output]
+            document.update(url=page["url"], title=page["title"], terms=terms)
+            self.documents[output] = document
+            for term, weight in terms.items():
+                additions[shard_prefix(term)][term].append([document["id"], weight])
+        touched.update(additions)
+
+        os.makedirs(self.directory, exist_ok=True)
+        written = 0
+        for prefix in sorted(touched):
+            written += self.write_shard(prefix, stale_ids, additions.get(prefix, {}))
+
+        pages = {document["id"]: [document["url"], document["title"]] for document in self.documents.values()}
+        shards = sorted(name[:-len(".json")] for name in os.listdir(self.directory)
+                        if name.endswith(".json") and name != "index.json")
+        write_if_changed(os.path.join(self.directory, "index.json"),
+                         dump_compact({"prefix_length": PREFIX_LENGTH, "pages": pages, "shards": shards}))
+        return written
+
+    def shard_path(self, prefix):
+        return os.path.join(self.directory, f"{prefix}.json")
+
+    def write_shard(self, prefix, stale_ids, additions):
+        path = self.shard_path(prefix)
+        try:
+            with open(path, 'r') as file:
+                shard = json.load(file)
+        except (OSError, ValueError):
+            shard = {}
+
+        for term in list(shard):
+            postings = [posting for posting in shard[term] if posting[0] not in stale_ids]
+            if postings:
+                shard[term] = postings
+            else:
+                del shard[term]
+        for term, postings in additions.items():
+            shard.setdefault(term, []).extend(postings)
+        for postings in shard.values():
+            postings.sort(key=lambda posting: (-posting[1], posting[0]))
+
+        if not shard:
+            if os.path.exists(path):
+                os.remove(path)
+                return 1
+            return 0
+        return 1 if write_if_changed(path, dump_compact(shard)) else 0
+
+    def search(self, query):
+        # Reference lookup, the same way a client would: AND of the query terms, summed weights
+        scores = None
+        for term in TERM_PATTERN.findall(query.lower()):
+            try:
+                with open(self.shard_path(shard_prefix(term)), 'r') as file:
+                    postings = json.load(file).get(term, [])
+            except OSError:
+                postings = []
+            term_scores = {page_id: weight for page_id, weight in postings}
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = {page_id: scores[page_id] + weight
+                          for page_id, weight in term_scores.items() if page_id in scores}
+        urls = {document["id"]: document["url"] for document in self.documents.values()}
+        ranked = sorted((scores or {}).items(), key=lambda item: (-item[1], item[0]))
+        return [urls[page_id] for page_id, _ in ranked if page_id in urls]
@@ -0,0 +1,276 @@
+import argparse
+import functools
+import os
+import threading
+import time
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from build_log import configure_logging, logger
+from build_manifest import MANIFEST_PATH
+from front_matter import is_draft, page_template_path, scan_front_matter
+from generate_page import generate_page
+from generate_pages_recursive import find_markdown_pages, markdown_dest_path
+from incremental_build import incremental_build, record_rebuild, remove_output, template_inputs
+from lazy_serve import DEFAULT_CACHE_BYTES, DEFAULT_CACHE_ENTRIES, LazySite, PageCache, start_lazy_server
+from parallel_build import build_pages
+from publish_assets import ASSET_MODES, publish_file
+
+def snapshot(paths):
+    # Map every watched file to (mtime, size); directories are walked, plain files stat'ed
+    state = {}
+    for path in paths:
+        if os.path.isfile(path):
+            stat = os.stat(path)
+            state[path] = (stat.st_mtime_ns, stat.st_size)
+            continue
+        for root, dirs, files in os.walk(path):
+            for name in files:
+                file_path = os.path.join(root, name)
+                try:
+                    stat = os.stat(file_path)
+                except FileNotFoundError:
+                    continue
+                state[file_path] = (stat.st_mtime_ns, stat.st_size)
+    return state
+
+def diff_snapshots(old, new):
+    changed = {path for path, signature in new.items() if old.get(path) != signature}
+    removed = set(old) - set(new)
+    return changed, removed
+
+class SiteWatcher:
+    def __init__(self, source_directory, content_directory, template_path, destination_directory,
+                 debounce=0.3, asset_mode="copy", include_drafts=False, manifest_path=None):
+        self.source_directory = source_directory
+        self.content_directory = content_directory
+        self.template_path = template_path
+        self.destination_directory = destination_directory
+        self.debounce = debounce
+        self.asset_mode = asset_mode
+        self.include_drafts = include_drafts
+        # When set, every rebuild is recorded in this build manifest for later incremental builds
+        self.manifest_path = manifest_path
+        # Each page's template from its front matter, so per-page templates and their partials
+        # are watched too and a change to one rebuilds only the pages that use it
+        self.page_templates = {}
+        for source, _ in find_markdown_pages(content_directory, destination_directory, include_drafts=True):
+            self.page_templates[source] = self.template_for(source)
+        self.state = snapshot(self.watched_paths())
+        self.pending_changed = set()
+        self.pending_removed = set()
+        self.last_change = None
+
+    def watched_paths(self):
+        return [self.content_directory, self.source_directory,
+                *{path for inputs in self.template_inputs().values() for path in inputs}]
+
+    def template_for(self, page):
+        return page_template_path(self.template_path, scan_front_matter(page))
+
+    def template_inputs(self):
+        # Every template in use mapped to itself plus the partials it includes; while a template
+        # is broken, just the template
+        templates = {self.template_path, *self.page_templates.values()}
+        return {template: template_inputs(template) for template in templates}
+
+    def poll(self, now=None):
+        # Queue whatever changed since the last poll; rebuild once the burst has settled
+        now = time.monotonic() if now is None else now
+        new_state = snapshot(self.watched_paths())
+        changed, removed = diff_snapshots(self.state, new_state)
+        self.state = new_state
+
+        if changed or removed:
+            self.pending_changed = (self.pending_changed | changed) - removed
+            self.pending_removed = (self.pending_removed | removed) - changed
+            self.last_change = now
+            return None
+
+        if self.last_change is None or now - self.last_change < self.debounce:
+            return None
+
+        changed, removed = self.pending_changed, self.pending_removed
+        self.pending_changed, self.pending_removed = set(), set()
+        self.last_change = None
+        return self.rebuild(changed, removed)
+
+    def rebuild(self, changed, removed):
+        # Rebuild only the affected outputs; a template or partial change touches every page using it.
+        # A path that fails is logged and queued again, so it is retried with the next change
+        # instead of being dropped along with the rest of its batch.
+        rebuilt = []
+        failed = set()
+        built_pages = []
+        built_assets = []
+        gone = []
+        # Pages may have switched templates, so their front matter is read again first
+        for path in changed:
+            if self.is_page(path):
+                self.page_templates[path] = self.template_for(path)
+        for path in removed:
+            self.page_templates.pop(path, None)
+        templates = self.template_inputs()
+        watched_inputs = {path for inputs in templates.values() for path in inputs}
+        changed_inputs = (changed | removed) & watched_inputs
+        if changed_inputs:
+            affected = {template for template, inputs in templates.items() if changed_inputs.intersection(inputs)}
+            pages = [(source, dest) for source, dest in
+                     find_markdown_pages(self.content_directory, self.destination_directory, self.include_drafts)
+                     if self.page_templates.get(source) in affected]
+            errors = build_pages(pages, self.template_path)
+            failed.update(source for source, _ in errors)
+            built_pages.extend(page for page in pages if page[0] not in failed)
+            rebuilt.extend(sorted(changed_inputs))
+            changed = changed - {source for source, _ in pages}
+
+        # A page that became a draft leaves the site, as it would in a full build
+        drafts = {path for path in changed
+                  if not self.include_drafts and self.is_page(path) and is_draft(scan_front_matter(path))}
+        changed -= drafts
+        removed = removed | drafts
+
+        for path in sorted(changed):
+            if path in watched_inputs:
+                continue
+            try:
+                if self.is_page(path):
+                    generate_page(path, self.template_path, self.page_output(path))
+                    built_pages.append((path, self.page_output(path)))
+                elif self.is_asset(path):
+                    dest_path = self.asset_output(path)
+                    logger.info(f"Copying file: {path} to {dest_path}")
+                    publish_file(path, dest_path, self.asset_mode)
+                    built_assets.append((path, dest_path))
+                else:
+                    continue
+            except Exception as e:
+                logger.error(f"Failed to rebuild {path}: {type(e).__name__}: {e}")
+                failed.add(path)
+                continue
+            rebuilt.append(path)
+
+        for path in sorted(removed):
+            if self.is_page(path):
+                output = self.page_output(path)
+            elif self.is_asset(path):
+                output = self.asset_output(path)
+            else:
+                continue
+            try:
+                if os.path.exists(output):
+                    logger.info(f"Removing stale output: {output}")
+                    remove_output(output, self.destination_directory)
+            except OSError as e:
+                logger.error(f"Failed to remove {output}: {e}")
+                self.pending_removed.add(path)
+                continue
+            gone.append(path)
+            rebuilt.append(path)
+
+        self.pending_changed |= failed
+        if self.manifest_path is not None:
+            # Failed pages are dropped from the manifest so an incremental build retries them too
+            record_rebuild(self.manifest_path, self.template_path, built_pages, built_assets,
+                           gone + sorted(failed), self.asset_mode)
+        # Templates that just came into use were read by this rebuild; watch them from here on
+        unseen = [path for path in self.watched_paths() if path not in self.state and os.path.isfile(path)]
+        self.state.update(snapshot(unseen))
+        return rebuilt
+
+    def is_page(self, path):
+        return path.endswith(".md") and is_within(path, self.content_directory)
+
+    def is_asset(self, path):
+        return is_within(path, self.source_directory)
+
+    def page_output(self, path):
+        return markdown_dest_path(path, self.content_directory, self.destination_directory)
+
+    def asset_output(self, path):
+        return os.path.join(self.destination_directory, os.path.relpath(path, self.source_directory))
+
+    def watch(self, interval=0.5, stop_event=None):
+        while stop_event is None or not stop_event.is_set():
+            try:
+                rebuilt = self.poll()
+            except Exception as e:
+                # Keep serving the last good output while the source is being fixed
+                print(f"Rebuild failed: {type(e).__name__}: {e}")
+                rebuilt = None
+            if rebuilt:
+                print(f"Rebuilt {len(rebuilt)} changed file(s).")
+            time.sleep(interval)
+
+def is_within(path, directory):
+    return os.path.abspath(path).startswith(os.path.abspath(directory) + os.sep)
+
+def start_server(directory, port):
+    handler = functools.partial(SimpleHTTPRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(("", port), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the site and serve public/ over HTTP.")
+    parser.add_argument('--watch', action='store_true', help="rebuild changed pages and assets while serving")
+    parser.add_argument('--assets', choices=ASSET_MODES, default='copy', help="how static files are published")
+    parser.add_argument('-v', '--verbose', action='count', default=1,
+                        help="log each rebuilt file (default); repeat for more detail")
+    parser.add_argument('-q', '--quiet', action='store_const', const=0, dest='verbose',
+                        help="only log warnings and errors")
+    parser.add_argument('--port', type=int, default=8888, help="port to serve on")
+    parser.add_argument('--interval', type=float, default=0.5, help="seconds between polls for changes")
+    parser.add_argument('--debounce', type=float, default=0.3,
+                        help="seconds without further changes before a rebuild starts")
+    parser.add_argument('--lazy', action='store_true',
+                        help="skip the build: render each page from content/ when it is first requested "
+                             "and serve static/ directly")
+    parser.add_argument('--cache-entries', type=int, default=DEFAULT_CACHE_ENTRIES,
+                        help="rendered pages kept in memory with --lazy (default: %(default)s)")
+    parser.add_argument('--cache-mb', type=int, default=DEFAULT_CACHE_BYTES // (1024 * 1024),
+                        help="megabytes of rendered pages kept in memory with --lazy (default: %(default)s)")
+    parser.add_argument('--drafts', action='store_true', help="also serve pages marked \"draft: true\"")
+    args = parser.parse_args()
+    if args.lazy and args.watch:
+        parser.error("--lazy renders every request from the current sources; --watch is not needed")
+    configure_logging(args.verbose)
+
+    source_directory = 'static'
+    destination_directory = 'public'
+    content_directory = 'content'
+    template_path = 'template.html'
+
+    if args.lazy:
+        cache = PageCache(args.cache_entries, args.cache_mb * 1024 * 1024)
+        site = LazySite(content_directory, template_path, cache, include_drafts=args.drafts)
+        server = start_lazy_server(site, source_directory, args.port)
+        print(f"Rendering {content_directory} on demand at http://localhost:{args.port}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.shutdown()
+        return
+
+    incremental_build(source_directory, content_directory, template_path, destination_directory,
+                      asset_mode=args.assets, include_drafts=args.drafts)
+    server = start_server(destination_directory, args.port)
+    print(f"Serving {destination_directory} on http://localhost:{args.port}")
+
+    try:
+        if args.watch:
+            watcher = SiteWatcher(source_directory, content_directory, template_path, destination_directory,
+                                  debounce=args.debounce, asset_mode=args.assets, include_drafts=args.drafts,
+                                  manifest_path=MANIFEST_PATH)
+            print(f"Watching {content_directory}, {source_directory} and {template_path} for changes")
+            watcher.watch(args.interval)
+        else:
+            threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+import argparse
+import hashlib
+import heapq
+import json
+import os
+from build_manifest import file_hash
+from publish_assets import publish_file
+from site_index import SiteIndex
+
+# Each shard builds into <root>/<i>-of-<N>/ and leaves a manifest there for the merge step
+SHARD_ROOT = 'shards'
+SHARD_MANIFEST = 'shard.json'
+SHARD_STRATEGIES = ("hash", "size")
+
+def content_key(path, content_directory):
+    # Sources are keyed relative to content/ with "/" separators, so every host agrees
+    return os.path.relpath(path, content_directory).replace(os.sep, '/')
+
+def stable_shard(key, count):
+    # 0-based shard for a key; sha256 rather than hash(), which is salted per process
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], 'big') % count
+
+def balanced_shards(sizes, count):
+    # Largest pages first, each to the currently lightest shard; ties break on the key so
+    # every host computes the same assignment from the same file set
+    loads = [(0, shard) for shard in range(count)]
+    assignment = {}
+    for key, size in sorted(sizes.items(), key=lambda item: (-item[1], item[0])):
+        load, shard = heapq.heappop(loads)
+        assignment[key] = shard
+        heapq.heappush(loads, (load + size, shard))
+    return assignment
+
+class Shard:
+    # Slice i of N (1-based) of the content file set, split by stable path hash or by balanced size
+    def __init__(self, index, count, strategy="hash"):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Shard {index}/{count} is out of range")
+        if strategy not in SHARD_STRATEGIES:
+            raise ValueError(f"Unknown shard strategy: {strategy}")
+        self.index = index
+        self.count = count
+        self.strategy = strategy
+
+    def __str__(self):
+        return f"{self.index}/{self.count}"
+
+    def select(self, pages, content_directory):
+        # Keep the (markdown path, html path) pairs that belong to this shard, in their given order
+        keys = [content_key(source, content_directory) for source, _ in pages]
+        if self.strategy == "size":
+            assignment = balanced_shards({key: os.path.getsize(source) for key, (source, _) in zip(keys, pages)},
+                                         self.count)
+        else:
+            assignment = {key: stable_shard(key, self.count) for key in keys}
+        return [page for key, page in zip(keys, pages) if assignment[key] == self.index - 1]
+
+def parse_shard(text):
+    # argparse type for "i/N"; returns (i, N)
+    try:
+        index, count = (int(part) for part in text.split("/"))
+        return Shard(index, count).index, count
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected i/N with 1 <= i <= N, got {text!r}")
+
+def shard_directory(root, index, count):
+    return os.path.join(root, f"{index}-of-{count}")
+
+def relative_files(directory):
+    # Every file under directory as a "/"-separated path relative to it
+    for root, dirs, files in os.walk(directory):
+        for name in files:
+            yield os.path.relpath(os.path.join(root, name), directory).replace(os.sep, '/')
+
+def write_shard_manifest(directory, shard, content_directory, pages, errors, site_index):
+    # Record what this shard built: its sources, failures, every output with its hash, and the
+    # site index records the merge step folds into one index
+    failed = {source for source, _ in errors}
+    outputs = {relative: file_hash(os.path.join(directory, relative))
+               for relative in relative_files(directory) if relative != SHARD_MANIFEST}
+    manifest = {
+        "shard": shard.index,
+        "count": shard.count,
+        "strategy": shard.strategy,
+        "sources": sorted(content_key(source, content_directory) for source, _ in pages if source not in failed),
+        "failed": sorted(content_key(source, content_directory) for source in failed),
+        "outputs": outputs,
+        "pages": {os.path.relpath(output, directory).replace(os.sep, '/'): record
+                  for output, record in site_index.pages.items()},
+    }
+    tmp_path = os.path.join(directory, SHARD_MANIFEST + '.tmp')
+    with open(tmp_path, 'w') as file:
+        json.dump(manifest, file, separators=(',', ':'), sort_keys=True)
+    os.replace(tmp_path, os.path.join(directory, SHARD_MANIFEST))
+
+def merge_shards(root, count, destination_directory, asset_mode="copy"):
+    # Publish every shard's outputs into destination_directory, which may already hold the static
+    # files. Returns (site index of all pages, conflicts, failed sources); conflicts are readable
+    # sentences for missing or mismatched shards, sources or outputs claimed twice, and files that
+    # no longer match their shard manifest. Conflicting files are left out of the merge.
+    site_index = SiteIndex(destination_directory)
+    conflicts = []
+    failed = []
+    owners = {relative: "static" for relative in relative_files(destination_directory)}
+    source_owners = {}
+    strategy = None
+
+    for index in range(1, count + 1):
+        directory = shard_directory(root, index, count)
+        try:
+            with open(os.path.join(directory, SHARD_MANIFEST), 'r') as file:
+                manifest = json.load(file)
+        except (OSError, ValueError):
+            conflicts.append(f"shard {index}/{count} has no readable {SHARD_MANIFEST} in {directory}")
+            continue
+        if (manifest.get("shard"), manifest.get("count")) != (index, count):
+            conflicts.append(f"{directory} holds shard {manifest.get('shard')}/{manifest.get('count')}, "
+                             f"expected {index}/{count}")
+            continue
+        if strategy is None:
+            strategy = manifest["strategy"]
+        elif manifest["strategy"] != strategy:
+            conflicts.append(f"shard {index}/{count} was split by {manifest['strategy']}, the others by {strategy}")
+
+        for source in manifest["sources"] + manifest["failed"]:
+            if source in source_owners:
+                conflicts.append(f"{source} was built by shards {source_owners[source]} and {index}")
+            source_owners[source] = index
+        failed.extend(manifest["failed"])
+
+        for relative, digest in sorted(manifest["outputs"].items()):
+            if relative in owners:
+                owner = "static files" if owners[relative] == "static" else f"shard {owners[relative]}"
+                conflicts.append(f"{relative} is produced by {owner} and shard {index}")
+                continue
+            path = os.path.join(directory, relative)
+            if not os.path.exists(path) or file_hash(path) != digest:
+                conflicts.append(f"{path} does not match its shard manifest")
+                continue
+            owners[relative] = index
+            publish_file(path, os.path.join(destination_directory, relative), asset_mode)
+
+        for relative, record in manifest["pages"].items():
+            if owners.get(relative) == index:
+                site_index.add(record["source"], os.path.join(destination_directory, relative), record)
+
+    return site_index, conflicts, failed
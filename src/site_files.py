@@ -0,0 +1,142 @@
+import heapq
+import os
+import re
+from htmlnode import escape_attribute, escape_text
+from write_output import OutputWriter
+
+# The sitemaps.org limit per file; larger sites get a sitemap index pointing at numbered shards
+SITEMAP_MAX_URLS = 50000
+SITEMAP_SHARD_PATTERN = re.compile(r"^sitemap-\d+\.xml$")
+FEED_ENTRIES = 20
+REDIRECTS_NAME = "_redirects"
+
+XML_DECLARATION = '<?xml version="1.0" encoding="UTF-8"?>\n'
+SITEMAP_NAMESPACE = "http://www.sitemaps.org/schemas/sitemap/0.9"
+ATOM_NAMESPACE = "http://www.w3.org/2005/Atom"
+
+def site_file_names(destination_directory):
+    # The files write_sitemap, write_feed and write_redirects leave in destination_directory
+    return sorted(name for name in os.listdir(destination_directory)
+                  if name in ("sitemap.xml", "atom.xml", REDIRECTS_NAME) or SITEMAP_SHARD_PATTERN.match(name))
+
+def absolute_url(base_url, path):
+    return base_url.rstrip("/") + path
+
+def sorted_pages(site_index):
+    # Pages in URL order; yields one record at a time so writers never hold a second copy
+    for output in sorted(site_index.pages, key=lambda output: site_index.pages[output]["url"]):
+        yield site_index.pages[output]
+
+def write_url_entry(file, base_url, page):
+    file.write(f"<url><loc>{escape_text(absolute_url(base_url, page['url']))}</loc>")
+    if page.get("updated"):
+        file.write(f"<lastmod>{escape_text(page['updated'])}</lastmod>")
+    file.write("</url>\n")
+
+def write_sitemap(site_index, destination_directory, base_url, max_urls=SITEMAP_MAX_URLS):
+    # Stream sitemap.xml; past max_urls it becomes an index of sitemap-N.xml shards, each written
+    # as the pages are walked. Returns the number of files that changed.
+    pages = sorted_pages(site_index)
+    changed = 0
+    shards = []
+    if len(site_index.pages) <= max_urls:
+        with OutputWriter(os.path.join(destination_directory, "sitemap.xml")) as file:
+            file.write(f'{XML_DECLARATION}<urlset xmlns="{SITEMAP_NAMESPACE}">\n')
+            for page in pages:
+                write_url_entry(file, base_url, page)
+            file.write("</urlset>\n")
+        changed += file.changed
+    else:
+        page = next(pages, None)
+        while page is not None:
+            name = f"sitemap-{len(shards) + 1}.xml"
+            with OutputWriter(os.path.join(destination_directory, name)) as file:
+                file.write(f'{XML_DECLARATION}<urlset xmlns="{SITEMAP_NAMESPACE}">\n')
+                for _ in range(max_urls):
+                    write_url_entry(file, base_url, page)
+                    page = next(pages, None)
+                    if page is None:
+                        break
+                file.write("</urlset>\n")
+            shards.append(name)
+            changed += file.changed
+
+        with OutputWriter(os.path.join(destination_directory, "sitemap.xml")) as file:
+            file.write(f'{XML_DECLARATION}<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n')
+            for name in shards:
+                file.write(f"<sitemap><loc>{escape_text(absolute_url(base_url, '/' + name))}</loc></sitemap>\n")
+            file.write("</sitemapindex>\n")
+        changed += file.changed
+
+    # Shards left over from a bigger site would otherwise still be served
+    for name in os.listdir(destination_directory):
+        if SITEMAP_SHARD_PATTERN.match(name) and name not in shards:
+            os.remove(os.path.join(destination_directory, name))
+            changed += 1
+    return changed
+
+def page_authors(page):
+    # Names from a page's "author" front matter, which may be one name or a list of them
+    author = page.get("meta", {}).get("author")
+    if not author:
+        return []
+    return [str(name) for name in author] if isinstance(author, list) else [str(author)]
+
+def write_authors(file, names):
+    for name in names:
+        file.write(f"<author><name>{escape_text(name)}</name></author>")
+
+def write_feed(site_index, destination_directory, base_url, title=None, author=None, entries=FEED_ENTRIES):
+    # Atom feed of the most recently updated pages; only `entries` records are ever held at once.
+    # Atom requires an author for the feed: `author`, else the home page's author, else the title.
+    # Entries name their own authors when their front matter has them.
+    latest = heapq.nlargest(entries, (page for page in site_index.pages.values() if page.get("updated")),
+                            key=lambda page: (page["updated"], page["url"]))
+    home = next((page for page in site_index.pages.values() if page["url"] == "/"), None)
+    if title is None:
+        title = home["title"] if home and home.get("title") else base_url
+    if author is not None:
+        authors = [author]
+    else:
+        authors = (page_authors(home) if home else []) or [title]
+    feed_url = absolute_url(base_url, "/atom.xml")
+    updated = latest[0]["updated"] if latest else "1970-01-01T00:00:00Z"
+
+    with OutputWriter(os.path.join(destination_directory, "atom.xml")) as file:
+        file.write(f'{XML_DECLARATION}<feed xmlns="{ATOM_NAMESPACE}">\n')
+        file.write(f"<title>{escape_text(title)}</title>\n")
+        file.write(f"<id>{escape_text(feed_url)}</id>\n")
+        file.write(f'<link rel="self" href="{escape_attribute(feed_url)}"/>\n')
+        file.write(f'<link href="{escape_attribute(absolute_url(base_url, "/"))}"/>\n')
+        file.write(f"<updated>{escape_text(updated)}</updated>\n")
+        write_authors(file, authors)
+        file.write("\n")
+        for page in latest:
+            url = absolute_url(base_url, page["url"])
+            file.write("<entry>")
+            file.write(f"<title>{escape_text(page.get('title') or page['url'])}</title>")
+            file.write(f'<link href="{escape_attribute(url)}"/>')
+            file.write(f"<id>{escape_text(url)}</id>")
+            file.write(f"<updated>{escape_text(page['updated'])}</updated>")
+            write_authors(file, page_authors(page))
+            file.write("</entry>\n")
+        file.write("</feed>\n")
+    return int(file.changed)
+
+def redirects(page):
+    # Slashless directory URLs point at the canonical trailing-slash form; pages may also list
+    # old URLs of their own under "aliases"
+    url = page["url"]
+    if url != "/" and url.endswith("/"):
+        yield url[:-1], url
+    for alias in page.get("aliases", ()):
+        if alias != url:
+            yield alias, url
+
+def write_redirects(site_index, destination_directory):
+    # "from to status" lines, the _redirects format static hosts read
+    with OutputWriter(os.path.join(destination_directory, REDIRECTS_NAME)) as file:
+        for page in sorted_pages(site_index):
+            for source, target in redirects(page):
+                file.write(f"{source} {target} 301\n")
+    return int(file.changed)
@@ -0,0 +1,154 @@
+import json
+import os
+import time
+from collections import Counter
+from front_matter import date_updated
+from search_index import add_terms
+
+SITE_INDEX_PATH = '.site_index.json'
+
+class PageOutline:
+    # Metadata collected while a page is parsed: its title, front matter, heading outline, links
+    # and images, plus weighted search terms when created with terms=True
+    __slots__ = ("title", "meta", "headings", "links", "images", "terms")
+
+    def __init__(self, terms=False):
+        self.title = None
+        self.meta = {}
+        self.headings = []
+        self.links = []
+        self.images = []
+        self.terms = Counter() if terms else None
+
+    def add_heading(self, level, text):
+        self.headings.append((level, text))
+        # h1 terms weigh 3, h2 terms 2, everything below like body text
+        self.add_text(text, max(1, 4 - level))
+
+    def add_text(self, text, weight=1):
+        if self.terms is not None:
+            add_terms(self.terms, text, weight)
+
+    def add_text_nodes(self, nodes):
+        for node in nodes:
+            if node.text_type == "link":
+                self.links.append(node.url)
+            elif node.text_type == "image":
+                self.images.append((node.text, node.url))
+            if self.terms is not None:
+                add_terms(self.terms, node.text)
+
+    def to_dict(self):
+        data = {
+            "title": self.title,
+            "headings": [list(heading) for heading in self.headings],
+            "links": list(self.links),
+            "images": [list(image) for image in self.images],
+        }
+        if self.meta:
+            data["meta"] = dict(self.meta)
+        if self.terms is not None:
+            data["terms"] = dict(self.terms)
+        return data
+
+    @classmethod
+    def from_dict(cls, data):
+        outline = cls(terms="terms" in data)
+        outline.title = data["title"]
+        outline.meta = dict(data.get("meta", {}))
+        outline.headings = [tuple(heading) for heading in data["headings"]]
+        outline.links = list(data["links"])
+        outline.images = [tuple(image) for image in data["images"]]
+        if outline.terms is not None:
+            outline.terms.update(data["terms"])
+        return outline
+
+def output_url(output, destination_directory):
+    # public/blog/index.html -> /blog/, public/about.html -> /about.html
+    relative = os.path.relpath(output, destination_directory).replace(os.sep, '/')
+    if relative == "index.html":
+        return "/"
+    if relative.endswith("/index.html"):
+        return "/" + relative[:-len("index.html")]
+    return "/" + relative
+
+def source_updated(source):
+    # RFC 3339 UTC time of the source's last modification, as sitemaps and feeds expect
+    try:
+        mtime = os.stat(source).st_mtime
+    except OSError:
+        return None
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(mtime))
+
+class SiteIndex:
+    # Every page's outline keyed by its output path, kept across builds so navigation, sitemaps
+    # and tables of contents can be generated without re-parsing the pages.
+    # With collect_terms set, builders also gather search terms; those are held in memory for
+    # the search index stage (terms, by output) rather than saved with the outlines, and
+    # indexed_outputs names the pages the search index already covers.
+    def __init__(self, destination_directory, collect_terms=False):
+        self.destination_directory = destination_directory
+        self.pages = {}
+        self.collect_terms = collect_terms
+        self.terms = {}
+        self.indexed_outputs = set()
+
+    def new_outline(self):
+        return PageOutline(terms=self.collect_terms)
+
+    def has_page(self, output):
+        # False when the page must be parsed again to fill in its record
+        if output not in self.pages:
+            return False
+        return not self.collect_terms or output in self.indexed_outputs or output in self.terms
+
+    def add(self, source, output, outline):
+        record = outline.to_dict() if isinstance(outline, PageOutline) else dict(outline)
+        terms = record.pop("terms", None)
+        if terms is not None:
+            self.terms[output] = terms
+        record["source"] = source
+        record["url"] = output_url(output, self.destination_directory)
+        # Front matter dates and aliases feed the sitemap, the feed and the redirects map
+        meta = record.get("meta", {})
+        if record.get("updated") is None and meta.get("date"):
+            record["updated"] = date_updated(meta["date"])
+        if meta.get("aliases"):
+            aliases = meta["aliases"]
+            record["aliases"] = aliases if isinstance(aliases, list) else [aliases]
+        if record.get("updated") is None:
+            record["updated"] = source_updated(source)
+        self.pages[output] = record
+
+    def remove(self, output):
+        self.pages.pop(output, None)
+        self.terms.pop(output, None)
+
+    def retain(self, outputs):
+        # Drop pages whose outputs are no longer part of the site
+        for output in set(self.pages) - set(outputs):
+            self.remove(output)
+
+    def __len__(self):
+        return len(self.pages)
+
+    def save(self, path=SITE_INDEX_PATH):
+        # Compact JSON, written atomically; pages are sorted so rebuilds give identical files
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'w') as file:
+            json.dump({"destination": self.destination_directory, "pages": self.pages}, file,
+                      separators=(',', ':'), sort_keys=True, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, destination_directory, collect_terms=False):
+        # A missing, unreadable or foreign index starts empty, like the build manifest
+        index = cls(destination_directory, collect_terms)
+        try:
+            with open(path, 'r') as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return index
+        if data.get("destination") == destination_directory:
+            index.pages = data.get("pages", {})
+        return index
@@ -0,0 +1,135 @@
+import os
+from extract_title import extract_title_from_lines
+from front_matter import page_template_path, slot_values, split_front_matter_lines
+from htmlnode import escape_attribute
+from new_function_textnode import block_to_html_node, cached_block_html, classify_lines
+from template import load_template
+from build_log import logger
+from write_output import OutputWriter
+
+# Pages at least this large are rendered block by block instead of being read whole
+STREAM_THRESHOLD = 8 * 1024 * 1024
+
+def iter_blocks(lines):
+    # Yield (block_type, stripped block lines) as each block completes, reading `lines` lazily.
+    # Gives the same blocks as scan_blocks(): blank lines separate blocks, except inside a
+    # ``` fence that is closed later on; only the current block is held in memory.
+    block = []
+    fences_closed = True
+    lines = iter(lines)
+    for raw_line in lines:
+        line = raw_line.strip()
+        if block:
+            if line:
+                block.append(line)
+                continue
+            yield classify_lines(block, 0, len(block)), block
+            block = []
+            continue
+        if not line:
+            continue
+
+        if fences_closed and line.startswith("```") and (line == "```" or not line.endswith("```")):
+            # Buffer until the fence closes; if it never does, fall back to blank-line splitting
+            fence = [line]
+            for raw_line in lines:
+                fence.append(raw_line.strip())
+                if fence[-1].endswith("```"):
+                    break
+            else:
+                fences_closed = False
+                yield from iter_blocks_without_fences(fence)
+                return
+            yield classify_lines(fence, 0, len(fence)), fence
+            continue
+        block.append(line)
+
+    if block:
+        yield classify_lines(block, 0, len(block)), block
+
+def iter_blocks_without_fences(stripped_lines):
+    block = []
+    for line in stripped_lines:
+        if line:
+            block.append(line)
+        elif block:
+            yield classify_lines(block, 0, len(block)), block
+            block = []
+    if block:
+        yield classify_lines(block, 0, len(block)), block
+
+class TitleWatcher:
+    # Pass lines through unchanged while looking for the first "# " heading, like extract_title
+    def __init__(self, lines):
+        self.lines = lines
+        self.title = None
+        self.error = None
+
+    def __iter__(self):
+        for line in self.lines:
+            if self.title is None and self.error is None and line.startswith('# '):
+                try:
+                    self.title = extract_title_from_lines([line])
+                except ValueError as e:
+                    self.error = e
+            yield line
+
+def render_block(block_type, block_lines, block_cache=None, outline=None):
+    block = '\n'.join(block_lines)
+    if block_cache is not None and outline is not None:
+        return cached_block_html(block, block_cache, outline, block_type, block_lines)
+    if block_cache is not None:
+        return block_cache.get_or_render(block, lambda text: block_to_html_node(text, block_type, block_lines).to_html())
+    return block_to_html_node(block, block_type, block_lines, outline).to_html()
+
+def generate_page_streaming(from_path, template_path, dest_path, values=None, block_cache=None, outline=None):
+    # Like generate_page, but peak memory follows the largest block rather than the whole file
+    logger.debug(f"Streaming page from {from_path} to {dest_path} using {template_path}")
+
+    with open(from_path, 'r') as source:
+        fields, body = split_front_matter_lines(source)
+        template = load_template(page_template_path(template_path, fields))
+        watcher = TitleWatcher(body)
+        # A front matter title means no block has to be held back waiting for the h1
+        if isinstance(fields.get("title"), str) and fields["title"]:
+            watcher.title = fields["title"]
+        blocks = iter_blocks(watcher)
+
+        # Render blocks until the title has been seen; those are the only ones held back
+        pending = []
+        for block_type, block_lines in blocks:
+            pending.append(render_block(block_type, block_lines, block_cache, outline))
+            if watcher.title is not None or watcher.error is not None:
+                break
+        if watcher.title is None and watcher.error is None:
+            # The whole file was consumed without a title; give extract_title's error
+            try:
+                extract_title_from_lines([])
+            except ValueError as e:
+                watcher.error = e
+        if watcher.error is not None:
+            raise RuntimeError(f"Error extracting title: {watcher.error}")
+        if not pending:
+            raise ValueError("ParentNode must have at least one child.")
+
+        def content_chunks():
+            yield "<div>"
+            yield from pending
+            for block_type, block_lines in blocks:
+                yield render_block(block_type, block_lines, block_cache, outline)
+            yield "</div>"
+
+        if outline is not None:
+            outline.title = watcher.title
+            outline.meta = dict(fields)
+        slots = {name: escape_attribute(value) for name, value in slot_values(fields).items()}
+        slots.update(values or {})
+        slots['Title'] = escape_attribute(watcher.title)
+        slots['Content'] = content_chunks()
+
+        os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+        with OutputWriter(dest_path) as file:
+            template.write(file, slots)
+
+    logger.info(f"Page generated and saved to {dest_path}" if file.changed else f"Page unchanged, kept {dest_path}")
+    return file.changed
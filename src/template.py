@@ -0,0 +1,93 @@
+import os
+import re
+
+PLACEHOLDER_PATTERN = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+# {{> partials/nav.html }} pastes another file in, resolved relative to the including file
+INCLUDE_PATTERN = re.compile(r"\{\{>\s*([^\s}]+)\s*\}\}")
+
+class Template:
+    def __init__(self, source, includes=()):
+        # includes lists the partial files pasted into source, for dependency tracking
+        self.includes = tuple(includes)
+        # Pre-split the template into literal segments with slots in between
+        self.parts = []
+        self.slots = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(source):
+            self.parts.append(source[position:match.start()])
+            self.slots.append((len(self.parts), match.group(1), match.group(0)))
+            self.parts.append(match.group(0))
+            position = match.end()
+        self.parts.append(source[position:])
+
+    @property
+    def names(self):
+        return {name for _, name, _ in self.slots}
+
+    def render(self, values):
+        # Fill every slot and build the page with a single join; unknown slots are left as written
+        parts = list(self.parts)
+        for index, name, placeholder in self.slots:
+            value = values.get(name, placeholder)
+            parts[index] = value if isinstance(value, str) else "".join(value)
+        return "".join(parts)
+
+    def write(self, fp, values):
+        # Stream the page into fp; a slot value may be a string or an iterable of chunks
+        # (an iterator is consumed by the first slot that uses it)
+        slot_names = {index: (name, placeholder) for index, name, placeholder in self.slots}
+        for index, part in enumerate(self.parts):
+            if index not in slot_names:
+                fp.write(part)
+                continue
+            name, placeholder = slot_names[index]
+            value = values.get(name, placeholder)
+            if isinstance(value, str):
+                fp.write(value)
+            else:
+                for chunk in value:
+                    fp.write(chunk)
+
+    def __repr__(self):
+        return f"Template(slots={[name for _, name, _ in self.slots]!r})"
+
+def expand_includes(path, includes, stack=()):
+    # Return the text of path with its partials pasted in, appending each partial to includes
+    if path in stack:
+        raise ValueError(f"Template include cycle: {' -> '.join(stack + (path,))}")
+    with open(path, 'r') as file:
+        source = file.read()
+
+    def include(match):
+        partial = os.path.normpath(os.path.join(os.path.dirname(path), match.group(1)))
+        if partial not in includes:
+            includes.append(partial)
+        return expand_includes(partial, includes, stack + (path,))
+
+    return INCLUDE_PATTERN.sub(include, source)
+
+def file_signatures(paths):
+    signatures = []
+    for path in paths:
+        stat = os.stat(path)
+        signatures.append((stat.st_mtime_ns, stat.st_size))
+    return signatures
+
+_template_cache = {}
+
+def load_template(template_path):
+    # Compile each template once per process, recompiling only when it or one of its partials changes
+    key = os.path.abspath(template_path)
+    cached = _template_cache.get(key)
+    if cached is not None:
+        try:
+            if file_signatures((template_path,) + cached[1].includes) == cached[0]:
+                return cached[1]
+        except FileNotFoundError:
+            pass
+
+    includes = []
+    template = Template(expand_includes(template_path, includes), includes)
+    _template_cache[key] = (file_signatures((template_path,) + template.includes), template)
+    return template
@@ -0,0 +1,47 @@
+import os
+import tempfile
+import unittest
+from bench_corpus import generate_corpus
+from generate_pages_recursive import generate_pages_recursive
+
+
+class TestGenerateCorpus(unittest.TestCase):
+    def read_all(self, paths):
+        contents = []
+        for path in paths:
+            with open(path) as file:
+                contents.append(file.read())
+        return contents
+
+    def test_same_seed_gives_same_corpus(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            first_pages = self.read_all(generate_corpus(first, 5, seed=3))
+            second_pages = self.read_all(generate_corpus(second, 5, seed=3))
+        self.assertEqual(first_pages, second_pages)
+
+    def test_different_seed_gives_different_corpus(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            self.assertNotEqual(self.read_all(generate_corpus(first, 3, seed=1)),
+                                self.read_all(generate_corpus(second, 3, seed=2)))
+
+    def test_mix_controls_block_kinds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            mix = {"paragraph": 0, "heading": 0, "unordered_list": 0, "ordered_list": 0, "quote": 0, "code": 1}
+            [page] = self.read_all(generate_corpus(tmp, 1, blocks_per_page=4, mix=mix))
+        self.assertEqual(page.count("```"), 8)
+
+    def test_corpus_builds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            content = os.path.join(tmp, "content")
+            public = os.path.join(tmp, "public")
+            template = os.path.join(tmp, "template.html")
+            with open(template, "w") as file:
+                file.write("{{ Title }}{{ Content }}")
+            paths = generate_corpus(content, 20, pages_per_dir=8)
+            generate_pages_recursive(content, template, public)
+            self.assertEqual(len(paths), 20)
+            self.assertTrue(os.path.exists(os.path.join(public, "section2", "page19", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+from block_cache import BlockCache
+from new_function_textnode import markdown_to_html_chunks, markdown_to_html_node, render_block
+
+
+class TestBlockCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = BlockCache()
+        calls = []
+        render = lambda block: calls.append(block) or f"<p>{block}</p>"
+        self.assertEqual(cache.get_or_render("a", render), "<p>a</p>")
+        self.assertEqual(cache.get_or_render("a", render), "<p>a</p>")
+        self.assertEqual(calls, ["a"])
+        self.assertEqual(cache.stats()["hits"], 1)
+        self.assertEqual(cache.stats()["misses"], 1)
+
+    def test_least_recently_used_is_evicted(self):
+        cache = BlockCache(max_entries=2)
+        render = lambda block: block.upper()
+        cache.get_or_render("a", render)
+        cache.get_or_render("b", render)
+        cache.get_or_render("a", render)
+        cache.get_or_render("c", render)
+        self.assertEqual(list(cache.entries), ["a", "c"])
+
+    def test_delta_merges_into_another_cache(self):
+        worker = BlockCache()
+        worker.track_rendered()
+        render = lambda block: block.upper()
+        worker.get_or_render("a", render)
+        worker.get_or_render("a", render)
+        parent = BlockCache()
+        parent.merge(worker.take_delta())
+        self.assertEqual((parent.hits, parent.misses, dict(parent.entries)), (1, 1, {"a": "A"}))
+        self.assertEqual(worker.take_delta(), (0, 0, []))
+
+    def test_chunks_match_tree_rendering(self):
+        markdown = "# Title\n\nSome **bold** text.\n\n* one\n* two\n\nSome **bold** text."
+        cache = BlockCache()
+        html = "".join(markdown_to_html_chunks(markdown, cache))
+        self.assertEqual(html, markdown_to_html_node(markdown).to_html())
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
+
+    def test_empty_document_raises(self):
+        with self.assertRaises(ValueError):
+            markdown_to_html_chunks("", BlockCache())
+
+    def test_save_and_load(self):
+        cache = BlockCache()
+        cache.get_or_render("Footer text.", render_block)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.json")
+            cache.save(path)
+            loaded = BlockCache.load(path)
+        self.assertEqual(loaded.entries, cache.entries)
+        self.assertEqual(loaded.get_or_render("Footer text.", render_block), "<p>Footer text.</p>")
+        self.assertEqual(loaded.hits, 1)
+
+    def test_load_missing_or_corrupt_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.json")
+            self.assertEqual(len(BlockCache.load(path)), 0)
+            with open(path, "w") as file:
+                file.write("{not json")
+            self.assertEqual(len(BlockCache.load(path)), 0)
+
+    def test_load_discards_cache_from_other_renderer(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.json")
+            with open(path, "w") as file:
+                file.write('{"fingerprint": "old", "entries": [["a", "<p>stale</p>"]]}')
+            self.assertEqual(len(BlockCache.load(path)), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import json
+import logging
+import os
+import tempfile
+import unittest
+from build_log import capture_records, logger, replay_records
+from build_timings import BuildTimings, NULL_TIMINGS
+from generate_page import generate_page
+
+
+class TestBuildTimings(unittest.TestCase):
+    def test_stage_accumulates(self):
+        timings = BuildTimings()
+        with timings.stage("write"):
+            pass
+        with timings.stage("write"):
+            pass
+        self.assertEqual(list(timings.stages), ["write"])
+        self.assertGreaterEqual(timings.stages["write"], 0.0)
+
+    def test_slowest_pages(self):
+        timings = BuildTimings()
+        timings.add_page("a.md", 0.1)
+        timings.add_page("b.md", 0.3)
+        timings.add_page("c.md", 0.2)
+        self.assertEqual(timings.slowest_pages(2), [("b.md", 0.3), ("c.md", 0.2)])
+
+    def test_merge(self):
+        first = BuildTimings()
+        first.stages["write"] = 1.0
+        second = BuildTimings()
+        second.stages["write"] = 2.0
+        second.add_page("a.md", 2.0)
+        first.merge(second.to_dict())
+        self.assertEqual(first.stages["write"], 3.0)
+        self.assertEqual(first.pages, {"a.md": 2.0})
+
+    def test_reports_list_stages_in_build_order(self):
+        timings = BuildTimings()
+        timings.stages["write"] = 1.0
+        timings.stages["asset copy"] = 1.0
+        timings.add_page("a.md", 0.5)
+        report = json.loads(timings.format_json())
+        self.assertEqual(list(report["stages"]), ["asset copy", "write"])
+        self.assertEqual(report["total"], 2.0)
+        self.assertEqual(report["slowest_pages"], [{"path": "a.md", "seconds": 0.5}])
+        table = timings.format_table()
+        self.assertLess(table.index("asset copy"), table.index("write"))
+        self.assertIn("a.md", table)
+
+    def test_null_timings(self):
+        with NULL_TIMINGS.stage("write"):
+            pass
+        NULL_TIMINGS.add_page("a.md", 1.0)
+        self.assertFalse(NULL_TIMINGS.enabled)
+
+    def test_generate_page_records_every_page_stage(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            markdown_path = os.path.join(tmp, "index.md")
+            template_path = os.path.join(tmp, "template.html")
+            with open(markdown_path, "w") as file:
+                file.write("# Title\n\nBody.")
+            with open(template_path, "w") as file:
+                file.write("{{ Title }}{{ Content }}")
+            timings = BuildTimings()
+            generate_page(markdown_path, template_path, os.path.join(tmp, "out", "index.html"), timings=timings)
+            with open(os.path.join(tmp, "out", "index.html")) as file:
+                self.assertEqual(file.read(), "Title<div><h1>Title</h1><p>Body.</p></div>")
+        self.assertEqual(set(timings.stages), {"markdown read", "block split", "inline parse", "html serialize",
+                                               "template render", "write"})
+        self.assertEqual(list(timings.pages), [markdown_path])
+
+
+class TestBuildLog(unittest.TestCase):
+    def test_capture_and_replay_records(self):
+        saved_level = logger.level
+        logger.setLevel(logging.INFO)
+        try:
+            with capture_records() as records:
+                logger.info("page one")
+                logger.debug("hidden")
+            self.assertEqual(records, [(logging.INFO, "page one")])
+            with self.assertLogs(logger, level="INFO") as captured:
+                replay_records(records)
+            self.assertEqual(captured.output, ["INFO:static_site_gen:page one"])
+        finally:
+            logger.setLevel(saved_level)
+
+
+if __name__ == "__main__":
+    unittest.main()
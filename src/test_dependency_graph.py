@@ -0,0 +1,35 @@
+import unittest
+from dependency_graph import DependencyGraph
+
+
+class TestDependencyGraph(unittest.TestCase):
+    def setUp(self):
+        self.graph = DependencyGraph()
+        self.graph.set_inputs("public/a.html", ["content/a.md", "template.html", "partials/nav.html"])
+        self.graph.set_inputs("public/b.html", ["content/b.md", "template.html"])
+
+    def test_affected_maps_outputs_to_changed_inputs(self):
+        self.assertEqual(self.graph.affected(["partials/nav.html"]), {"public/a.html": ["partials/nav.html"]})
+        self.assertEqual(self.graph.affected(["template.html", "content/b.md"]),
+                         {"public/a.html": ["template.html"], "public/b.html": ["content/b.md", "template.html"]})
+        self.assertEqual(self.graph.affected(["unrelated.txt"]), {})
+
+    def test_set_inputs_replaces_previous_edges(self):
+        self.graph.set_inputs("public/a.html", ["content/a.md", "template.html"])
+        self.assertEqual(self.graph.affected(["partials/nav.html"]), {})
+        self.assertNotIn("partials/nav.html", self.graph.dependents)
+
+    def test_remove(self):
+        self.graph.remove("public/b.html")
+        self.assertEqual(len(self.graph), 1)
+        self.assertEqual(self.graph.inputs("public/b.html"), ())
+        self.assertEqual(self.graph.affected(["content/b.md"]), {})
+
+    def test_round_trip(self):
+        restored = DependencyGraph.from_dict(self.graph.to_dict())
+        self.assertEqual(restored.dependencies, self.graph.dependencies)
+        self.assertEqual(restored.affected(["template.html"]), self.graph.affected(["template.html"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,3 +1,4 @@
+import tracemalloc
 import unittest
 from extract_title import extract_title 
 
@@ -33,5 +34,17 @@ class TestExtractTitle(unittest.TestCase):
             extract_title(markdown)
         self.assertEqual(str(context.exception), "No H1 header found in the markdown.")
 
+    def test_title_line_is_the_only_copy(self):
+        markdown = "# T\n" + "Body text here.\n" * 1_000_000
+        later = "Intro\n" * 1000 + markdown
+        tracemalloc.start()
+        try:
+            self.assertEqual(extract_title(markdown), "T")
+            self.assertEqual(extract_title(later), "T")
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertLess(peak, 64 * 1024)
+
 if __name__ == '__main__':
     unittest.main()
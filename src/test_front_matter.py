@@ -0,0 +1,162 @@
+import io
+import os
+import unittest
+from fixtures import SiteTestCase
+from front_matter import (FRONT_MATTER_MAX_LINES, date_updated, is_draft, page_template_path, read_front_matter,
+                          slot_values, split_front_matter, split_front_matter_lines)
+from generate_page import generate_page
+from generate_pages_recursive import find_markdown_pages
+from site_index import SiteIndex
+from stream_page import generate_page_streaming
+
+PAGE = """---
+title: "Hello: World"
+date: 2024-05-01
+draft: false
+template: post.html
+aliases: [/old/, /older.html]
+---
+# Heading
+
+Body text.
+"""
+
+
+class TestSplitFrontMatter(unittest.TestCase):
+    def test_fields_and_body(self):
+        fields, body = split_front_matter(PAGE)
+        self.assertEqual(fields, {
+            "title": "Hello: World",
+            "date": "2024-05-01",
+            "draft": False,
+            "template": "post.html",
+            "aliases": ["/old/", "/older.html"],
+        })
+        self.assertEqual(body, "# Heading\n\nBody text.\n")
+
+    def test_no_front_matter(self):
+        self.assertEqual(split_front_matter("# Heading\n"), ({}, "# Heading\n"))
+
+    def test_unclosed_header_is_content(self):
+        text = "---\ntitle: x\n\n# Heading\n"
+        self.assertEqual(split_front_matter(text), ({}, text))
+
+    def test_header_past_line_limit_is_content(self):
+        text = "---\n" + "key: value\n" * (FRONT_MATTER_MAX_LINES + 1) + "---\n# Heading\n"
+        self.assertEqual(split_front_matter(text), ({}, text))
+
+    def test_same_header_rules_as_files(self):
+        # Delimiters are compared stripped, and only "\n" ends a line, as when reading a file
+        for text in ("--- \ntitle: a\u2028b\n  ---\nBody\n", "---\ntitle: x\n---", "---\n---\n"):
+            fields, body = split_front_matter_lines(io.StringIO(text))
+            self.assertEqual(split_front_matter(text), (fields, "".join(body)))
+        self.assertEqual(split_front_matter("--- \ntitle: a\u2028b\n  ---\nBody\n"),
+                         ({"title": "a\u2028b"}, "Body\n"))
+
+    def test_malformed_line(self):
+        with self.assertRaises(ValueError):
+            split_front_matter("---\nnot a field\n---\n# Heading\n")
+
+    def test_lines_form_matches(self):
+        fields, body = split_front_matter_lines(io.StringIO(PAGE))
+        self.assertEqual(fields, split_front_matter(PAGE)[0])
+        self.assertEqual("".join(body), split_front_matter(PAGE)[1])
+        fields, body = split_front_matter_lines(io.StringIO("# Heading\nText\n"))
+        self.assertEqual((fields, "".join(body)), ({}, "# Heading\nText\n"))
+
+    def test_slot_values(self):
+        self.assertEqual(slot_values({"date": "2024-05-01", "draft": True, "tags": ["a", "b"]}),
+                         {"Date": "2024-05-01", "Draft": "true", "Tags": "a, b"})
+
+    def test_helpers(self):
+        self.assertTrue(is_draft({"draft": True}))
+        self.assertFalse(is_draft({"draft": "maybe"}))
+        self.assertEqual(date_updated("2024-05-01"), "2024-05-01T00:00:00Z")
+        self.assertEqual(date_updated("2024-05-01T10:00:00Z"), "2024-05-01T10:00:00Z")
+        self.assertEqual(date_updated("2024-05-01T12:30:00+02:00"), "2024-05-01T10:30:00Z")
+        self.assertEqual(date_updated("2024-05-01 10:00"), "2024-05-01T10:00:00Z")
+        self.assertIsNone(date_updated("May 1st"))
+        self.assertIsNone(date_updated("2024-05-01T<b>"))
+        self.assertEqual(page_template_path(os.path.join("site", "template.html"), {"template": "post.html"}),
+                         os.path.join("site", "post.html"))
+        self.assertEqual(page_template_path("template.html", {}), "template.html")
+
+
+class TestFrontMatterPages(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.write(os.path.join(self.tmp, "post.html"), "<h1>{{ Title }}</h1><time>{{ Date }}</time>")
+
+    def test_read_front_matter_stops_at_header(self):
+        path = os.path.join(self.content, "page.md")
+        os.makedirs(self.content)
+        # Bytes that are not valid UTF-8 past the first buffered read show the body is never decoded
+        with open(path, "wb") as file:
+            file.write(PAGE.encode() + b"text\n" * 10000 + b"\xff\xfe" * 100000)
+        self.assertEqual(read_front_matter(path)["date"], "2024-05-01")
+        self.write(path, "# No header\n")
+        self.assertEqual(read_front_matter(path), {})
+
+    def test_fields_fill_slots_and_pick_template(self):
+        source = os.path.join(self.content, "page.md")
+        dest = os.path.join(self.public, "page.html")
+        self.write(source, PAGE)
+        generate_page(source, self.template, dest)
+        self.assertEqual(self.read(dest), "<h1>Hello: World</h1><time>2024-05-01</time>")
+
+    def test_streaming_matches(self):
+        source = os.path.join(self.content, "page.md")
+        self.write(source, PAGE.replace("template: post.html\n", ""))
+        dest = os.path.join(self.public, "page.html")
+        streamed = os.path.join(self.public, "streamed.html")
+        generate_page(source, self.template, dest)
+        generate_page_streaming(source, self.template, streamed)
+        self.assertEqual(self.read(streamed), self.read(dest))
+        self.assertEqual(self.read(dest),
+                         "<title>Hello: World</title><div><h1>Heading</h1><p>Body text.</p></div>")
+
+    def test_field_slots_are_escaped_for_attributes(self):
+        source = os.path.join(self.content, "page.md")
+        self.write(self.template, '<meta name="description" content="{{ Summary }}">'
+                                  '<meta property="og:title" content="{{ Title }}">{{ Content }}')
+        self.write(source, '---\nsummary: Say "hi" & <go>\ntitle: Say "hi"\n---\nBody.\n')
+        expected = ('<meta name="description" content="Say &quot;hi&quot; &amp; &lt;go&gt;">'
+                    '<meta property="og:title" content="Say &quot;hi&quot;">')
+        dest = os.path.join(self.public, "page.html")
+        streamed = os.path.join(self.public, "streamed.html")
+        generate_page(source, self.template, dest)
+        generate_page_streaming(source, self.template, streamed)
+        self.assertTrue(self.read(dest).startswith(expected))
+        self.assertEqual(self.read(streamed), self.read(dest))
+
+    def test_front_matter_title_replaces_missing_h1(self):
+        source = os.path.join(self.content, "page.md")
+        dest = os.path.join(self.public, "page.html")
+        self.write(source, "---\ntitle: Fish & Chips\n---\nJust text.\n")
+        generate_page(source, self.template, dest)
+        self.assertEqual(self.read(dest), "<title>Fish &amp; Chips</title><div><p>Just text.</p></div>")
+
+    def test_drafts_are_skipped(self):
+        self.write(os.path.join(self.content, "index.md"), "# Home\n")
+        self.write(os.path.join(self.content, "draft.md"), "---\ndraft: true\n---\n# Draft\n")
+        self.assertEqual([source for source, _ in find_markdown_pages(self.content, self.public)],
+                         [os.path.join(self.content, "index.md")])
+        self.assertEqual(len(find_markdown_pages(self.content, self.public, include_drafts=True)), 2)
+
+    def test_date_and_aliases_reach_site_index(self):
+        source = os.path.join(self.content, "page.md")
+        dest = os.path.join(self.public, "page.html")
+        self.write(source, PAGE)
+        site_index = SiteIndex(self.public)
+        outline = site_index.new_outline()
+        generate_page(source, self.template, dest, outline=outline)
+        site_index.add(source, dest, outline)
+        page = site_index.pages[dest]
+        self.assertEqual(page["updated"], "2024-05-01T00:00:00Z")
+        self.assertEqual(page["aliases"], ["/old/", "/older.html"])
+        self.assertEqual(page["meta"]["template"], "post.html")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import tempfile
+import unittest
+from generate_page import generate_page
+
+
+class TestGeneratePage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.markdown_path = os.path.join(self.tmp.name, "index.md")
+        self.template_path = os.path.join(self.tmp.name, "template.html")
+        self.dest_path = os.path.join(self.tmp.name, "public", "index.html")
+        with open(self.markdown_path, "w") as file:
+            file.write("# Hello\n\nSome **bold** text.")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_template(self, text):
+        with open(self.template_path, "w") as file:
+            file.write(text)
+
+    def read_output(self):
+        with open(self.dest_path) as file:
+            return file.read()
+
+    def test_generate_page(self):
+        self.write_template("<title>{{ Title }}</title>{{ Content }}")
+        generate_page(self.markdown_path, self.template_path, self.dest_path)
+        self.assertEqual(
+            self.read_output(),
+            "<title>Hello</title><div><h1>Hello</h1><p>Some <b>bold</b> text.</p></div>",
+        )
+
+    def test_generate_page_with_extra_values(self):
+        self.write_template("{{ Title }} {{ Date }}")
+        generate_page(self.markdown_path, self.template_path, self.dest_path, values={"Date": "2024-05-01"})
+        self.assertEqual(self.read_output(), "Hello 2024-05-01")
+
+    def test_title_is_escaped(self):
+        self.write_template("<title>{{ Title }}</title>")
+        with open(self.markdown_path, "w") as file:
+            file.write("# Fish & <Chips>")
+        generate_page(self.markdown_path, self.template_path, self.dest_path)
+        self.assertEqual(self.read_output(), "<title>Fish &amp; &lt;Chips&gt;</title>")
+
+    def test_missing_title(self):
+        self.write_template("{{ Content }}")
+        with open(self.markdown_path, "w") as file:
+            file.write("No heading here.")
+        with self.assertRaises(RuntimeError):
+            generate_page(self.markdown_path, self.template_path, self.dest_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,8 @@
+import io
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode
+from htmlnode import HTMLNode, LeafNode, Markup, ParentNode, escape_attribute, escape_text
+from new_function_textnode import markdown_to_html_node
  
 #testCases for HTMLNode
 
@@ -38,7 +40,7 @@ class TestHTMLNode(unittest.TestCase):
 
     def test_props_to_html_with_special_characters(self):
         node = HTMLNode(tag="a", value="Link", props={"href": "https://example.com?a=1&b=2"})
-        self.assertEqual(node.props_to_html(), ' href="https://example.com?a=1&b=2"')
+        self.assertEqual(node.props_to_html(), ' href="https://example.com?a=1&amp;b=2"')
 
 #testCases for LeafNode
 
@@ -68,7 +70,7 @@ class TestLeafNode(unittest.TestCase):
 
     def test_to_html_with_special_characters(self):
         node = LeafNode(value="Hello & Welcome!", tag="p")
-        expected_html = '<p>Hello & Welcome!</p>'
+        expected_html = '<p>Hello &amp; Welcome!</p>'
         self.assertEqual(node.to_html(), expected_html)
 
     def test_to_html_with_boolean_props(self):
@@ -147,6 +149,112 @@ class TestParentNode(unittest.TestCase):
         expected_html = '<div class="wrapper"><div><section><b>Bold Text</b></section></div></div>'
         self.assertEqual(wrapper.to_html(), expected_html)
 
+#testCases for streaming serialization
+
+class TestStreamingHTML(unittest.TestCase):
+    def test_iter_html_matches_to_html(self):
+        child1 = LeafNode(tag="span", value="Child 1")
+        child2 = ParentNode(tag="section", children=[LeafNode(tag="p", value="Nested Child")], props={"id": "s"})
+        parent = ParentNode(tag="div", children=[child1, child2])
+        self.assertEqual(list(parent.iter_html()), [
+            "<div>", "<span>Child 1</span>", '<section id="s">', "<p>Nested Child</p>", "</section>", "</div>",
+        ])
+        self.assertEqual("".join(parent.iter_html()), parent.to_html())
+
+    def test_write_html(self):
+        parent = ParentNode(tag="p", children=[LeafNode(value="Hi "), LeafNode(tag="b", value="there")])
+        buffer = io.StringIO()
+        parent.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), "<p>Hi <b>there</b></p>")
+
+    def test_leaf_write_html(self):
+        buffer = io.StringIO()
+        LeafNode(tag="i", value="x").write_html(buffer)
+        self.assertEqual(buffer.getvalue(), "<i>x</i>")
+
+    def test_deeply_nested_tree_does_not_recurse(self):
+        node = LeafNode(tag="b", value="deep")
+        for _ in range(5000):
+            node = ParentNode(tag="span", children=[node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span>" * 5000 + "<b>deep</b>"))
+        self.assertTrue(html.endswith("</span>" * 5000))
+
+    def test_nested_parent_without_tag_raises(self):
+        parent = ParentNode(tag="div", children=[ParentNode(children=[LeafNode(value="x")])])
+        with self.assertRaises(ValueError):
+            parent.to_html()
+
+#testCases for escaping
+
+class TestEscaping(unittest.TestCase):
+    def test_escape_text(self):
+        self.assertEqual(escape_text('a < b && c > "d"'), 'a &lt; b &amp;&amp; c &gt; "d"')
+        plain = "nothing to escape here"
+        self.assertIs(escape_text(plain), plain)
+
+    def test_escape_attribute(self):
+        self.assertEqual(escape_attribute('say "hi" & <go>'), 'say &quot;hi&quot; &amp; &lt;go&gt;')
+        self.assertEqual(escape_attribute(600), "600")
+        self.assertEqual(escape_attribute(Markup("a &amp; b")), "a &amp; b")
+
+    def test_markup_is_not_escaped(self):
+        fragment = Markup("<b>already html</b>")
+        self.assertEqual(LeafNode(fragment).to_html(), "<b>already html</b>")
+        self.assertEqual(LeafNode(fragment, tag="div").to_html(), "<div><b>already html</b></div>")
+
+    def test_leaf_text_and_props_are_escaped(self):
+        node = LeafNode(tag="a", value="1 < 2", props={"href": '/q?a=1&b="2"'})
+        self.assertEqual(node.to_html(), '<a href="/q?a=1&amp;b=&quot;2&quot;">1 &lt; 2</a>')
+        self.assertEqual(LeafNode("<script>").to_html(), "&lt;script&gt;")
+
+    def test_parent_props_are_escaped(self):
+        parent = ParentNode("div", [LeafNode("x")], props={"title": "<tip>"})
+        self.assertEqual(parent.to_html(), '<div title="&lt;tip&gt;">x</div>')
+
+    def test_props_changed_after_render_are_used(self):
+        node = LeafNode(tag="a", value="x", props={"href": "/a&b"})
+        self.assertEqual(node.to_html(), '<a href="/a&amp;b">x</a>')
+        node.props["href"] = "/c"
+        self.assertEqual(node.to_html(), '<a href="/c">x</a>')
+
+    def test_markdown_content_is_escaped(self):
+        html = markdown_to_html_node("# 1 < 2\n\nUse `<div>` & [a](/x?y=1&z=2)\n\n```\nif a < b:\n```").to_html()
+        self.assertEqual(html, '<div><h1>1 &lt; 2</h1><p>Use <code>&lt;div&gt;</code> &amp; '
+                               '<a href="/x?y=1&amp;z=2">a</a></p><pre><code>if a &lt; b:</code></pre></div>')
+
+#testCases for slotted nodes
+
+class TestSlottedNodes(unittest.TestCase):
+    def test_nodes_have_no_instance_dict(self):
+        for node in [HTMLNode(), LeafNode("x"), ParentNode("p", [LeafNode("x")])]:
+            self.assertFalse(hasattr(node, "__dict__"))
+
+    def test_leaves_share_empty_children_and_props(self):
+        first = LeafNode("a")
+        second = LeafNode("b", tag="i")
+        self.assertIs(first.children, second.children)
+        self.assertIs(first.props, second.props)
+        self.assertEqual(first.children, [])
+        self.assertEqual(first.props, {})
+
+    def test_shared_empties_are_read_only(self):
+        node = LeafNode("a")
+        with self.assertRaises(TypeError):
+            node.children.append(LeafNode("b"))
+        with self.assertRaises(TypeError):
+            node.props["href"] = "/"
+        self.assertEqual(LeafNode("c").props, {})
+
+    def test_explicit_empty_containers_are_kept(self):
+        props = {}
+        node = HTMLNode(tag="a", props=props)
+        node.props["href"] = "/"
+        self.assertEqual(node.props_to_html(), ' href="/"')
+
+    def test_eq_between_default_and_explicit_empties(self):
+        self.assertEqual(HTMLNode(tag="p", value="x"), HTMLNode(tag="p", value="x", children=[], props={}))
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
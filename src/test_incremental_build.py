@@ -0,0 +1,165 @@
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from fixtures import SiteTestCase
+from incremental_build import incremental_build
+
+
+class TestIncrementalBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manifest = os.path.join(self.tmp, "manifest.json")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome.")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nPosts.")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def build(self):
+        return incremental_build(self.static, self.content, self.template, self.public, self.manifest)
+
+    def test_first_build_generates_everything(self):
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 2)
+        self.assertEqual(stats["assets_copied"], 1)
+        self.assertTrue(os.path.exists(os.path.join(self.public, "blog", "index.html")))
+        self.assertTrue(os.path.exists(os.path.join(self.public, "index.css")))
+
+    def test_second_build_skips_unchanged(self):
+        self.build()
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 0)
+        self.assertEqual(stats["pages_skipped"], 2)
+        self.assertEqual(stats["assets_copied"], 0)
+
+    def test_changed_page_is_rebuilt(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome back.")
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 1)
+        with open(os.path.join(self.public, "index.html")) as file:
+            self.assertIn("Welcome back.", file.read())
+
+    def test_template_change_rebuilds_all_pages(self):
+        self.build()
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 2)
+        self.assertEqual(stats["assets_copied"], 0)
+
+    def test_partial_change_rebuilds_pages_that_include_it(self):
+        partial = os.path.join(self.tmp, "nav.html")
+        self.write(partial, "<nav>v1</nav>")
+        self.write(self.template, "{{> nav.html }}<title>{{ Title }}</title>{{ Content }}")
+        self.build()
+        self.assertEqual(self.build()["pages_built"], 0)
+        self.write(partial, "<nav>v2</nav>")
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 2)
+        self.assertEqual(stats["reasons"][os.path.join(self.public, "index.html")], [f"{partial} changed"])
+        with open(os.path.join(self.public, "blog", "index.html")) as file:
+            self.assertTrue(file.read().startswith("<nav>v2</nav>"))
+
+    def test_rebuild_reasons(self):
+        self.build()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited.")
+        self.write(os.path.join(self.content, "new.md"), "# New")
+        stats = self.build()
+        self.assertEqual(stats["reasons"], {
+            os.path.join(self.public, "index.html"): [f"{os.path.join(self.content, 'index.md')} changed"],
+            os.path.join(self.public, "new.html"): ["new page"],
+        })
+
+    def test_page_template_from_front_matter(self):
+        post = os.path.join(self.tmp, "post.html")
+        self.write(post, "<article>{{ Content }}</article>")
+        self.write(os.path.join(self.content, "blog", "index.md"), "---\ntemplate: post.html\n---\n# Blog\n")
+        self.build()
+        with open(os.path.join(self.public, "blog", "index.html")) as file:
+            self.assertTrue(file.read().startswith("<article>"))
+        self.assertEqual(self.build()["pages_built"], 0)
+        self.write(post, "<main>{{ Content }}</main>")
+        stats = self.build()
+        self.assertEqual(stats["reasons"], {os.path.join(self.public, "blog", "index.html"): [f"{post} changed"]})
+
+    def test_page_turned_draft_is_removed(self):
+        self.build()
+        self.write(os.path.join(self.content, "blog", "index.md"), "---\ndraft: true\n---\n# Blog\n")
+        stats = self.build()
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog", "index.html")))
+
+    def test_forced_build_records_a_fresh_manifest(self):
+        self.build()
+        page = os.path.join(self.content, "index.md")
+        self.write(page, "# Home\n\nDraft edit.")
+        stats = incremental_build(self.static, self.content, self.template, self.public, self.manifest, force=True)
+        self.assertEqual(stats["pages_built"], 2)
+        self.assertEqual(set(map(tuple, stats["reasons"].values())), {("full build",)})
+        self.write(page, "# Home\n\nWelcome.")
+        self.assertEqual(self.build()["pages_built"], 1)
+        with open(os.path.join(self.public, "index.html")) as file:
+            self.assertIn("Welcome.", file.read())
+
+    def test_removed_source_deletes_output(self):
+        self.build()
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        stats = self.build()
+        self.assertEqual(stats["removed"], 1)
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+
+    def test_rebuilt_page_with_identical_html_is_not_reported_changed(self):
+        self.build()
+        with open(os.path.join(self.content, "index.md"), "a") as file:
+            file.write("\n\n")
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertEqual(stats["changed_outputs"], [])
+
+    def test_missing_output_is_regenerated(self):
+        self.build()
+        os.remove(os.path.join(self.public, "index.html"))
+        stats = self.build()
+        self.assertEqual(stats["pages_built"], 1)
+
+
+class TestFullBuild(SiteTestCase):
+    # The default (non --incremental) build of main.py, run where it expects static/ and content/
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome.")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nPosts.")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def run_main(self, *args):
+        main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+        result = subprocess.run([sys.executable, main, *args], cwd=self.tmp, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+
+    def test_outputs_are_updated_in_place(self):
+        self.run_main()
+        home = os.path.join(self.public, "index.html")
+        os.utime(home, ns=(0, 0))
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nEdited.")
+        self.run_main("--changed-list", "changed.txt")
+        self.assertEqual(os.stat(home).st_mtime_ns, 0)
+        self.assertEqual(self.read(os.path.join(self.tmp, "changed.txt")),
+                         os.path.join("public", "blog", "index.html") + "\n")
+
+    def test_outputs_of_removed_sources_are_deleted(self):
+        self.run_main()
+        shutil.rmtree(os.path.join(self.content, "blog"))
+        os.remove(os.path.join(self.static, "index.css"))
+        self.run_main()
+        self.assertEqual(os.listdir(self.public), ["index.html"])
+
+    def test_public_starts_empty_without_a_manifest(self):
+        self.write(os.path.join(self.public, "leftover.html"), "old")
+        self.run_main()
+        self.assertFalse(os.path.exists(os.path.join(self.public, "leftover.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+from textnode import TextNode
+from inline_lexer import tokenize_inline
+from new_function_textnode import text_to_textnodes_chained
+
+
+class TestTokenizeInline(unittest.TestCase):
+    def test_matches_chained_pipeline(self):
+        samples = [
+            "Hello world",
+            "This is **bold** text",
+            "This is *italic* and `code` text",
+            "An ![image](https://example.com/a.png) and a [link](https://example.com).",
+            "Here is **bold** text, *italic*, `code`, an ![image](https://example.com/image.png), "
+            "and a [link](https://example.com).",
+            "[one](/1)[two](/2) ![a](/a.png)![b](/b.png)",
+            "Here is ![malformed image(https://example.com/image.png)",
+            "Here is a [broken link(https://example.com)",
+            "**bold** *italic* `code`",
+            "` padded code `",
+            "",
+        ]
+        for text in samples:
+            with self.subTest(text=text):
+                self.assertEqual(tokenize_inline(text), text_to_textnodes_chained(text))
+
+    def test_unmatched_delimiters(self):
+        for text in ["**bold", "*italic", "`code", "a ** b"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    tokenize_inline(text)
+
+    def test_escaped_delimiters(self):
+        self.assertEqual(tokenize_inline(r"2 \* 3 \*\* 4 \` \[x\](y)"), [TextNode("2 * 3 ** 4 ` [x](y)", "text")])
+
+    def test_backslash_before_ordinary_character(self):
+        self.assertEqual(tokenize_inline(r"C:\path"), [TextNode(r"C:\path", "text")])
+
+    def test_italic_inside_bold(self):
+        self.assertEqual(tokenize_inline("**bold *it* more**"), [
+            TextNode("bold ", "bold"),
+            TextNode("it", "italic"),
+            TextNode(" more", "bold"),
+        ])
+
+    def test_bold_inside_italic(self):
+        self.assertEqual(tokenize_inline("*a **b** c*"), [
+            TextNode("a ", "italic"),
+            TextNode("b", "bold"),
+            TextNode(" c", "italic"),
+        ])
+
+    def test_emphasis_with_only_nested_spans(self):
+        # The outer emphasis would leave no node behind, so it is rejected rather than dropped
+        for text in ["***x***", "**[l](u)**", "*[l](u)*", "**![a](/a.png)**", "**`c`**", "*`c`*"]:
+            with self.subTest(text=text):
+                with self.assertRaisesRegex(ValueError, "only nested spans"):
+                    tokenize_inline(text)
+
+    def test_innermost_span_wins(self):
+        self.assertEqual(tokenize_inline("***x* y**"), [TextNode("x", "italic"), TextNode(" y", "bold")])
+        self.assertEqual(tokenize_inline("**a *b***"), [TextNode("a ", "bold"), TextNode("b", "italic")])
+
+    def test_link_inside_bold(self):
+        self.assertEqual(tokenize_inline("**see [docs](/docs)**"), [
+            TextNode("see ", "bold"),
+            TextNode("docs", "link", "/docs"),
+        ])
+        self.assertEqual(tokenize_inline("*run `make`*"), [
+            TextNode("run ", "italic"),
+            TextNode("make", "code"),
+        ])
+
+    def test_delimiters_inside_code_are_literal(self):
+        self.assertEqual(tokenize_inline("`a*b`"), [TextNode("a*b", "code")])
+
+    def test_many_links_is_linear(self):
+        text = " ".join(f"[l{i}](/p{i})" for i in range(2000))
+        nodes = tokenize_inline(text)
+        self.assertEqual(len(nodes), 3999)
+        self.assertEqual(nodes[-1], TextNode("l1999", "link", "/p1999"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+import lazy_serve
+from fixtures import SiteTestCase
+from lazy_serve import LazyRequestHandler, LazySite, PageCache, start_lazy_server
+
+
+class TestPageCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        cache = PageCache(max_entries=2)
+        cache.put("a", 1, 1)
+        cache.put("b", 2, 1)
+        cache.get("a")
+        cache.put("c", 3, 1)
+        self.assertEqual((cache.get("a"), cache.get("b"), cache.get("c")), (1, None, 3))
+
+    def test_bounded_by_bytes(self):
+        cache = PageCache(max_bytes=10)
+        cache.put("a", "a", 6)
+        cache.put("b", "b", 6)
+        self.assertEqual((len(cache), cache.size), (1, 6))
+        cache.put("huge", "huge", 11)
+        self.assertIsNone(cache.get("huge"))
+        cache.put("b", "b2", 2)
+        self.assertEqual((cache.get("b"), cache.size), ("b2", 2))
+
+
+class TestLazySite(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome.")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nPosts.")
+        self.write(os.path.join(self.content, "about.md"), "# About")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        self.site = LazySite(self.content, self.template)
+
+    def touch_later(self, path):
+        # Make sure an edit is visible even on filesystems with coarse mtimes
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_source_for(self):
+        self.assertEqual(self.site.source_for("/"), (os.path.join(self.content, "index.md"), None))
+        self.assertEqual(self.site.source_for("/blog/?q=1"), (os.path.join(self.content, "blog", "index.md"), None))
+        self.assertEqual(self.site.source_for("/blog"), (os.path.join(self.content, "blog", "index.md"), "/blog/"))
+        self.assertEqual(self.site.source_for("/about.html"), (os.path.join(self.content, "about.md"), None))
+        self.assertIsNone(self.site.source_for("/index.css"))
+        self.assertIsNone(self.site.source_for("/missing.html"))
+
+    def test_source_for_stays_in_content(self):
+        self.write(os.path.join(self.tmp, "secret.md"), "# Secret")
+        self.assertIsNone(self.site.source_for("/../secret.html"))
+        self.assertIsNone(self.site.source_for("/%2e%2e/secret.html"))
+
+    def test_render_is_cached_until_source_changes(self):
+        source = os.path.join(self.content, "index.md")
+        with mock.patch.object(lazy_serve, "prepare_page", wraps=lazy_serve.prepare_page) as prepare:
+            first = self.site.render(source)
+            self.assertEqual(self.site.render(source), first)
+            self.assertEqual(prepare.call_count, 1)
+            self.write(source, "# Home\n\nEdited.")
+            self.touch_later(source)
+            self.assertIn(b"Edited.", self.site.render(source))
+            self.assertEqual(prepare.call_count, 2)
+        self.assertEqual(first, b"<title>Home</title><div><h1>Home</h1><p>Welcome.</p></div>")
+
+    def test_template_change_invalidates(self):
+        source = os.path.join(self.content, "index.md")
+        self.site.render(source)
+        self.write(self.template, "<h1>{{ Title }}</h1>")
+        self.touch_later(self.template)
+        self.assertEqual(self.site.render(source), b"<h1>Home</h1>")
+
+    def test_drafts_are_not_served(self):
+        source = os.path.join(self.content, "about.md")
+        self.write(source, "---\ndraft: true\n---\n# About")
+        self.assertIsNone(self.site.render(source))
+        self.assertIsNotNone(LazySite(self.content, self.template, include_drafts=True).render(source))
+
+    def test_server(self):
+        self.write(os.path.join(self.content, "broken.md"), "No title.")
+        quiet = mock.patch.object(LazyRequestHandler, "log_message")
+        quiet.start()
+        self.addCleanup(quiet.stop)
+        server = start_lazy_server(self.site, self.static, 0)
+        base = f"http://127.0.0.1:{server.server_address[1]}"
+        try:
+            with urllib.request.urlopen(base + "/") as response:
+                self.assertEqual(response.headers["Content-Type"], "text/html; charset=utf-8")
+                self.assertIn(b"<h1>Home</h1>", response.read())
+            with urllib.request.urlopen(base + "/blog") as response:
+                self.assertEqual(response.url, base + "/blog/")
+            with urllib.request.urlopen(base + "/index.css") as response:
+                self.assertEqual(response.read(), b"body {}")
+            for path, status in (("/missing.html", 404), ("/broken.html", 500)):
+                with self.assertRaises(urllib.error.HTTPError) as raised:
+                    urllib.request.urlopen(base + path)
+                self.assertEqual(raised.exception.code, status)
+                raised.exception.close()
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import subprocess
+import sys
+import unittest
+from fixtures import SiteTestCase
+from generate_pages_recursive import generate_pages_recursive
+from link_check import check_links, format_report, published_paths, resolve_target, static_urls
+from site_index import PageOutline, SiteIndex
+
+
+class TestResolveTarget(unittest.TestCase):
+    def test_external_targets_are_skipped(self):
+        for target in ("https://example.com", "mailto:me@example.com", "//cdn.example.com/x.js", "#top", ""):
+            self.assertIsNone(resolve_target(target, "/blog/"))
+
+    def test_absolute_and_relative_targets(self):
+        self.assertEqual(resolve_target("/majesty", "/blog/"), "/majesty")
+        self.assertEqual(resolve_target("/majesty/#team", "/blog/"), "/majesty/")
+        self.assertEqual(resolve_target("post/", "/blog/"), "/blog/post/")
+        self.assertEqual(resolve_target("../images/a.png?v=2", "/blog/post/"), "/blog/images/a.png")
+        self.assertEqual(resolve_target("logo.png", "/about.html"), "/logo.png")
+        self.assertEqual(resolve_target("../../../x", "/a/"), "/x")
+        self.assertEqual(resolve_target("/my%20file.pdf", "/"), "/my file.pdf")
+
+
+class TestCheckLinks(unittest.TestCase):
+    def setUp(self):
+        self.index = SiteIndex("public")
+        self.add_page("index.md", "public/index.html", links=["/blog", "/blog/", "/missing/", "https://x.org"],
+                      images=[("logo", "/images/logo.png"), ("gone", "/images/gone.png")])
+        self.add_page("blog/index.md", "public/blog/index.html", links=["../", "post.html", "#top"])
+        self.add_page("blog/post.md", "public/blog/post.html", links=["index.html", "../nowhere.html"])
+
+    def add_page(self, source, output, links=(), images=()):
+        outline = PageOutline()
+        outline.links = list(links)
+        outline.images = list(images)
+        self.index.add(source, output, outline)
+
+    def test_published_paths(self):
+        paths = published_paths(self.index, ["/images/logo.png"])
+        self.assertTrue({"/", "/index.html", "/blog/", "/blog", "/blog/index.html", "/blog/post.html",
+                         "/images/logo.png"} <= paths)
+
+    def test_broken_targets_are_reported(self):
+        broken = check_links(self.index, ["/images/logo.png"])
+        self.assertEqual(broken, [
+            ("blog/post.md", "link", "../nowhere.html"),
+            ("index.md", "link", "/missing/"),
+            ("index.md", "image", "/images/gone.png"),
+        ])
+        report = format_report(broken)
+        self.assertEqual(report.splitlines()[0], "blog/post.md:")
+        self.assertIn("  broken image: /images/gone.png", report)
+
+
+class TestCheckBuiltSite(SiteTestCase):
+    def test_links_from_generated_pages(self):
+        static, content, public, template = self.static, self.content, self.public, self.template
+        self.write(os.path.join(static, "images", "a.png"), "png")
+        self.write(os.path.join(content, "index.md"), "# Home\n\n[Blog](/blog) ![a](/images/a.png) [x](/x)")
+        self.write(os.path.join(content, "blog", "index.md"), "# Blog\n\n[Home](../) ![b](b.png)")
+        self.write(template, "{{ Content }}")
+        index = SiteIndex(public)
+        generate_pages_recursive(content, template, public, site_index=index)
+        self.assertEqual(sorted(static_urls(static)), ["/images/a.png"])
+        self.assertEqual(check_links(index, static_urls(static)), [
+            (os.path.join(content, "blog", "index.md"), "image", "b.png"),
+            (os.path.join(content, "index.md"), "link", "/x"),
+        ])
+
+    def test_files_written_by_later_stages_are_published(self):
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.content, "index.md"),
+                   "# Home\n\n[feed](/atom.xml) [map](/sitemap.xml) [search](/search/index.json)")
+        self.write(self.template, "{{ Content }}")
+        main = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+        result = subprocess.run([sys.executable, main, "--base-url", "https://example.com", "--search",
+                                 "--check-links"], cwd=self.tmp, capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stdout + result.stderr)
+        self.assertIn("No broken links.", result.stdout)
+
+
+if __name__ == "__main__":
+    unittest.main()
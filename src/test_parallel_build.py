@@ -0,0 +1,48 @@
+import os
+import unittest
+from block_cache import BlockCache
+from fixtures import SiteTestCase
+from parallel_build import generate_pages_parallel
+
+
+class TestParallelBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(6):
+            self.write(os.path.join(self.content, f"page{i}", "index.md"), f"# Page {i}\n\nBody {i}.")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def test_pages_generated_with_pool(self):
+        errors = generate_pages_parallel(self.content, self.template, self.public, jobs=3)
+        self.assertEqual(errors, [])
+        for i in range(6):
+            html = self.read(os.path.join(self.public, f"page{i}", "index.html"))
+            self.assertIn(f"<title>Page {i}</title>", html)
+
+    def test_errors_are_collected_without_aborting(self):
+        self.write(os.path.join(self.content, "page2", "index.md"), "No title here.")
+        errors = generate_pages_parallel(self.content, self.template, self.public, jobs=2)
+        self.assertEqual([path for path, _ in errors], [os.path.join(self.content, "page2", "index.md")])
+        self.assertIn("RuntimeError", errors[0][1])
+        self.assertTrue(os.path.exists(os.path.join(self.public, "page5", "index.html")))
+
+    def test_single_job_matches_pool_output(self):
+        generate_pages_parallel(self.content, self.template, self.public, jobs=1)
+        serial = self.read(os.path.join(self.public, "page3", "index.html"))
+        generate_pages_parallel(self.content, self.template, self.public, jobs=4)
+        self.assertEqual(serial, self.read(os.path.join(self.public, "page3", "index.html")))
+
+    def test_worker_blocks_return_to_the_parent_cache(self):
+        for i in range(6):
+            self.write(os.path.join(self.content, f"page{i}", "index.md"), f"# Page {i}\n\nShared footer.")
+        serial = BlockCache()
+        generate_pages_parallel(self.content, self.template, self.public, jobs=1, block_cache=serial)
+        pooled = BlockCache()
+        generate_pages_parallel(self.content, self.template, self.public, jobs=3, block_cache=pooled)
+        self.assertEqual(dict(pooled.entries), dict(serial.entries))
+        self.assertEqual(pooled.hits + pooled.misses, serial.hits + serial.misses)
+        self.assertGreater(pooled.hits, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import os
+import unittest
+from unittest import mock
+import pipeline_build
+from fixtures import SiteTestCase
+from generate_pages_recursive import find_markdown_pages, generate_pages_recursive
+from pipeline_build import build_pages_pipelined
+
+
+class TestPipelineBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(12):
+            self.write(os.path.join(self.content, f"page{i:02}", "index.md"), f"# Page {i}\n\nBody **{i}**.")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def pages(self):
+        return find_markdown_pages(self.content, self.public)
+
+    def test_output_matches_serial_build(self):
+        serial_dir = os.path.join(self.tmp, "serial")
+        generate_pages_recursive(self.content, self.template, serial_dir)
+        changed = []
+        errors = build_pages_pipelined(self.pages(), self.template, io_threads=3, depth=2, changed_outputs=changed)
+        self.assertEqual(errors, [])
+        self.assertEqual(changed, [dest for _, dest in self.pages()])
+        for i in range(12):
+            relative = os.path.join(f"page{i:02}", "index.html")
+            self.assertEqual(self.read(os.path.join(serial_dir, relative)),
+                             self.read(os.path.join(self.public, relative)))
+
+    def test_unchanged_pages_are_not_reported(self):
+        build_pages_pipelined(self.pages(), self.template)
+        changed = []
+        build_pages_pipelined(self.pages(), self.template, changed_outputs=changed)
+        self.assertEqual(changed, [])
+
+    def test_errors_are_collected_in_page_order(self):
+        self.write(os.path.join(self.content, "page03", "index.md"), "No title here.")
+        self.write(os.path.join(self.content, "page07", "index.md"), "Also untitled.")
+        errors = build_pages_pipelined(self.pages(), self.template, io_threads=2, depth=3)
+        self.assertEqual([path for path, _ in errors],
+                         [os.path.join(self.content, "page03", "index.md"),
+                          os.path.join(self.content, "page07", "index.md")])
+        self.assertIn("RuntimeError", errors[0][1])
+        self.assertTrue(os.path.exists(os.path.join(self.public, "page11", "index.html")))
+
+    def test_read_errors_are_reported(self):
+        pages = self.pages() + [(os.path.join(self.content, "missing.md"), os.path.join(self.public, "missing.html"))]
+        errors = build_pages_pipelined(pages, self.template)
+        self.assertEqual(len(errors), 1)
+        self.assertIn("FileNotFoundError", errors[0][1])
+
+    def test_queues_stay_bounded(self):
+        in_flight = []
+        read_source = pipeline_build.read_source
+        started = []
+
+        def tracking_read(path):
+            started.append(path)
+            return read_source(path)
+
+        def tracking_write(dest, html):
+            # Reads can only run ahead of writes by the two queues plus the page being rendered
+            in_flight.append(len(started))
+            return True
+
+        with mock.patch.object(pipeline_build, "read_source", tracking_read), \
+                mock.patch.object(pipeline_build, "write_page", tracking_write):
+            build_pages_pipelined(self.pages(), self.template, io_threads=2, depth=2)
+        for written, reads_started in enumerate(in_flight, start=1):
+            self.assertLessEqual(reads_started, written + 2 * 2 + 1)
+
+    def test_large_sources_are_streamed(self):
+        with mock.patch.object(pipeline_build, "STREAM_THRESHOLD", 1):
+            errors = build_pages_pipelined(self.pages(), self.template, io_threads=2)
+        self.assertEqual(errors, [])
+        self.assertIn("<title>Page 5</title>", self.read(os.path.join(self.public, "page05", "index.html")))
+
+
+if __name__ == "__main__":
+    unittest.main()
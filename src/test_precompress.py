@@ -0,0 +1,97 @@
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import precompress
+from fixtures import write_file
+from precompress import gzip_compress, precompress_directory
+
+BIG = "<p>" + "compressible text " * 200 + "</p>"
+
+
+class TestPrecompress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        state = tempfile.NamedTemporaryFile(suffix=".json", delete=False)
+        state.close()
+        self.state_path = state.name
+        self.write("index.html", BIG)
+        self.write("blog/index.html", BIG)
+        self.write("index.css", "body { margin: 0 }" * 100)
+        self.write("small.html", "<p>tiny</p>")
+        self.write("photo.png", "x" * 5000)
+        self.encodings = [("gz", gzip_compress)]
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+        os.remove(self.state_path)
+
+    def path(self, name):
+        return os.path.join(self.tmp, *name.split("/"))
+
+    def write(self, name, text):
+        write_file(self.path(name), text)
+
+    def run_stage(self, jobs=1):
+        return precompress_directory(self.tmp, jobs, encodings=self.encodings, state_path=self.state_path)
+
+    def test_siblings_written_for_large_text_files(self):
+        self.assertEqual(self.run_stage(jobs=3), {"compressed": 3, "skipped": 0, "removed": 0})
+        with gzip.open(self.path("blog/index.html.gz"), "rt") as file:
+            self.assertEqual(file.read(), BIG)
+        self.assertTrue(os.path.exists(self.path("index.css.gz")))
+        self.assertFalse(os.path.exists(self.path("small.html.gz")))
+        self.assertFalse(os.path.exists(self.path("photo.png.gz")))
+
+    def test_unchanged_outputs_are_skipped(self):
+        self.run_stage()
+        with mock.patch.object(precompress, "write_sibling") as write_sibling:
+            self.assertEqual(self.run_stage(), {"compressed": 0, "skipped": 3, "removed": 0})
+            write_sibling.assert_not_called()
+
+    def test_changed_output_is_recompressed(self):
+        self.run_stage()
+        self.write("index.html", BIG + "<p>more</p>")
+        stat = os.stat(self.path("index.html"))
+        os.utime(self.path("index.html"), ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(self.run_stage()["compressed"], 1)
+        with gzip.open(self.path("index.html.gz"), "rt") as file:
+            self.assertEqual(file.read(), BIG + "<p>more</p>")
+
+    def test_stale_siblings_are_removed(self):
+        self.run_stage()
+        os.remove(self.path("blog/index.html"))
+        self.write("index.css", "body {}")
+        self.write("archive.tar.gz", "not a sibling")
+        self.assertEqual(self.run_stage()["removed"], 2)
+        self.assertFalse(os.path.exists(self.path("blog/index.html.gz")))
+        self.assertFalse(os.path.exists(self.path("index.css.gz")))
+        self.assertTrue(os.path.exists(self.path("archive.tar.gz")))
+
+    def test_siblings_of_unavailable_encoders_are_removed(self):
+        self.encodings = [("gz", gzip_compress), ("br", lambda data: data[::-1])]
+        self.run_stage()
+        self.assertTrue(os.path.exists(self.path("index.html.br")))
+        self.encodings = [("gz", gzip_compress)]
+        self.assertEqual(self.run_stage()["removed"], 3)
+        self.assertFalse(os.path.exists(self.path("index.html.br")))
+
+    def test_real_compressed_assets_are_kept(self):
+        self.write("data.json.gz", "real asset")
+        self.write("feed.xml", "<feed/>" * 500)
+        self.write("feed.xml.gz", "hand-made")
+        self.run_stage()
+        os.remove(self.path("feed.xml"))
+        self.assertEqual(self.run_stage()["removed"], 0)
+        for name, text in (("data.json.gz", "real asset"), ("feed.xml.gz", "hand-made")):
+            with open(self.path(name)) as file:
+                self.assertEqual(file.read(), text)
+
+    def test_gzip_output_is_reproducible(self):
+        self.assertEqual(gzip_compress(BIG.encode()), gzip_compress(BIG.encode()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import errno
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+import publish_assets
+from publish_assets import publish_file
+
+
+class TestPublishFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.src = os.path.join(self.tmp, "static", "images", "photo.png")
+        self.dest = os.path.join(self.tmp, "public", "images", "photo.png")
+        os.makedirs(os.path.dirname(self.src))
+        with open(self.src, "wb") as file:
+            file.write(b"\x89PNG" + b"x" * 1000)
+        publish_assets._unsupported.clear()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def read(self, path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    def test_copy(self):
+        self.assertEqual(publish_file(self.src, self.dest, "copy"), "copy")
+        self.assertEqual(self.read(self.dest), self.read(self.src))
+        self.assertFalse(os.path.samefile(self.src, self.dest))
+
+    def test_hardlink(self):
+        self.assertEqual(publish_file(self.src, self.dest, "hardlink"), "hardlink")
+        self.assertTrue(os.path.samefile(self.src, self.dest))
+
+    def test_symlink(self):
+        self.assertEqual(publish_file(self.src, self.dest, "symlink"), "symlink")
+        self.assertTrue(os.path.islink(self.dest))
+        self.assertEqual(self.read(self.dest), self.read(self.src))
+
+    def test_reflink_falls_back_to_copy_when_unsupported(self):
+        self.assertIn(publish_file(self.src, self.dest, "reflink"), ("reflink", "copy"))
+        self.assertEqual(self.read(self.dest), self.read(self.src))
+
+    def test_hardlink_falls_back_across_devices(self):
+        with mock.patch("os.link", side_effect=OSError(errno.EXDEV, "Invalid cross-device link")):
+            self.assertEqual(publish_file(self.src, self.dest, "hardlink"), "copy")
+        self.assertEqual(self.read(self.dest), self.read(self.src))
+        # The failed mode is remembered and the copy counts as up to date
+        self.assertIsNone(publish_file(self.src, self.dest, "hardlink"))
+
+    def test_real_errors_are_not_swallowed(self):
+        with mock.patch("os.link", side_effect=OSError(errno.EIO, "I/O error")):
+            with self.assertRaises(OSError):
+                publish_file(self.src, self.dest, "hardlink")
+
+    def test_unchanged_file_is_skipped(self):
+        publish_file(self.src, self.dest, "copy")
+        self.assertIsNone(publish_file(self.src, self.dest, "copy"))
+
+    def test_changed_file_is_republished(self):
+        publish_file(self.src, self.dest, "copy")
+        with open(self.src, "ab") as file:
+            file.write(b"more")
+        self.assertEqual(publish_file(self.src, self.dest, "copy"), "copy")
+        self.assertEqual(self.read(self.dest), self.read(self.src))
+
+    def test_switching_mode_republishes(self):
+        publish_file(self.src, self.dest, "copy")
+        self.assertEqual(publish_file(self.src, self.dest, "symlink"), "symlink")
+        self.assertEqual(publish_file(self.src, self.dest, "copy"), "copy")
+        self.assertFalse(os.path.islink(self.dest))
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            publish_file(self.src, self.dest, "teleport")
+
+
+if __name__ == "__main__":
+    unittest.main()
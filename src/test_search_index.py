@@ -0,0 +1,131 @@
+import json
+import os
+import shutil
+import unittest
+from collections import Counter
+from block_cache import BlockCache
+from fixtures import SiteTestCase
+from generate_pages_recursive import generate_pages_recursive
+from incremental_build import incremental_build
+from new_function_textnode import blocks_to_html_chunks, markdown_to_blocks, markdown_to_html_node
+from search_index import SearchIndex, add_terms
+from site_index import PageOutline, SiteIndex
+
+MARKDOWN = """# Static Sites
+
+Markdown **rendering** with a [link text](/x) and `code`.
+
+> quoted wisdom
+
+* listed item
+"""
+
+
+class TestTerms(unittest.TestCase):
+    def test_add_terms(self):
+        terms = Counter()
+        add_terms(terms, "Hello, hello world! A b", 2)
+        self.assertEqual(terms, {"hello": 4, "world": 2})
+
+    def test_outline_collects_weighted_terms(self):
+        outline = PageOutline(terms=True)
+        markdown_to_html_node(MARKDOWN, outline)
+        self.assertEqual(outline.terms["static"], 3)
+        self.assertEqual(outline.terms["rendering"], 1)
+        for term in ("link", "code", "quoted", "listed", "item"):
+            self.assertIn(term, outline.terms)
+        self.assertIsNone(PageOutline().terms)
+
+    def test_cache_hits_collect_the_same_terms(self):
+        cache = BlockCache()
+        blocks = markdown_to_blocks(MARKDOWN)
+        first = PageOutline(terms=True)
+        blocks_to_html_chunks(blocks, cache, first)
+        second = PageOutline(terms=True)
+        blocks_to_html_chunks(blocks, cache, second)
+        self.assertEqual(cache.hits, len(blocks))
+        self.assertEqual(first.terms, second.terms)
+        self.assertEqual(first.headings, second.headings)
+
+
+class TestSearchIndex(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.manifest = os.path.join(self.tmp, "manifest.json")
+        self.state = os.path.join(self.tmp, "search_state.json")
+        self.search_dir = os.path.join(self.public, "search")
+        os.makedirs(self.static)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome to the zebra garden.")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nZebra zebra stripes.")
+        self.write(self.template, "{{ Content }}")
+        self.site_index = SiteIndex(self.public, collect_terms=True)
+
+    def build(self):
+        # An incremental build followed by the search stage, the way main() runs them
+        search = SearchIndex.load(self.state, self.search_dir)
+        self.site_index.terms = {}
+        self.site_index.indexed_outputs = set(search.documents)
+        stats = incremental_build(self.static, self.content, self.template, self.public, self.manifest,
+                                  site_index=self.site_index)
+        stats["shards_written"] = search.update(self.site_index)
+        search.save(self.state)
+        return search, stats
+
+    def test_shards_and_lookup(self):
+        search, _ = self.build()
+        with open(os.path.join(self.search_dir, "index.json")) as file:
+            index = json.load(file)
+        self.assertEqual(index["prefix_length"], 2)
+        self.assertIn("ze", index["shards"])
+        self.assertEqual(sorted(url for url, _ in index["pages"].values()), ["/", "/blog/"])
+        with open(os.path.join(self.search_dir, "ze.json")) as file:
+            postings = json.load(file)["zebra"]
+        self.assertEqual([weight for _, weight in postings], [2, 1])
+        self.assertEqual(search.search("zebra"), ["/blog/", "/"])
+        self.assertEqual(search.search("zebra garden"), ["/"])
+        self.assertEqual(search.search("nothing"), [])
+
+    def test_only_touched_shards_are_rewritten(self):
+        self.build()
+        self.assertEqual(self.build()[1]["shards_written"], 0)
+        stripes = os.path.join(self.search_dir, "st.json")
+        os.utime(stripes, ns=(0, 0))
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome to the zebra orchard.")
+        search, stats = self.build()
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertEqual(os.stat(stripes).st_mtime_ns, 0)
+        self.assertFalse(os.path.exists(os.path.join(self.search_dir, "ga.json")))
+        self.assertEqual(search.search("orchard"), ["/"])
+        self.assertEqual(search.search("garden"), [])
+
+    def test_removed_page_leaves_the_index(self):
+        self.build()
+        shutil.rmtree(os.path.join(self.content, "blog"))
+        search, _ = self.build()
+        self.assertEqual(search.search("zebra"), ["/"])
+        self.assertFalse(os.path.exists(os.path.join(self.search_dir, "st.json")))
+        self.assertEqual(len(search.documents), 1)
+
+    def test_page_ids_are_stable(self):
+        search, _ = self.build()
+        ids = {output: document["id"] for output, document in search.documents.items()}
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nChanged.")
+        search, _ = self.build()
+        self.assertEqual({output: document["id"] for output, document in search.documents.items()}, ids)
+
+    def test_lost_published_index_reparses_every_page(self):
+        self.build()
+        shutil.rmtree(self.search_dir)
+        search, stats = self.build()
+        self.assertEqual(stats["pages_built"], 2)
+        self.assertEqual(search.search("zebra"), ["/blog/", "/"])
+
+    def test_full_build(self):
+        generate_pages_recursive(self.content, self.template, self.public, site_index=self.site_index)
+        search = SearchIndex(self.search_dir)
+        search.update(self.site_index)
+        self.assertEqual(search.search("welcome"), ["/"])
+
+
+if __name__ == "__main__":
+    unittest.main()
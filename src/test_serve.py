@@ -0,0 +1,147 @@
+import os
+import unittest
+from build_log import logger
+from fixtures import SiteTestCase
+from generate_pages_recursive import generate_pages_recursive
+from incremental_build import incremental_build
+from serve import SiteWatcher, diff_snapshots
+
+
+class TestDiffSnapshots(unittest.TestCase):
+    def test_changed_added_and_removed(self):
+        old = {"a": (1, 1), "b": (1, 1), "c": (1, 1)}
+        new = {"a": (1, 1), "b": (2, 1), "d": (1, 1)}
+        self.assertEqual(diff_snapshots(old, new), ({"b", "d"}, {"c"}))
+
+
+class TestSiteWatcher(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nWelcome.")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nPosts.")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+        generate_pages_recursive(self.content, self.template, self.public)
+        self.watcher = SiteWatcher(self.static, self.content, self.template, self.public, debounce=1.0)
+
+    def write(self, path, text):
+        super().write(path, text)
+        # Make sure the change is visible even on coarse mtime filesystems
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    def test_no_changes_means_no_rebuild(self):
+        self.assertIsNone(self.watcher.poll(now=0))
+        self.assertIsNone(self.watcher.poll(now=10))
+
+    def test_rebuild_waits_for_debounce(self):
+        page = os.path.join(self.content, "index.md")
+        self.write(page, "# Home\n\nEdited.")
+        self.assertIsNone(self.watcher.poll(now=0))
+        self.assertIsNone(self.watcher.poll(now=0.5))
+        self.assertEqual(self.watcher.poll(now=1.5), [page])
+        self.assertIn("Edited.", self.read(os.path.join(self.public, "index.html")))
+
+    def test_save_burst_is_rebuilt_once(self):
+        page = os.path.join(self.content, "index.md")
+        self.write(page, "# Home\n\nOne.")
+        self.watcher.poll(now=0)
+        self.write(page, "# Home\n\nTwo.")
+        self.watcher.poll(now=0.5)
+        self.assertIsNone(self.watcher.poll(now=1.2))
+        self.assertEqual(self.watcher.poll(now=2.0), [page])
+        self.assertIn("Two.", self.read(os.path.join(self.public, "index.html")))
+
+    def test_only_changed_page_is_rebuilt(self):
+        blog_output = os.path.join(self.public, "blog", "index.html")
+        os.utime(blog_output, ns=(0, 0))
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited.")
+        self.watcher.poll(now=0)
+        self.watcher.poll(now=2)
+        self.assertEqual(os.stat(blog_output).st_mtime_ns, 0)
+
+    def test_asset_change_is_copied(self):
+        css = os.path.join(self.static, "index.css")
+        self.write(css, "body { color: red; }")
+        self.watcher.poll(now=0)
+        self.assertEqual(self.watcher.poll(now=2), [css])
+        self.assertEqual(self.read(os.path.join(self.public, "index.css")), "body { color: red; }")
+
+    def test_template_change_rebuilds_everything(self):
+        self.write(self.template, "<h1>{{ Title }}</h1>{{ Content }}")
+        self.watcher.poll(now=0)
+        self.assertEqual(self.watcher.poll(now=2), [self.template])
+        self.assertTrue(self.read(os.path.join(self.public, "blog", "index.html")).startswith("<h1>Blog</h1>"))
+
+    def test_partial_change_rebuilds_everything(self):
+        partial = os.path.join(self.tmp, "nav.html")
+        self.write(partial, "<nav>v1</nav>")
+        self.write(self.template, "{{> nav.html }}{{ Content }}")
+        self.watcher.poll(now=0)
+        self.watcher.poll(now=2)
+        self.write(partial, "<nav>v2</nav>")
+        self.watcher.poll(now=3)
+        self.assertEqual(self.watcher.poll(now=5), [partial])
+        self.assertTrue(self.read(os.path.join(self.public, "blog", "index.html")).startswith("<nav>v2</nav>"))
+
+    def test_page_template_and_its_partials_are_watched(self):
+        post = os.path.join(self.tmp, "post.html")
+        partial = os.path.join(self.tmp, "byline.html")
+        blog_output = os.path.join(self.public, "blog", "index.html")
+        home_output = os.path.join(self.public, "index.html")
+        self.write(partial, "<p>by me</p>")
+        self.write(post, "<article>{{ Title }}{{> byline.html }}</article>")
+        self.write(os.path.join(self.content, "blog", "index.md"), "---\ntemplate: post.html\n---\n# Blog")
+        self.watcher.poll(now=0)
+        self.watcher.poll(now=2)
+        self.assertEqual(self.read(blog_output), "<article>Blog<p>by me</p></article>")
+        os.utime(home_output, ns=(0, 0))
+
+        self.write(partial, "<p>by you</p>")
+        self.watcher.poll(now=3)
+        self.assertEqual(self.watcher.poll(now=5), [partial])
+        self.assertEqual(self.read(blog_output), "<article>Blog<p>by you</p></article>")
+        self.write(post, "<main>{{ Title }}</main>")
+        self.watcher.poll(now=6)
+        self.assertEqual(self.watcher.poll(now=8), [post])
+        self.assertEqual(self.read(blog_output), "<main>Blog</main>")
+        self.assertEqual(os.stat(home_output).st_mtime_ns, 0)
+
+    def test_removed_page_output_is_deleted(self):
+        page = os.path.join(self.content, "blog", "index.md")
+        os.remove(page)
+        self.watcher.poll(now=0)
+        self.assertEqual(self.watcher.poll(now=2), [page])
+        self.assertFalse(os.path.exists(os.path.join(self.public, "blog")))
+
+    def test_failed_page_does_not_stop_the_batch(self):
+        broken = os.path.join(self.content, "broken.md")
+        page = os.path.join(self.content, "index.md")
+        self.write(broken, "No title.")
+        self.write(page, "# Home\n\nEdited.")
+        self.watcher.poll(now=0)
+        with self.assertLogs(logger, level="ERROR"):
+            self.assertEqual(self.watcher.poll(now=2), [page])
+        self.assertIn("Edited.", self.read(os.path.join(self.public, "index.html")))
+        self.assertEqual(self.watcher.pending_changed, {broken})
+        self.write(broken, "# Fixed")
+        self.watcher.poll(now=3)
+        self.assertEqual(self.watcher.poll(now=5), [broken])
+        self.assertEqual(self.watcher.pending_changed, set())
+
+    def test_rebuilds_are_recorded_in_the_manifest(self):
+        manifest = os.path.join(self.tmp, "manifest.json")
+        incremental_build(self.static, self.content, self.template, self.public, manifest)
+        watcher = SiteWatcher(self.static, self.content, self.template, self.public, debounce=1.0,
+                              manifest_path=manifest)
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\nEdited.")
+        self.write(os.path.join(self.static, "index.css"), "body { color: red; }")
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        watcher.poll(now=0)
+        watcher.poll(now=2)
+        stats = incremental_build(self.static, self.content, self.template, self.public, manifest)
+        self.assertEqual((stats["pages_built"], stats["assets_copied"], stats["removed"]), (0, 0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,119 @@
+import filecmp
+import json
+import os
+import shutil
+import subprocess
+import sys
+import unittest
+from fixtures import SiteTestCase
+from generate_pages_recursive import find_markdown_pages
+from shard_build import SHARD_MANIFEST, Shard, merge_shards, shard_directory
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+
+class TestShardBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        for i in range(12):
+            self.write(os.path.join(self.content, f"page{i}", "index.md"), f"# Page {i}\n\n" + "Body. " * (i * 50))
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[first](/page0/)")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def run_main(self, *args):
+        return subprocess.run([sys.executable, MAIN, *args], cwd=self.tmp, capture_output=True, text=True)
+
+    def test_shards_partition_the_pages(self):
+        pages = find_markdown_pages(self.content, self.public)
+        for strategy in ("hash", "size"):
+            slices = [Shard(i, 3, strategy).select(pages, self.content) for i in (1, 2, 3)]
+            self.assertEqual(sorted(page for pages_slice in slices for page in pages_slice), sorted(pages))
+            self.assertEqual(sum(len(pages_slice) for pages_slice in slices), len(pages))
+
+    def test_size_strategy_balances_bytes(self):
+        pages = find_markdown_pages(self.content, self.public)
+        totals = [sum(os.path.getsize(source) for source, _ in Shard(i, 3, "size").select(pages, self.content))
+                  for i in (1, 2, 3)]
+        self.assertLess(max(totals) - min(totals), max(os.path.getsize(source) for source, _ in pages))
+
+    def test_assignment_ignores_content_location(self):
+        moved = os.path.join(self.tmp, "elsewhere")
+        shutil.copytree(self.content, moved)
+        selected = Shard(2, 3).select(find_markdown_pages(self.content, self.public), self.content)
+        moved_selected = Shard(2, 3).select(find_markdown_pages(moved, self.public), moved)
+        self.assertEqual([os.path.relpath(source, self.content) for source, _ in selected],
+                         [os.path.relpath(source, moved) for source, _ in moved_selected])
+
+    def test_shard_processes_merge_into_full_build(self):
+        self.assertEqual(self.run_main().returncode, 0)
+        full = os.path.join(self.tmp, "full")
+        os.rename(self.public, full)
+
+        processes = [subprocess.Popen([sys.executable, MAIN, "--shard", f"{i}/3"], cwd=self.tmp,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for i in (1, 2, 3)]
+        self.assertEqual([process.wait() for process in processes], [0, 0, 0])
+        result = self.run_main("--merge-shards", "3")
+        self.assertEqual(result.returncode, 0, result.stdout)
+        self.assertIn("13 pages, 0 conflict(s)", result.stdout)
+
+        comparison = filecmp.dircmp(full, self.public)
+        self.assertEqual((comparison.left_only, comparison.right_only, comparison.diff_files), ([], [], []))
+        with open(os.path.join(self.tmp, ".site_index.json")) as file:
+            self.assertEqual(len(json.load(file)["pages"]), 13)
+
+    def test_merge_reports_conflicts(self):
+        for i in (1, 2):
+            self.assertEqual(self.run_main("--shard", f"{i}/2").returncode, 0)
+        root = os.path.join(self.tmp, "shards")
+        first, second = shard_directory(root, 1, 2), shard_directory(root, 2, 2)
+        # The same output from both shards, and a file altered after its shard was built
+        with open(os.path.join(first, SHARD_MANIFEST)) as file:
+            claimed = next(iter(json.load(file)["outputs"]))
+        with open(os.path.join(second, SHARD_MANIFEST)) as file:
+            manifest = json.load(file)
+        manifest["outputs"][claimed] = "0" * 64
+        altered = next(output for output in manifest["outputs"] if output != claimed)
+        with open(os.path.join(second, SHARD_MANIFEST), "w") as file:
+            json.dump(manifest, file)
+        with open(os.path.join(second, altered), "a") as file:
+            file.write("tampered")
+
+        os.makedirs(self.public)
+        site_index, conflicts, failed = merge_shards(root, 2, self.public)
+        self.assertEqual(sorted(conflicts), sorted([
+            f"{claimed} is produced by shard 1 and shard 2",
+            f"{os.path.join(second, altered)} does not match its shard manifest",
+        ]))
+        self.assertEqual(failed, [])
+        self.assertFalse(os.path.exists(os.path.join(self.public, altered)))
+
+    def test_merge_reports_missing_shard(self):
+        self.assertEqual(self.run_main("--shard", "1/2").returncode, 0)
+        result = self.run_main("--merge-shards", "2")
+        self.assertEqual(result.returncode, 1)
+        self.assertIn("shard 2/2 has no readable shard.json", result.stdout)
+
+    def test_failed_page_is_recorded_in_a_serial_shard(self):
+        self.write(os.path.join(self.content, "broken.md"), "No title.")
+        result = self.run_main("--shard", "1/1", "-j", "1")
+        self.assertEqual(result.returncode, 1, result.stderr)
+        self.assertNotIn("Traceback", result.stderr)
+        self.assertIn("1 page(s) failed", result.stdout)
+        with open(os.path.join(shard_directory(os.path.join(self.tmp, "shards"), 1, 1), SHARD_MANIFEST)) as file:
+            manifest = json.load(file)
+        self.assertEqual(manifest["failed"], ["broken.md"])
+        self.assertEqual(len(manifest["outputs"]), 13)
+
+    def test_invalid_shard(self):
+        self.assertEqual(self.run_main("--shard", "4/3").returncode, 2)
+        for flag in (["--search"], ["--explain"], ["--changed-list", "changed.txt"]):
+            result = self.run_main("--merge-shards", "2", *flag)
+            self.assertEqual(result.returncode, 2)
+            self.assertIn("not supported with --merge-shards", result.stderr)
+        with self.assertRaises(ValueError):
+            Shard(1, 2, "random")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import shutil
+import tempfile
+import unittest
+import xml.etree.ElementTree as ElementTree
+from site_files import write_feed, write_redirects, write_sitemap
+from site_index import PageOutline, SiteIndex
+
+SITEMAP = "{http://www.sitemaps.org/schemas/sitemap/0.9}"
+ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+class TestSiteFiles(unittest.TestCase):
+    def setUp(self):
+        self.public = tempfile.mkdtemp()
+        self.index = SiteIndex(self.public)
+        for i in range(5):
+            self.add_page(f"page{i}", f"Page {i} & more", f"2024-01-0{i + 1}T00:00:00Z")
+        self.add_page("", "Home", "2023-12-31T00:00:00Z", output="index.html")
+
+    def tearDown(self):
+        shutil.rmtree(self.public)
+
+    def add_page(self, name, title, updated, output=None, **extra):
+        outline = PageOutline()
+        outline.title = title
+        record = dict(outline.to_dict(), updated=updated, **extra)
+        self.index.add(f"content/{name}.md", os.path.join(self.public, output or os.path.join(name, "index.html")),
+                       record)
+
+    def parse(self, name):
+        return ElementTree.parse(os.path.join(self.public, name)).getroot()
+
+    def test_single_sitemap(self):
+        self.assertEqual(write_sitemap(self.index, self.public, "https://example.com/"), 1)
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{SITEMAP}urlset")
+        locations = [url.find(f"{SITEMAP}loc").text for url in root]
+        self.assertEqual(locations[:2], ["https://example.com/", "https://example.com/page0/"])
+        self.assertEqual(root[1].find(f"{SITEMAP}lastmod").text, "2024-01-01T00:00:00Z")
+        self.assertEqual(write_sitemap(self.index, self.public, "https://example.com/"), 0)
+
+    def test_sharded_sitemap(self):
+        write_sitemap(self.index, self.public, "https://example.com", max_urls=2)
+        root = self.parse("sitemap.xml")
+        self.assertEqual(root.tag, f"{SITEMAP}sitemapindex")
+        self.assertEqual([sitemap.find(f"{SITEMAP}loc").text for sitemap in root],
+                         [f"https://example.com/sitemap-{n}.xml" for n in (1, 2, 3)])
+        self.assertEqual([len(self.parse(f"sitemap-{n}.xml")) for n in (1, 2, 3)], [2, 2, 2])
+
+        # Shrinking back under the limit removes the shards
+        write_sitemap(self.index, self.public, "https://example.com")
+        self.assertEqual(self.parse("sitemap.xml").tag, f"{SITEMAP}urlset")
+        self.assertFalse(any(name.startswith("sitemap-") for name in os.listdir(self.public)))
+
+    def test_feed_lists_latest_pages(self):
+        write_feed(self.index, self.public, "https://example.com", entries=3)
+        root = self.parse("atom.xml")
+        self.assertEqual(root.find(f"{ATOM}title").text, "Home")
+        self.assertEqual(root.find(f"{ATOM}updated").text, "2024-01-05T00:00:00Z")
+        entries = root.findall(f"{ATOM}entry")
+        self.assertEqual([entry.find(f"{ATOM}title").text for entry in entries],
+                         ["Page 4 & more", "Page 3 & more", "Page 2 & more"])
+        self.assertEqual(entries[0].find(f"{ATOM}link").get("href"), "https://example.com/page4/")
+        self.assertEqual(root.find(f"{ATOM}author/{ATOM}name").text, "Home")
+        self.assertIsNone(entries[0].find(f"{ATOM}author"))
+
+    def test_feed_authors(self):
+        self.add_page("", "Home", "2023-12-31T00:00:00Z", output="index.html", meta={"author": "Site Owner"})
+        self.add_page("post", "Post", "2024-02-01T00:00:00Z", meta={"author": ["Ann", "Bo & Co"]})
+        write_feed(self.index, self.public, "https://example.com")
+        root = self.parse("atom.xml")
+        self.assertEqual(root.find(f"{ATOM}author/{ATOM}name").text, "Site Owner")
+        entry = root.find(f"{ATOM}entry")
+        self.assertEqual([name.text for name in entry.findall(f"{ATOM}author/{ATOM}name")], ["Ann", "Bo & Co"])
+        write_feed(self.index, self.public, "https://example.com", author="Editor")
+        self.assertEqual(self.parse("atom.xml").find(f"{ATOM}author/{ATOM}name").text, "Editor")
+
+    def test_redirects(self):
+        self.add_page("new", "New", None, aliases=["/old/", "/older.html"])
+        write_redirects(self.index, self.public)
+        with open(os.path.join(self.public, "_redirects")) as file:
+            lines = file.read().splitlines()
+        self.assertIn("/page0 /page0/ 301", lines)
+        self.assertIn("/old/ /new/ 301", lines)
+        self.assertIn("/older.html /new/ 301", lines)
+        self.assertNotIn("/ / 301", lines)
+
+    def test_updated_defaults_to_source_mtime(self):
+        source = os.path.join(self.public, "source.md")
+        with open(source, "w") as file:
+            file.write("# x")
+        os.utime(source, (0, 86400))
+        self.index.add(source, os.path.join(self.public, "x.html"), PageOutline())
+        self.assertEqual(self.index.pages[os.path.join(self.public, "x.html")]["updated"], "1970-01-02T00:00:00Z")
+
+    def test_unparseable_date_falls_back_to_source_mtime(self):
+        source = os.path.join(self.public, "source.md")
+        with open(source, "w") as file:
+            file.write("# x")
+        os.utime(source, (0, 86400))
+        outline = PageOutline()
+        outline.meta = {"date": "last <Tuesday>"}
+        self.index.add(source, os.path.join(self.public, "x.html"), outline)
+        self.assertEqual(self.index.pages[os.path.join(self.public, "x.html")]["updated"], "1970-01-02T00:00:00Z")
+        write_sitemap(self.index, self.public, "https://example.com")
+        self.assertEqual(len(self.parse("sitemap.xml")), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
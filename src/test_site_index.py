@@ -0,0 +1,124 @@
+import os
+import unittest
+from unittest import mock
+import generate_page as generate_page_module
+from block_cache import BlockCache
+from fixtures import SiteTestCase
+from generate_page import generate_page
+from incremental_build import incremental_build
+from new_function_textnode import markdown_to_html_node
+from parallel_build import generate_pages_parallel
+from site_index import PageOutline, SiteIndex, output_url
+
+MARKDOWN = """# Guide
+
+Intro with a [link](/docs/) and ![logo](/images/logo.png).
+
+## Setup
+
+Read [more](https://example.com) **now**.
+
+### Details
+"""
+
+
+class TestPageOutline(unittest.TestCase):
+    def assert_outline(self, outline):
+        self.assertEqual(outline.headings, [(1, "Guide"), (2, "Setup"), (3, "Details")])
+        self.assertEqual(outline.links, ["/docs/", "https://example.com"])
+        self.assertEqual(outline.images, [("logo", "/images/logo.png")])
+
+    def test_collected_during_parse(self):
+        outline = PageOutline()
+        markdown_to_html_node(MARKDOWN, outline)
+        self.assert_outline(outline)
+
+    def test_round_trip(self):
+        outline = PageOutline()
+        markdown_to_html_node(MARKDOWN, outline)
+        outline.title = "Guide"
+        restored = PageOutline.from_dict(outline.to_dict())
+        self.assertEqual(restored.title, "Guide")
+        self.assert_outline(restored)
+
+    def test_output_url(self):
+        self.assertEqual(output_url(os.path.join("public", "index.html"), "public"), "/")
+        self.assertEqual(output_url(os.path.join("public", "blog", "index.html"), "public"), "/blog/")
+        self.assertEqual(output_url(os.path.join("public", "about.html"), "public"), "/about.html")
+
+
+class TestSiteIndexBuild(SiteTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+        self.write(os.path.join(self.content, "index.md"), MARKDOWN)
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog\n\nSee [home](/).")
+        self.write(self.template, "<title>{{ Title }}</title>{{ Content }}")
+
+    def test_generate_page_fills_outline(self):
+        outline = PageOutline()
+        generate_page(os.path.join(self.content, "index.md"), self.template,
+                      os.path.join(self.public, "index.html"), outline=outline)
+        self.assertEqual(outline.title, "Guide")
+        TestPageOutline.assert_outline(self, outline)
+
+    def test_cached_blocks_still_fill_outline(self):
+        cache = BlockCache()
+        source = os.path.join(self.content, "index.md")
+        dest = os.path.join(self.public, "index.html")
+        generate_page(source, self.template, dest, block_cache=cache, outline=PageOutline())
+        outline = PageOutline()
+        generate_page(source, self.template, dest, block_cache=cache, outline=outline)
+        self.assertEqual(cache.misses, cache.hits)
+        TestPageOutline.assert_outline(self, outline)
+
+    def test_streamed_page_fills_outline(self):
+        outline = PageOutline()
+        with mock.patch.object(generate_page_module, "STREAM_THRESHOLD", 1):
+            generate_page(os.path.join(self.content, "index.md"), self.template,
+                          os.path.join(self.public, "index.html"), outline=outline)
+        self.assertEqual(outline.title, "Guide")
+        TestPageOutline.assert_outline(self, outline)
+
+    def test_parallel_build_collects_every_page(self):
+        index = SiteIndex(self.public)
+        generate_pages_parallel(self.content, self.template, self.public, jobs=2, site_index=index)
+        blog = index.pages[os.path.join(self.public, "blog", "index.html")]
+        self.assertEqual(blog["url"], "/blog/")
+        self.assertEqual(blog["title"], "Blog")
+        self.assertEqual(blog["links"], ["/"])
+        self.assertEqual(blog["source"], os.path.join(self.content, "blog", "index.md"))
+
+    def test_save_and_load(self):
+        index = SiteIndex(self.public)
+        generate_pages_parallel(self.content, self.template, self.public, jobs=1, site_index=index)
+        path = os.path.join(self.tmp, "index.json")
+        index.save(path)
+        with open(path) as file:
+            self.assertNotIn("\n", file.read())
+        self.assertEqual(SiteIndex.load(path, self.public).pages, index.pages)
+        self.assertEqual(len(SiteIndex.load(path, "elsewhere")), 0)
+        self.assertEqual(len(SiteIndex.load(os.path.join(self.tmp, "missing.json"), self.public)), 0)
+
+    def test_incremental_build_keeps_skipped_and_drops_removed_pages(self):
+        manifest = os.path.join(self.tmp, "manifest.json")
+        index = SiteIndex(self.public)
+        incremental_build(self.static, self.content, self.template, self.public, manifest, site_index=index)
+        self.assertEqual(len(index), 2)
+
+        os.remove(os.path.join(self.content, "blog", "index.md"))
+        self.write(os.path.join(self.content, "index.md"), "# Home\n\n[new](/new/)")
+        stats = incremental_build(self.static, self.content, self.template, self.public, manifest, site_index=index)
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertEqual(list(index.pages), [os.path.join(self.public, "index.html")])
+        self.assertEqual(index.pages[os.path.join(self.public, "index.html")]["links"], ["/new/"])
+
+        # A lost index forces the skipped pages to be parsed again
+        fresh = SiteIndex(self.public)
+        stats = incremental_build(self.static, self.content, self.template, self.public, manifest, site_index=fresh)
+        self.assertEqual(stats["pages_built"], 1)
+        self.assertEqual(len(fresh), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import io
+import os
+import random
+import tempfile
+import unittest
+from bench_corpus import DEFAULT_INLINE, DEFAULT_MIX, generate_page_markdown
+from block_cache import BlockCache
+from generate_page import generate_page
+from new_function_textnode import scan_blocks
+from stream_page import generate_page_streaming, iter_blocks
+
+
+class TestIterBlocks(unittest.TestCase):
+    def assert_matches_scan(self, markdown):
+        lines, spans = scan_blocks(markdown)
+        expected = [(block_type, lines[start:end]) for block_type, start, end in spans]
+        self.assertEqual(list(iter_blocks(io.StringIO(markdown))), expected)
+
+    def test_matches_scan_blocks(self):
+        samples = [
+            "# Title\n\nSome text\nmore text\n\n* a\n* b\n\n1. x\n2. y",
+            "Intro\n\n```\nfirst\n\nsecond\n```\n\nOutro",
+            "```\nno end\n\nText\n\n```\nstill no end",
+            "Block 1\n   \nBlock 2\n\n\n",
+            "",
+        ]
+        for seed in range(5):
+            samples.append(generate_page_markdown(random.Random(seed), 0, 10, 40, DEFAULT_MIX, DEFAULT_INLINE))
+        for markdown in samples:
+            with self.subTest(markdown=markdown[:40]):
+                self.assert_matches_scan(markdown)
+
+    def test_blocks_are_yielded_lazily(self):
+        def lines():
+            yield "first block\n"
+            yield "\n"
+            raise AssertionError("read past the first block")
+        blocks = iter_blocks(lines())
+        self.assertEqual(next(blocks), ("paragraph", ["first block"]))
+
+
+class TestGeneratePageStreaming(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.markdown_path = os.path.join(self.tmp.name, "index.md")
+        self.template_path = os.path.join(self.tmp.name, "template.html")
+        with open(self.template_path, "w") as file:
+            file.write("<title>{{ Title }}</title>{{ Content }}")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_markdown(self, text):
+        with open(self.markdown_path, "w") as file:
+            file.write(text)
+
+    def render_both(self):
+        streamed_path = os.path.join(self.tmp.name, "streamed.html")
+        regular_path = os.path.join(self.tmp.name, "regular.html")
+        generate_page_streaming(self.markdown_path, self.template_path, streamed_path)
+        generate_page(self.markdown_path, self.template_path, regular_path)
+        with open(streamed_path) as streamed, open(regular_path) as regular:
+            return streamed.read(), regular.read()
+
+    def test_matches_generate_page(self):
+        self.write_markdown(generate_page_markdown(random.Random(1), 0, 10, 60, DEFAULT_MIX, DEFAULT_INLINE))
+        streamed, regular = self.render_both()
+        self.assertEqual(streamed, regular)
+
+    def test_title_after_first_blocks(self):
+        self.write_markdown("Intro paragraph.\n\n* item\n\n# Late Title\n\nBody.")
+        streamed, regular = self.render_both()
+        self.assertEqual(streamed, regular)
+        self.assertTrue(streamed.startswith("<title>Late Title</title><div><p>Intro paragraph.</p>"))
+
+    def test_with_block_cache(self):
+        self.write_markdown("# Title\n\nRepeated.\n\nRepeated.")
+        cache = BlockCache()
+        dest_path = os.path.join(self.tmp.name, "out.html")
+        generate_page_streaming(self.markdown_path, self.template_path, dest_path, block_cache=cache)
+        self.assertEqual(cache.hits, 1)
+
+    def test_missing_title(self):
+        self.write_markdown("No heading.\n\nStill none.")
+        with self.assertRaises(RuntimeError):
+            generate_page_streaming(self.markdown_path, self.template_path, os.path.join(self.tmp.name, "x.html"))
+
+    def test_empty_title(self):
+        self.write_markdown("# \n\nBody.")
+        with self.assertRaises(RuntimeError):
+            generate_page_streaming(self.markdown_path, self.template_path, os.path.join(self.tmp.name, "x.html"))
+
+
+if __name__ == "__main__":
+    unittest.main()
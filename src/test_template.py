@@ -0,0 +1,97 @@
+import io
+import os
+import tempfile
+import unittest
+from fixtures import write_file
+from template import Template, load_template
+
+
+class TestTemplate(unittest.TestCase):
+    def test_render_title_and_content(self):
+        template = Template("<title> {{ Title }} </title><body>{{ Content }}</body>")
+        html = template.render({"Title": "Home", "Content": "<p>Hi</p>"})
+        self.assertEqual(html, "<title> Home </title><body><p>Hi</p></body>")
+
+    def test_arbitrary_placeholders(self):
+        template = Template("{{ Date }} | {{Description}} | {{  Nav  }}")
+        html = template.render({"Date": "2024-01-01", "Description": "About", "Nav": "<nav></nav>"})
+        self.assertEqual(html, "2024-01-01 | About | <nav></nav>")
+
+    def test_repeated_placeholder(self):
+        template = Template("{{ Title }} - {{ Title }}")
+        self.assertEqual(template.render({"Title": "A"}), "A - A")
+
+    def test_missing_value_is_left_untouched(self):
+        template = Template("<p>{{ Unknown }}</p>{{ Content }}")
+        self.assertEqual(template.render({"Content": "x"}), "<p>{{ Unknown }}</p>x")
+
+    def test_values_are_not_reparsed(self):
+        template = Template("{{ Title }}{{ Content }}")
+        self.assertEqual(template.render({"Title": "{{ Content }}", "Content": "c"}), "{{ Content }}c")
+
+    def test_no_placeholders(self):
+        template = Template("<html></html>")
+        self.assertEqual(template.render({}), "<html></html>")
+        self.assertEqual(template.names, set())
+
+    def test_render_accepts_chunk_iterables(self):
+        template = Template("<body>{{ Content }}</body>")
+        self.assertEqual(template.render({"Content": iter(["<p>", "x", "</p>"])}), "<body><p>x</p></body>")
+
+    def test_write_streams_chunks(self):
+        template = Template("<title>{{ Title }}</title>{{ Content }}{{ Missing }}")
+        buffer = io.StringIO()
+        template.write(buffer, {"Title": "T", "Content": (chunk for chunk in ["<p>", "x", "</p>"])})
+        self.assertEqual(buffer.getvalue(), "<title>T</title><p>x</p>{{ Missing }}")
+
+    def test_names(self):
+        template = Template("{{ Title }}{{ Content }}{{ Title }}")
+        self.assertEqual(template.names, {"Title", "Content"})
+
+
+class TestLoadTemplate(unittest.TestCase):
+    def test_template_is_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, "w") as file:
+                file.write("{{ Title }}")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+
+            with open(path, "w") as file:
+                file.write("<h1>{{ Title }}</h1>")
+            stat = os.stat(path)
+            os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertEqual(load_template(path).render({"Title": "T"}), "<h1>T</h1>")
+
+    def test_partials_are_included_and_recorded(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, "partials"))
+            path = os.path.join(tmp, "template.html")
+            nav = os.path.join(tmp, "partials", "nav.html")
+            footer = os.path.join(tmp, "partials", "footer.html")
+            write_file(path, "{{> partials/nav.html }}{{ Content }}{{>partials/nav.html}}")
+            write_file(nav, "<nav>{{ Title }}{{> footer.html }}</nav>")
+            write_file(footer, "<small>f</small>")
+            template = load_template(path)
+            self.assertEqual(template.includes, (nav, footer))
+            self.assertEqual(template.render({"Title": "T", "Content": "C"}),
+                             "<nav>T<small>f</small></nav>C<nav>T<small>f</small></nav>")
+
+            # Editing a partial recompiles the template that includes it
+            write_file(footer, "<small>g</small>")
+            stat = os.stat(footer)
+            os.utime(footer, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+            self.assertIn("<small>g</small>", load_template(path).render({}))
+
+    def test_include_cycle_is_an_error(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            write_file(path, "{{> a.html }}")
+            write_file(os.path.join(tmp, "a.html"), "{{> template.html }}")
+            with self.assertRaises(ValueError):
+                load_template(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
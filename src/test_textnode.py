@@ -4,7 +4,8 @@ from textnode import TextNode
 from new_function_textnode import (
     split_nodes_delimiter, extract_markdown_images, extract_markdown_links,
     split_nodes_image, split_nodes_link, text_to_textnodes, markdown_to_blocks,
-    block_to_block_type, text_to_textnodes, markdown_to_blocks, block_to_block_type, text_to_children, markdown_to_html_node
+    block_to_block_type, text_to_textnodes, markdown_to_blocks, block_to_block_type, text_to_children, markdown_to_html_node,
+    scan_blocks
 )
 
 #Testcase for TextNode
@@ -39,6 +40,12 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", "bold", "https://www.same.com")
         self.assertEqual(node, node2)
 
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", "bold")
+        self.assertFalse(hasattr(node, "__dict__"))
+        with self.assertRaises(AttributeError):
+            node.extra = 1
+
 
 #Testcase for SplitNodesDelimeter
 
@@ -492,6 +499,52 @@ class TestBlockToBlockType(unittest.TestCase):
         self.assertNotEqual(block_to_block_type("> Line 1\nText\n> Line 2"), 'quote')
 
 
+#testcases for the line-oriented block scanner
+class TestScanBlocks(unittest.TestCase):
+    def test_spans_and_types(self):
+        lines, spans = scan_blocks("# Title\n\nSome text\nmore text\n\n* a\n* b\n\n1. x\n2. y")
+        self.assertEqual(spans, [
+            ('heading', 0, 1),
+            ('paragraph', 2, 4),
+            ('unordered_list', 5, 7),
+            ('ordered_list', 8, 10),
+        ])
+        self.assertEqual(lines[5:7], ["* a", "* b"])
+
+    def test_lines_are_stripped(self):
+        lines, spans = scan_blocks("   > quoted   \n   > more")
+        self.assertEqual(spans, [('quote', 0, 2)])
+        self.assertEqual(lines, ["> quoted", "> more"])
+
+    def test_whitespace_only_line_separates_blocks(self):
+        self.assertEqual(markdown_to_blocks("Block 1\n   \nBlock 2"), ["Block 1", "Block 2"])
+
+    def test_fenced_code_keeps_blank_lines(self):
+        markdown = "Intro\n\n```\nfirst\n\nsecond\n```\n\nOutro"
+        lines, spans = scan_blocks(markdown)
+        self.assertEqual(spans, [('paragraph', 0, 1), ('code', 2, 7), ('paragraph', 8, 9)])
+        self.assertEqual(markdown_to_blocks(markdown)[1], "```\nfirst\n\nsecond\n```")
+
+    def test_unclosed_fence_falls_back_to_blank_lines(self):
+        self.assertEqual(markdown_to_blocks("```\nno end\n\nText"), ["```\nno end", "Text"])
+
+    def test_single_line_code(self):
+        self.assertEqual(scan_blocks("```code```")[1], [('code', 0, 1)])
+
+    def test_html_matches_blocks(self):
+        markdown = "# Title\n\n* one\n* two\n\n1. first\n2. second"
+        self.assertEqual(
+            markdown_to_html_node(markdown).to_html(),
+            "<div><h1>Title</h1><ul><li>one</li><li>two</li></ul><ol><li>first</li><li>second</li></ol></div>",
+        )
+
+    def test_large_document(self):
+        markdown = "\n\n".join(f"Paragraph {i} with text." for i in range(20000))
+        lines, spans = scan_blocks(markdown)
+        self.assertEqual(len(spans), 20000)
+        self.assertEqual(spans[-1], ('paragraph', 39998, 39999))
+
+
 class TestTextToChildren(unittest.TestCase):
     def test_simple_text(self):
         text = "Hello, world!"
@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from write_output import OutputWriter, write_if_changed
+
+
+class TestWriteOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "index.html")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def read(self):
+        with open(self.path, encoding="utf-8") as file:
+            return file.read()
+
+    def test_new_file_is_written(self):
+        self.assertTrue(write_if_changed(self.path, "<p>hi</p>"))
+        self.assertEqual(self.read(), "<p>hi</p>")
+
+    def test_identical_content_is_not_rewritten(self):
+        write_if_changed(self.path, "<p>hi</p>")
+        os.utime(self.path, ns=(0, 0))
+        self.assertFalse(write_if_changed(self.path, "<p>hi</p>"))
+        self.assertEqual(os.stat(self.path).st_mtime_ns, 0)
+
+    def test_changed_content_replaces_file(self):
+        write_if_changed(self.path, "<p>hi</p>")
+        self.assertTrue(write_if_changed(self.path, "<p>ho</p>"))
+        self.assertEqual(self.read(), "<p>ho</p>")
+
+    def test_same_size_different_bytes(self):
+        write_if_changed(self.path, "aaaa")
+        self.assertTrue(write_if_changed(self.path, "aaab"))
+        self.assertEqual(self.read(), "aaab")
+
+    def test_chunked_writes_and_digest(self):
+        with OutputWriter(self.path) as writer:
+            writer.write("<p>")
+            writer.write("héllo")
+            writer.write("</p>")
+        self.assertTrue(writer.changed)
+        self.assertEqual(self.read(), "<p>héllo</p>")
+        self.assertEqual(len(writer.hexdigest()), 64)
+
+    def test_failed_write_keeps_old_file_and_no_temp(self):
+        write_if_changed(self.path, "old")
+        with self.assertRaises(RuntimeError):
+            with OutputWriter(self.path) as writer:
+                writer.write("partial")
+                raise RuntimeError("render failed")
+        self.assertEqual(self.read(), "old")
+        self.assertEqual(os.listdir(self.tmp.name), ["index.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
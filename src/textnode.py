@@ -1,4 +1,7 @@
 class TextNode:
+    # Slotted: there are millions of these in flight on large builds
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text, text_type, url=None):
         self.text = text
         self.text_type = text_type
@@ -0,0 +1,73 @@
+import hashlib
+import os
+import threading
+
+class OutputWriter:
+    # Text file writer that hashes what it writes into a temporary file beside the destination.
+    # close() keeps the existing file untouched when the bytes are identical, otherwise it renames
+    # the temporary file over it, so readers never see a half-written page.
+    def __init__(self, dest_path, encoding='utf-8'):
+        self.dest_path = dest_path
+        self.encoding = encoding
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.changed = None
+        directory = os.path.dirname(dest_path) or '.'
+        name = f".{os.path.basename(dest_path)}.{os.getpid()}.{threading.get_ident()}.tmp"
+        self.tmp_path = os.path.join(directory, name)
+        # os.open with 0o666 lets the umask pick the final permissions, as open() would
+        fd = os.open(self.tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        self.file = os.fdopen(fd, 'wb')
+
+    def write(self, text):
+        data = text.encode(self.encoding)
+        self.digest.update(data)
+        self.size += len(data)
+        self.file.write(data)
+
+    def hexdigest(self):
+        return self.digest.hexdigest()
+
+    def close(self):
+        self.file.close()
+        if existing_matches(self.dest_path, self.size, self.digest.digest()):
+            os.remove(self.tmp_path)
+            self.changed = False
+        else:
+            os.replace(self.tmp_path, self.dest_path)
+            self.changed = True
+        return self.changed
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.tmp_path):
+            os.remove(self.tmp_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.discard()
+            return False
+        self.close()
+        return False
+
+def existing_matches(path, size, digest):
+    # Compare sizes first; only hash the existing file when the sizes agree
+    try:
+        if os.path.getsize(path) != size:
+            return False
+        existing = hashlib.sha256()
+        with open(path, 'rb') as file:
+            for chunk in iter(lambda: file.read(1024 * 1024), b''):
+                existing.update(chunk)
+    except FileNotFoundError:
+        return False
+    return existing.digest() == digest
+
+def write_if_changed(dest_path, text):
+    # Write text to dest_path atomically; returns False when the file already had these bytes
+    with OutputWriter(dest_path) as writer:
+        writer.write(text)
+    return writer.changed